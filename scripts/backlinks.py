@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+backlinks.py
+
+Reverse link index for the docs ("what links here") and page moves built on it.
+
+Every link's span is recorded per source file by the shared docs index, in the
+same pass that extracts the links (so only files that changed since the last run
+are re-tokenized), and inverted on load into a map from target URL to the
+(source file, span) pairs pointing at it. Targets are resolved at inversion time
+against the current URL aliases, so moving a page in or out of an index.mdx
+never leaves stale targets behind. Moving a page then touches exactly the files
+that link to it instead of rescanning the tree and guessing.
+
+Usage:
+    python backlinks.py links-to URL [--no-cache]
+    python backlinks.py move OLD NEW [--dry-run] [--no-cache] [--no-redirect]
+
+Commands:
+    links-to URL   List every link to a page (or asset) URL, with file:line:column
+    move OLD NEW   Move the page or directory of pages at URL OLD to URL NEW: rewrite the
+                   inbound links and the moved pages' relative links, update meta.json
+                   navigation and redirects.json destinations, and add a redirect OLD → NEW
+
+Options:
+    --dry-run      Show what move would change without changing anything
+    --no-cache     Ignore and don't update the shared docs index cache
+    --no-redirect  Don't add a redirects.json entry for the move
+"""
+
+import sys
+import os
+import json
+import posixpath
+import argparse
+from urllib.parse import urlparse
+
+from docs_index import find_docs_dir, find_redirects_file, load_index, is_template_or_dynamic, file_url
+from mdx_links import splice
+
+# Line width meta.json lists are wrapped at (prettier's printWidth)
+PRINT_WIDTH = 100
+
+# Position of each field in a link record (a docs index span plus its resolved target)
+KIND, URL, START, END, LINE, COLUMN, TARGET = range(7)
+
+def site_url(url):
+    """The URL a page is served at (/section/index → /section)"""
+    if url.endswith('/index'):
+        return url[:-len('/index')] or '/'
+    return url
+
+def split_suffix(link):
+    """Split a link into (path, ?query/#fragment suffix)"""
+    cut = min((i for i in (link.find('?'), link.find('#')) if i != -1), default=len(link))
+    return link[:cut], link[cut:]
+
+def link_base(rel_path):
+    """URL directory relative links in a docs file resolve against (the file's directory)"""
+    return '/' + posixpath.dirname(rel_path.replace(os.sep, '/'))
+
+def canonical_url(path, aliases):
+    """Normalize a URL path and map index/non-index variations to the page's file URL"""
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+    for ext in ('.mdx', '.md'):
+        if path.endswith(ext):
+            path = path[:-len(ext)]
+    return aliases.get(path, path)
+
+def link_target(rel_path, url, aliases):
+    """Canonical target URL of a link in a docs file, or None for external, same-page and template links"""
+    if is_template_or_dynamic(url):
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme or parsed.netloc:
+        return None
+    path = split_suffix(url)[0]
+    if not path:
+        return None
+    if not path.startswith('/'):
+        path = posixpath.normpath(posixpath.join(link_base(rel_path), path))
+    return canonical_url(path, aliases)
+
+def load_backlinks(docs_dir, use_cache=True):
+    """
+    Build the reverse link index from the link spans in the docs index.
+
+    Returns (index, files, backlinks, aliases) where files is {rel_path: [link record]},
+    backlinks is {target URL: [(rel_path, link record)]} in file and link order and
+    aliases maps URL variations to the page URLs used as targets.
+    """
+    index = load_index(docs_dir, use_cache=use_cache)
+    aliases = dict(index['aliases'])
+    for entry in index['files'].values():
+        aliases.pop(entry['url'], None)  # A page's own file URL is already canonical
+
+    # Targets depend on the whole tree's aliases, so they're resolved here rather than cached per file
+    files = {rel_path: [span + [link_target(rel_path, span[URL], aliases)] for span in entry.get('spans', [])]
+             for rel_path, entry in index['files'].items()}
+
+    backlinks = {}
+    for rel_path, links in files.items():
+        for link in links:
+            if link[TARGET] is not None:
+                backlinks.setdefault(link[TARGET], []).append((rel_path, link))
+    return index, files, backlinks, aliases
+
+def links_to(docs_dir, url, use_cache=True):
+    """links-to command: print every link pointing at url"""
+    _, _, backlinks, aliases = load_backlinks(docs_dir, use_cache)
+    target = canonical_url(url if url.startswith('/') else '/' + url, aliases)
+    inbound = backlinks.get(target, [])
+    if not inbound:
+        print(f"✅ Nothing links to {site_url(target)}")
+        return
+
+    sources = {}
+    for rel_path, link in inbound:
+        sources.setdefault(rel_path, []).append(link)
+    print(f"🔗 {len(inbound)} links to {site_url(target)} from {len(sources)} files:\n")
+    for rel_path, links in sources.items():
+        print(f"📄 {os.path.relpath(os.path.join(docs_dir, rel_path), '.')}")
+        for link in links:
+            print(f"   {link[LINE]}:{link[COLUMN]}  {link[URL]}")
+        print()
+
+def plan_moves(docs_dir, index, old_url, new_url):
+    """
+    Map every file a move touches to its new docs-relative path.
+
+    Returns (moves, is_directory) where moves is {old rel_path: new rel_path} for
+    the pages moved; a directory move also carries its non-page files along.
+    """
+    old_rel = old_url.strip('/')
+    new_rel = new_url.strip('/')
+    page = old_rel + '.mdx'
+    if page in index['files']:
+        return {page: new_rel + '.mdx'}, False
+    if old_rel and os.path.isdir(os.path.join(docs_dir, old_rel)):
+        prefix = old_rel + '/'
+        return {rel_path: new_rel + '/' + rel_path[len(prefix):]
+                for rel_path in index['files'] if rel_path.replace(os.sep, '/').startswith(prefix)}, True
+    return None, False
+
+def move_url(url, old_url, new_url, is_directory, url_map):
+    """Where a canonical target URL lives after the move (unchanged if it didn't move)"""
+    if url in url_map:
+        return url_map[url]
+    if is_directory and (url == old_url or url.startswith(old_url + '/')):
+        return new_url + url[len(old_url):]
+    return url
+
+def relink(link, new_base, new_target):
+    """Rewritten link text for a link whose target or source moved, keeping its style and suffix"""
+    path, suffix = split_suffix(link[URL])
+    trailing = '/' if len(path) > 1 and path.endswith('/') else ''
+    explicit_index = path.rstrip('/').endswith('/index') or path == 'index'
+    extension = next((ext for ext in ('.mdx', '.md') if path.endswith(ext)), '')
+    target = new_target if explicit_index or extension else site_url(new_target)
+
+    if path.startswith('/'):
+        new_path = target
+    else:
+        new_path = posixpath.relpath(target, new_base)
+        if path.startswith('./') and not new_path.startswith('.'):
+            new_path = './' + new_path
+    return new_path + extension + trailing + suffix
+
+def format_meta(meta):
+    """meta.json text in the repo's style: 2-space indent, string lists on one line when they fit"""
+    lines = []
+    for key, value in meta.items():
+        item = f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},'
+        if isinstance(value, list) and len(item) > PRINT_WIDTH:
+            items = ',\n'.join(f'    {json.dumps(page, ensure_ascii=False)}' for page in value)
+            item = f'  {json.dumps(key)}: [\n{items}\n  ],'
+        lines.append(item)
+    return '{\n' + '\n'.join(lines).rstrip(',') + '\n}\n'
+
+def update_meta(docs_dir, moves, is_directory, old_rel, new_rel):
+    """
+    Rewrite meta.json page lists for a move, returning {meta path: new data}.
+
+    Entries stay in their meta.json when the new location is still below it;
+    otherwise they move to the meta.json of the new parent directory (if any).
+    """
+    moved = {old[:-len('.mdx')]: new[:-len('.mdx')] for old, new in moves.items()}
+
+    def moved_to(page):
+        """New docs-relative path of a meta.json entry, or None if it didn't move"""
+        if page in moved:
+            return moved[page]
+        if is_directory and (page == old_rel or page.startswith(old_rel + '/')):
+            return new_rel + page[len(old_rel):]
+        return None
+
+    updates = {}
+    additions = {}  # new parent dir -> entries to append
+    for dirpath, _, filenames in os.walk(docs_dir):
+        if 'meta.json' not in filenames:
+            continue
+        meta_path = os.path.join(dirpath, 'meta.json')
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        pages = meta.get('pages')
+        if not isinstance(pages, list):
+            continue
+        meta_dir = os.path.relpath(dirpath, docs_dir).replace(os.sep, '/')
+        meta_dir = '' if meta_dir == '.' else meta_dir
+        if is_directory and (meta_dir == old_rel or meta_dir.startswith(old_rel + '/')):
+            continue  # Moves along with the directory; its relative entries stay valid
+        new_pages = []
+        for page in pages:
+            full = posixpath.normpath(posixpath.join(meta_dir, page)) if isinstance(page, str) else None
+            target = full and moved_to(full)
+            if target is None:
+                new_pages.append(page)
+                continue
+            if not meta_dir or target.startswith(meta_dir + '/'):
+                new_pages.append(target[len(meta_dir) + 1:] if meta_dir else target)
+            else:
+                additions.setdefault(posixpath.dirname(target), []).append(posixpath.basename(target))
+        if new_pages != pages:
+            updates[meta_path] = dict(meta, pages=new_pages)
+
+    for directory, names in additions.items():
+        meta_path = os.path.join(docs_dir, directory, 'meta.json')
+        if is_directory and (directory == new_rel or directory.startswith(new_rel + '/')):
+            meta_path = os.path.join(docs_dir, old_rel + directory[len(new_rel):], 'meta.json')
+        meta = updates.get(meta_path)
+        if meta is None:
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue  # No navigation file there - fumadocs lists the page automatically
+        if isinstance(meta.get('pages'), list):
+            updates[meta_path] = dict(meta, pages=meta['pages'] + names)
+    return updates
+
+def move(docs_dir, old, new, dry_run=False, use_cache=True, add_redirect=True):
+    """move command: move a page or directory and fix everything pointing at it"""
+    old_url = '/' + old.strip('/')
+    new_url = '/' + new.strip('/')
+    index, files, backlinks, aliases = load_backlinks(docs_dir, use_cache)
+    moves, is_directory = plan_moves(docs_dir, index, old_url, new_url)
+    if not moves and not is_directory:
+        print(f"❌ Error: no page or directory at {old_url}")
+        sys.exit(1)
+    new_path = os.path.join(docs_dir, new_url.strip('/'))
+    if os.path.exists(new_path if is_directory else new_path + '.mdx'):
+        print(f"❌ Error: {os.path.relpath(new_path, '.')}{'' if is_directory else '.mdx'} already exists")
+        sys.exit(1)
+
+    url_map = {file_url(old_rel): file_url(new_rel) for old_rel, new_rel in moves.items()}
+    old_key = old_url if is_directory else file_url(old_url.strip('/') + '.mdx')
+    new_key = new_url if is_directory else url_map[old_key]
+
+    # Links to moved pages, plus every link inside a moved page (its relative links may need rebasing)
+    candidates = {}
+    for url in url_map:
+        for rel_path, link in backlinks.get(url, ()):
+            candidates[(rel_path, link[START])] = (rel_path, link)
+    if is_directory:
+        for url, inbound in backlinks.items():
+            if url == old_url or url.startswith(old_url + '/'):
+                for rel_path, link in inbound:
+                    candidates[(rel_path, link[START])] = (rel_path, link)
+    for rel_path in moves:
+        for link in files.get(rel_path, ()):
+            if link[TARGET] is not None:
+                candidates[(rel_path, link[START])] = (rel_path, link)
+
+    edits = {}  # rel_path -> [(start, end, replacement, old link)]
+    for rel_path, link in sorted(candidates.values(), key=lambda item: (item[0], item[1][START])):
+        new_target = move_url(link[TARGET], old_key, new_key, is_directory, url_map)
+        new_base = link_base(moves.get(rel_path, rel_path))
+        if new_target == link[TARGET] and rel_path not in moves:
+            continue
+        if rel_path in moves and new_target == link[TARGET] and split_suffix(link[URL])[0].startswith('/'):
+            continue  # Absolute link from a moved page to a page that stayed put
+        replacement = relink(link, new_base, new_target)
+        if replacement != link[URL]:
+            edits.setdefault(rel_path, []).append((link[START], link[END], replacement, link))
+
+    redirects_file = find_redirects_file()
+    redirects = None
+    redirect_changes = []
+    if redirects_file:
+        with open(redirects_file, 'r', encoding='utf-8') as f:
+            redirects = json.load(f)
+        for rule in redirects:
+            destination = rule.get('destination', '')
+            if not destination.startswith('/') or ':' in destination:
+                continue
+            path, suffix = split_suffix(destination)
+            target = canonical_url(path, aliases)
+            moved_to = move_url(target, old_key, new_key, is_directory, url_map)
+            if moved_to != target:
+                rule['destination'] = site_url(moved_to) + suffix
+                redirect_changes.append((rule['source'], destination, rule['destination']))
+        if add_redirect:
+            if is_directory:
+                rule = {'source': old_url + '/:path*', 'destination': new_url + '/:path*', 'permanent': True}
+            else:
+                rule = {'source': site_url(old_key), 'destination': site_url(new_key), 'permanent': True}
+            redirects.append(rule)
+            redirect_changes.append((rule['source'], None, rule['destination']))
+
+    meta_updates = update_meta(docs_dir, moves, is_directory, old_url.strip('/'), new_url.strip('/'))
+
+    # Report
+    verb = "Would move" if dry_run else "Moving"
+    what = f"directory ({len(moves)} pages)" if is_directory else "page"
+    print(f"📦 {verb} {what} {old_url} → {new_url}\n")
+    for rel_path, file_edits in edits.items():
+        print(f"📄 {os.path.relpath(os.path.join(docs_dir, rel_path), '.')}")
+        for _, _, replacement, link in file_edits:
+            print(f"   🔗 {link[LINE]}:{link[COLUMN]}  {link[URL]} → {replacement}")
+        print()
+    for meta_path in meta_updates:
+        print(f"🧭 {os.path.relpath(meta_path, '.')}: navigation updated")
+    for source, old_destination, new_destination in redirect_changes:
+        if old_destination is None:
+            print(f"↪️  redirects.json: added {source} → {new_destination}")
+        else:
+            print(f"↪️  redirects.json: {source} → {old_destination} now → {new_destination}")
+
+    total_links = sum(len(file_edits) for file_edits in edits.values())
+    if dry_run:
+        print(f"\n✅ {total_links} links in {len(edits)} files would be rewritten")
+        print("\nRun without --dry-run to apply the move")
+        return
+
+    # Rewrite links in place (spans are only trusted while the content still matches them)
+    for rel_path, file_edits in edits.items():
+        path = os.path.join(docs_dir, rel_path)
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if any(content[start:end] != link[URL] for start, end, _, link in file_edits):
+            print(f"❌ Error: {path} changed while moving - re-run the move")
+            sys.exit(1)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(splice(content, [(start, end, replacement) for start, end, replacement, _ in file_edits]))
+    for meta_path, meta in meta_updates.items():
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            f.write(format_meta(meta))
+    if redirects is not None and redirect_changes:
+        with open(redirects_file, 'w', encoding='utf-8') as f:
+            json.dump(redirects, f, indent=2)
+
+    old_path = os.path.join(docs_dir, old_url.strip('/'))
+    if is_directory:
+        os.renames(old_path, new_path)
+    else:
+        os.renames(old_path + '.mdx', new_path + '.mdx')
+    print(f"\n✅ Moved {old_url} → {new_url}, rewrote {total_links} links in {len(edits)} files")
+
+def main():
+    """Main function - answer backlink queries and move pages"""
+    parser = argparse.ArgumentParser(description='Backlink index queries and page moves for the docs')
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Ignore and don't update the shared docs index cache")
+    commands = parser.add_subparsers(dest='command', required=True)
+    links_parser = commands.add_parser('links-to', help='List every link to a page or asset URL')
+    links_parser.add_argument('url', help='Page or asset URL, e.g. /competitions/rewards')
+    move_parser = commands.add_parser('move', help='Move a page or directory and fix inbound links')
+    move_parser.add_argument('old', help='Current URL of the page or directory')
+    move_parser.add_argument('new', help='New URL')
+    move_parser.add_argument('--dry-run', action='store_true',
+                             help='Show what would change without changing anything')
+    move_parser.add_argument('--no-redirect', action='store_true',
+                             help="Don't add a redirects.json entry for the move")
+    args = parser.parse_args()
+
+    docs_dir = find_docs_dir()
+    if not docs_dir:
+        print("❌ Error: docs directory not found")
+        print("Make sure you're running this from the project root or scripts folder")
+        sys.exit(1)
+
+    if args.command == 'links-to':
+        links_to(docs_dir, args.url, use_cache=not args.no_cache)
+    else:
+        move(docs_dir, args.old, args.new, dry_run=args.dry_run, use_cache=not args.no_cache,
+             add_redirect=not args.no_redirect)
+
+if __name__ == '__main__':
+    main()
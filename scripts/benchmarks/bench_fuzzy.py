@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+bench_fuzzy.py
+
+Benchmark the indexed fuzzy matcher (fuzzy_index.FuzzyIndex) against the old
+linear SequenceMatcher scan on synthetic URL sets. Linear timings are measured
+on a sample of queries and reported per query, and every sampled query is
+checked to return the same match from both implementations.
+
+Usage:
+    python scripts/benchmarks/bench_fuzzy.py [--sizes 10000 100000] [--queries 200] [--linear-queries 5]
+"""
+
+import os
+import sys
+import time
+import random
+import string
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzy_index import FuzzyIndex, similarity  # noqa: E402
+
+WORDS = ['agents', 'tools', 'sources', 'frameworks', 'mcp', 'protocol', 'advanced',
+         'competitions', 'guides', 'trading', 'faq', 'register', 'overview', 'reference',
+         'endpoints', 'portfolio', 'manager', 'tutorial', 'leaderboard', 'staking', 'token',
+         'skill', 'markets', 'perps', 'paper', 'rewards', 'user', 'profile', 'build', 'agent']
+
+SYLLABLES = ['ba', 'ce', 'di', 'fo', 'gu', 'ka', 'le', 'mi', 'no', 'pu', 'ra', 'se', 'ti',
+             'vo', 'xu', 'ze', 'st', 'tr', 'ng', 'er', 'on', 'al']
+
+def synthetic_vocabulary(count, rng):
+    """Doc-section words plus pseudo-words, so page slugs are as varied as a real doc set"""
+    words = set(WORDS)
+    while len(words) < count:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+def synthetic_urls(count, rng):
+    """Generate count distinct doc-like URL paths (/section/sub/page-slug)"""
+    vocabulary = synthetic_vocabulary(max(len(WORDS), count // 20), rng)
+    urls = set()
+    while len(urls) < count:
+        depth = rng.randint(1, 3)
+        parts = [rng.choice(WORDS) for _ in range(depth)]  # Section directories
+        parts.append('-'.join(rng.sample(vocabulary, rng.randint(1, 3))))  # Page slug
+        urls.add('/' + '/'.join(parts))
+    return sorted(urls)
+
+def typo(url, rng):
+    """Apply 1-3 random character edits, like a mistyped or partially renamed link"""
+    chars = list(url)
+    for _ in range(rng.randint(1, 3)):
+        pos = rng.randrange(1, len(chars))
+        op = rng.random()
+        if op < 0.4:
+            chars.insert(pos, rng.choice(string.ascii_lowercase))
+        elif op < 0.7 and len(chars) > 2:
+            del chars[pos]
+        else:
+            chars[pos] = rng.choice(string.ascii_lowercase)
+    return ''.join(chars)
+
+def linear_match(query, urls, min_similarity=0.8):
+    """The original find_fuzzy_match() scan (ties resolved to the smallest URL)"""
+    best_match = None
+    best_score = 0
+    for url in urls:
+        score = similarity(query, url)
+        if score > best_score and score >= min_similarity:
+            best_score = score
+            best_match = url
+    return best_match
+
+def run(size, query_count, linear_count, rng):
+    """Benchmark one URL set size and print a result row"""
+    urls = synthetic_urls(size, rng)
+    queries = [typo(rng.choice(urls), rng) for _ in range(query_count)]
+
+    start = time.perf_counter()
+    index = FuzzyIndex(urls)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [index.best_match(q) for q in queries]
+    indexed_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mismatches = 0
+    for query, result in zip(queries[:linear_count], results):
+        if linear_match(query, urls) != result:
+            mismatches += 1
+    linear_time = time.perf_counter() - start
+
+    indexed_per_query = indexed_time / max(1, query_count)
+    linear_per_query = linear_time / max(1, linear_count)
+    print(f"{size:>8} | {build_time:8.2f}s | {indexed_per_query * 1000:10.2f}ms | "
+          f"{index.comparisons / max(1, query_count):10.1f} | {linear_per_query * 1000:10.1f}ms | "
+          f"{size:>10} | {linear_per_query / max(indexed_per_query, 1e-9):8.0f}x | {mismatches}")
+    return mismatches
+
+def main():
+    """Main function - run the benchmark for each requested URL set size"""
+    parser = argparse.ArgumentParser(description='Benchmark indexed vs linear fuzzy URL matching')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                       help='URL set sizes to benchmark')
+    parser.add_argument('--queries', type=int, default=200,
+                       help='Queries per size for the indexed matcher')
+    parser.add_argument('--linear-queries', type=int, default=5,
+                       help='Queries per size for the (slow) linear scan')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print("    URLs |    build | indexed/q | cmp/q idx | linear/q | cmp/q lin |  speedup | mismatches")
+    print("-" * 94)
+    mismatches = sum(run(size, args.queries, args.linear_queries, rng) for size in args.sizes)
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == '__main__':
+    main()
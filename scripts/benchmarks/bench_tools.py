@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+bench_tools.py
+
+Benchmark check-links.py, fix-links.py and fix-redirects.py end to end on
+synthetic docs trees (see docs_tree.py) and compare against a stored baseline.
+
+Each tool run happens in a fresh child process against a copy of the current
+scripts placed next to the generated tree, so the tools find it exactly like
+they find the real docs. For every run the suite records:
+
+    wall      - wall time of the whole process (interpreter start to exit)
+    rss       - peak resident set size of the child
+    fs calls  - stat / scandir / open calls made by the tool (deterministic,
+                so any increase is a real change, not noise)
+    syscalls  - total syscalls from `strace -f -c`, when strace is installed
+
+and per phase (key functions such as load_index, snapshot_tree or
+FuzzyIndex.best_match, timed inclusively): calls, seconds, fs calls and peak
+RSS growth.
+
+Results are compared with scripts/benchmarks/baseline.json. A run regresses
+when wall time or peak RSS grows by more than --tolerance (above a small noise
+floor) or when fs calls grow at all beyond it. Pass --save-baseline to record
+a new baseline.
+
+Usage:
+    python scripts/benchmarks/bench_tools.py [--sizes 1000 10000 100000] [--tools check-links ...]
+                                             [--baseline PATH] [--save-baseline] [--tolerance 0.25]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import runpy
+import shlex
+import shutil
+import builtins
+import platform
+import argparse
+import resource
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCH_DIR)
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+sys.path.insert(0, BENCH_DIR)
+
+from docs_tree import generate_docs_tree  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_WORK_DIR = os.path.join(PROJECT_ROOT, '.cache', 'benchmarks')
+
+# (run name, script, arguments, cache state): cold runs start without the link tool caches,
+# warm runs with a built docs index cache, and primed runs after one untimed identical run
+TOOL_RUNS = [
+    ('check-links cold', 'check-links.py', [], 'cold'),
+    ('check-links warm', 'check-links.py', [], 'warm'),
+    ('check-links incremental', 'check-links.py', ['--incremental'], 'primed'),
+    ('fix-links', 'fix-links.py', ['--dry-run'], 'warm'),
+    ('fix-redirects', 'fix-redirects.py', ['--dry-run', '--flatten', '--compact'], 'warm'),
+]
+
+# Functions timed as phases: (module, attribute path)
+PHASES = [
+    ('docs_index', 'load_index'),
+    ('docs_index', 'parse_file'),
+    ('docs_index', 'extract_links'),
+    ('docs_index', 'extract_anchors'),
+    ('docs_index', 'snapshot_tree'),
+    ('docs_index', 'map_jobs'),
+    ('docs_index', 'write_json_atomic'),
+    ('fuzzy_index', 'FuzzyIndex.__init__'),
+    ('fuzzy_index', 'FuzzyIndex.best_match'),
+    ('redirect_matcher', 'RedirectMatcher.__init__'),
+    ('redirect_matcher', 'RedirectMatcher.match'),
+]
+
+# Regression noise floors: differences smaller than these never count
+WALL_FLOOR = 0.05  # seconds
+RSS_FLOOR = 5.0    # MB
+
+def peak_rss_mb():
+    """Peak RSS of this process so far, in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def install_probes():
+    """Count filesystem calls made through os/builtins and return the live counters"""
+    counters = {'stat': 0, 'scandir': 0, 'open': 0}
+
+    def counted(kind, func):
+        def wrapper(*args, **kwargs):
+            counters[kind] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    # os.path.exists/isdir/isfile and glob go through these module attributes
+    os.stat = counted('stat', os.stat)
+    os.lstat = counted('stat', os.lstat)
+    os.scandir = counted('scandir', os.scandir)
+    os.listdir = counted('scandir', os.listdir)
+    builtins.open = io.open = counted('open', builtins.open)
+    return counters
+
+def install_phases(counters):
+    """Wrap every PHASES function with an inclusive timer and return the live phase records"""
+    phases = {}
+    for module_name, attribute in PHASES:
+        module = __import__(module_name)
+        owner_name, _, func_name = attribute.rpartition('.')
+        owner = getattr(module, owner_name) if owner_name else module
+        func = getattr(owner, func_name)
+        record = phases[attribute] = {'calls': 0, 'seconds': 0.0, 'fs_calls': 0, 'rss_growth_mb': 0.0}
+
+        def wrapper(*args, _func=func, _record=record, **kwargs):
+            fs_before = sum(counters.values())
+            rss_before = peak_rss_mb()
+            start = time.perf_counter()
+            try:
+                return _func(*args, **kwargs)
+            finally:
+                _record['calls'] += 1
+                _record['seconds'] += time.perf_counter() - start
+                _record['fs_calls'] += sum(counters.values()) - fs_before
+                _record['rss_growth_mb'] += peak_rss_mb() - rss_before
+
+        setattr(owner, func_name, wrapper)
+    return phases
+
+def run_child(result_path, script, script_args):
+    """Child process: run one tool under the probes and write its measurements as JSON"""
+    sys.path.insert(0, os.path.dirname(script))
+    counters = install_probes()
+    phases = install_phases(counters)
+    sys.argv = [script] + script_args
+
+    exit_code = 0
+    start = time.perf_counter()
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 1
+    seconds = time.perf_counter() - start
+
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'tool_seconds': seconds,
+            'exit_code': exit_code,
+            'rss_mb': peak_rss_mb(),
+            'fs_calls': dict(counters),
+            'phases': {name: record for name, record in phases.items() if record['calls']},
+        }, f)
+
+def strace_total(path):
+    """Total syscall count from an `strace -c` summary file, or None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.split()
+                if fields and fields[-1] == 'total':
+                    return int(fields[3])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def prepare_project(work_dir, size, seed):
+    """Generate (or reuse) the tree for size and refresh its copy of the scripts"""
+    root = os.path.join(work_dir, f'docs-{size}')
+    start = time.perf_counter()
+    if generate_docs_tree(root, size, seed):
+        print(f"🔧 Generated {size} pages in {time.perf_counter() - start:.1f}s")
+
+    scripts = os.path.join(root, 'scripts')
+    os.makedirs(scripts, exist_ok=True)
+    for name in os.listdir(SCRIPTS_DIR):
+        if name.endswith('.py'):
+            shutil.copy2(os.path.join(SCRIPTS_DIR, name), os.path.join(scripts, name))
+    return root
+
+def run_tool(root, script, script_args, cache_state):
+    """Run one tool in a child process and return its measurements"""
+    cache_dir = os.path.join(root, '.cache', 'link-tools')
+    if cache_state == 'cold' and os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+    elif cache_state == 'primed' or (cache_state == 'warm' and not os.path.exists(cache_dir)):
+        prime = [sys.executable, os.path.join(root, 'scripts', script if cache_state == 'primed'
+                                              else 'check-links.py')]
+        subprocess.run(prime + (script_args if cache_state == 'primed' else []), cwd=root,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result_path = os.path.join(tmp, 'result.json')
+        command = [sys.executable, os.path.abspath(__file__), '--child', result_path,
+                   os.path.join(root, 'scripts', script)] + script_args
+        strace_path = os.path.join(tmp, 'strace.txt')
+        if shutil.which('strace'):
+            command = ['strace', '-f', '-c', '-o', strace_path] + command
+
+        start = time.perf_counter()
+        with open(os.path.join(root, f'{script}.log'), 'w', encoding='utf-8') as log:
+            subprocess.run(command, cwd=root, stdout=log, stderr=subprocess.STDOUT, check=False)
+        wall = time.perf_counter() - start
+
+        with open(result_path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        result['wall'] = wall
+        result['syscalls'] = strace_total(strace_path)
+        return result
+
+def compare(result, baseline, tolerance):
+    """Regressions of result against its baseline entry, as readable strings"""
+    regressions = []
+    if not baseline:
+        return regressions
+    for key, floor, unit in (('wall', WALL_FLOOR, 's'), ('rss_mb', RSS_FLOOR, 'MB')):
+        old, new = baseline[key], result[key]
+        if new > old * (1 + tolerance) and new - old > floor:
+            regressions.append(f"{key} {old:.2f}{unit} → {new:.2f}{unit}")
+    old_fs, new_fs = sum(baseline['fs_calls'].values()), sum(result['fs_calls'].values())
+    if new_fs > old_fs * (1 + tolerance):
+        regressions.append(f"fs calls {old_fs} → {new_fs}")
+    return regressions
+
+def delta(new, old):
+    """Signed percentage change, or blank without a baseline"""
+    if not old:
+        return ''
+    return f"{(new - old) / old * 100:+.0f}%"
+
+def print_result(name, result, baseline):
+    """Print one tool run row and its phases"""
+    fs_calls = result['fs_calls']
+    base = baseline or {}
+    syscalls = result['syscalls'] if result['syscalls'] is not None else '-'
+    print(f"   {name:<24} {result['wall']:8.2f}s {delta(result['wall'], base.get('wall')):>6} "
+          f"{result['rss_mb']:8.1f}MB {delta(result['rss_mb'], base.get('rss_mb')):>6} "
+          f"{fs_calls['stat']:>8} {fs_calls['scandir']:>7} {fs_calls['open']:>7} {syscalls:>9}")
+    for phase, record in sorted(result['phases'].items(), key=lambda item: -item[1]['seconds']):
+        print(f"      {phase:<26} {record['seconds']:8.2f}s {record['calls']:>8} calls "
+              f"{record['fs_calls']:>8} fs {record['rss_growth_mb']:7.1f}MB")
+
+def main():
+    """Main function - generate trees, run every tool on each and compare with the baseline"""
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3], sys.argv[4:])
+        return
+
+    parser = argparse.ArgumentParser(description='Benchmark the link and redirect tools on synthetic docs')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                       help='Docs tree sizes (pages) to benchmark')
+    parser.add_argument('--tools', nargs='+', metavar='NAME',
+                       help='Only run tool runs whose name starts with one of these (e.g. check-links)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the generated trees')
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR,
+                       help='Where generated trees are kept between runs (default: .cache/benchmarks)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline results file')
+    parser.add_argument('--save-baseline', action='store_true',
+                       help='Write this run as the new baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                       help='Allowed growth before a metric counts as a regression (default 0.25 = 25%%)')
+    args = parser.parse_args()
+
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {'results': {}}
+
+    runs = [run for run in TOOL_RUNS if not args.tools or run[0].startswith(tuple(args.tools))]
+    results = {}
+    regressions = []
+    for size in args.sizes:
+        root = prepare_project(args.work_dir, size, args.seed)
+        print(f"\n📄 {size} pages")
+        print(f"   {'run':<24} {'wall':>9} {'Δ':>6} {'peak RSS':>10} {'Δ':>6} "
+              f"{'stat':>8} {'scandir':>7} {'open':>7} {'syscalls':>9}")
+        size_results = results[str(size)] = {}
+        for name, script, script_args, cache_state in runs:
+            result = run_tool(root, script, script_args, cache_state)
+            base = baseline['results'].get(str(size), {}).get(name)
+            size_results[name] = result
+            print_result(name, result, base)
+            regressions += [f"{size} pages, {name}: {r}" for r in compare(result, base, args.tolerance)]
+
+    if args.save_baseline:
+        # Merge so saving a subset of sizes/tools keeps the rest of the baseline
+        for size, size_results in results.items():
+            baseline['results'].setdefault(size, {}).update(size_results)
+        cpus = os.cpu_count() or 1
+        baseline['machine'] = f"{platform.system()} {platform.machine()}, {cpus} CPU{'s' if cpus != 1 else ''}"
+        baseline['python'] = platform.python_version()
+        # How this baseline was produced, so it can be regenerated the same way
+        baseline['command'] = ' '.join(['python', os.path.relpath(os.path.abspath(__file__), PROJECT_ROOT)]
+                                       + [shlex.quote(arg) for arg in sys.argv[1:]])
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\n✅ Baseline saved to {args.baseline}")
+    elif regressions:
+        print("\n❌ Regressions against the baseline:\n")
+        for regression in regressions:
+            print(f"   ❌ {regression}")
+        sys.exit(1)
+    else:
+        print("\n✅ No regressions against the baseline")
+
+if __name__ == '__main__':
+    main()
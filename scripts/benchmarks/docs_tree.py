@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+docs_tree.py
+
+Generate a synthetic project (docs/, public/ and redirects.json) for benchmarking
+the link and redirect tools at sizes the real docs won't reach for years.
+
+The tree mimics the real one: nested section directories each with an
+index.mdx, pages with frontmatter, headings, prose and code fences, and links of
+every kind the tools handle - absolute and relative page links, #anchor deep
+links, JSX href= attributes, images under public/, external URLs, links through
+redirects.json, and a configurable share of broken links (typos and stale
+paths). Links inside code fences and inline code are decoys the tools must
+skip. redirects.json holds moved pages, redirect chains, wildcard rules, exact
+rule families sharing a destination and a few dead destinations.
+
+Generation is deterministic for a given seed and size. A manifest records the
+parameters so benchmark runs can reuse an existing tree.
+
+Usage:
+    python scripts/benchmarks/docs_tree.py OUTPUT_DIR [--pages 10000] [--seed 42]
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_fuzzy import WORDS, synthetic_vocabulary, typo  # noqa: E402
+
+MANIFEST = 'bench-manifest.json'
+GENERATOR_VERSION = 1  # Bump whenever the generated content changes, so cached trees are rebuilt
+
+LINKS_PER_PAGE = 8       # Average links per page (the real docs have ~4-8)
+BROKEN_RATIO = 0.02      # Share of links that are broken
+EXTERNAL_RATIO = 0.1     # Share of links to external sites
+REDIRECT_RATIO = 0.05    # Moved pages (with redirects.json entries) per page
+PAGES_PER_DIRECTORY = 12
+
+# A 1x1 PNG, written for every generated image
+PIXEL_PNG = bytes.fromhex('89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+                          '1f15c4890000000d49444154789c6300010000050001'
+                          '0d0a2db40000000049454e44ae426082')
+
+def generate_layout(pages, rng, vocabulary):
+    """Page paths (docs-relative, .mdx) for a nested tree with an index.mdx per directory"""
+    directories = ['']
+    while len(directories) * PAGES_PER_DIRECTORY < pages:
+        parent = rng.choice(directories[-50:] + directories[:5])
+        if parent.count('/') >= 4:
+            parent = ''
+        name = rng.choice(WORDS) if parent == '' else rng.choice(vocabulary)
+        path = f'{parent}/{name}'.lstrip('/')
+        if path not in directories:
+            directories.append(path)
+
+    paths = set()
+    for directory in directories:
+        paths.add(f'{directory}/index.mdx'.lstrip('/'))
+    while len(paths) < pages:
+        directory = rng.choice(directories)
+        slug = '-'.join(rng.sample(vocabulary, rng.randint(1, 3)))
+        paths.add(f'{directory}/{slug}.mdx'.lstrip('/'))
+    return sorted(paths)
+
+def page_url(rel_path):
+    """URL of a docs-relative page path (index pages link to their directory)"""
+    url = '/' + rel_path[:-len('.mdx')]
+    return url[:-len('/index')] or '/' if url.endswith('/index') else url
+
+def heading_slug(heading):
+    """Anchor of a generated heading (plain lowercase words, so slugging is trivial)"""
+    return heading.lower().replace(' ', '-')
+
+def page_content(rel_path, page, pages, urls, redirect_sources, images, rng, vocabulary):
+    """MDX source for one page"""
+    lines = ['---', f'title: {page["title"]}', f'description: Synthetic page {rel_path}', '---', '']
+    directory = os.path.dirname(rel_path)
+
+    def random_link():
+        """One link target, drawn from the configured mix"""
+        roll = rng.random()
+        if roll < BROKEN_RATIO:
+            # Broken: a typo of a real URL, or a path that was never a page
+            if rng.random() < 0.7:
+                return typo(rng.choice(urls), rng)
+            return '/' + '/'.join(rng.sample(vocabulary, 2))
+        roll -= BROKEN_RATIO
+        if roll < EXTERNAL_RATIO:
+            return f'https://{rng.choice(vocabulary)}.example.com/{rng.choice(vocabulary)}'
+        roll -= EXTERNAL_RATIO
+        if roll < 0.05 and redirect_sources:
+            return rng.choice(redirect_sources)  # Works, but only through redirects.json
+        if roll < 0.15:
+            # Relative link to a sibling page
+            siblings = pages['by_directory'][directory]
+            sibling = rng.choice(siblings)
+            return os.path.splitext(os.path.basename(sibling))[0]
+        target = rng.choice(pages['paths'])
+        url = page_url(target)
+        if rng.random() < 0.15:
+            url += '#' + heading_slug(rng.choice(pages['headings'][target]))
+        return url
+
+    links_left = max(1, int(rng.gauss(LINKS_PER_PAGE, 2)))
+    for heading in page['headings']:
+        lines += [f'## {heading}', '']
+        words = ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(20, 60)))
+        if links_left:
+            links_left -= 1
+            words += f' See [{rng.choice(vocabulary)}]({random_link()}) for details.'
+        lines += [words, '']
+        roll = rng.random()
+        if roll < 0.2:
+            # Decoy links in code must be ignored by every tool
+            lines += ['```bash', f'curl https://api.example.com/{rng.choice(vocabulary)}',
+                      f'# see [old docs](/{rng.choice(vocabulary)}/gone)', '```', '']
+        elif roll < 0.35:
+            lines += [f'<Card title="{rng.choice(vocabulary)}" href="{random_link()}" />', '']
+            links_left = max(0, links_left - 1)
+        elif roll < 0.45:
+            lines += [f'Use `[example](/{rng.choice(vocabulary)})` in your own pages.', '']
+        elif roll < 0.55 and images:
+            lines += [f'![{rng.choice(vocabulary)}]({rng.choice(images)})', '']
+    # Remaining links as a "related pages" list, like the real docs' Next Steps sections
+    if links_left:
+        lines += ['## Related', '']
+        lines += [f'- [{rng.choice(vocabulary)}]({random_link()})' for _ in range(links_left)]
+        lines.append('')
+    return '\n'.join(lines)
+
+def generate_redirects(paths, rng, vocabulary):
+    """redirects.json rules: moved pages, chains, wildcards, rule families and dead destinations"""
+    count = max(10, int(len(paths) * REDIRECT_RATIO))
+    live = [page_url(path) for path in paths]
+    redirects = []
+    sources = set()
+
+    def add(source, destination):
+        if source not in sources and source not in live:
+            sources.add(source)
+            redirects.append({'source': source, 'destination': destination, 'permanent': True})
+
+    # Moved pages: old-location -> live page
+    while len(redirects) < count * 0.7:
+        add(f'/old/{rng.choice(vocabulary)}/{rng.choice(vocabulary)}', rng.choice(live))
+    moved = [rule['source'] for rule in redirects]
+
+    # Chains: a second generation of old URLs pointing at first-generation ones
+    for _ in range(int(count * 0.1)):
+        add(f'/older/{rng.choice(vocabulary)}/{rng.choice(vocabulary)}', rng.choice(moved))
+
+    # Exact rule families sharing one destination (wildcard compaction candidates)
+    while len(redirects) < count * 0.95:
+        family = f'/retired/{rng.choice(vocabulary)}'
+        destination = rng.choice(live)
+        add(family, destination)
+        for _ in range(rng.randint(2, 8)):
+            add(f'{family}/{rng.choice(vocabulary)}', destination)
+
+    # Wildcards and a few dead destinations
+    for word in rng.sample(vocabulary, 5):
+        add(f'/legacy-{word}/:path*', f'/{rng.choice(WORDS)}/:path*')
+    while len(redirects) < count:
+        add(f'/old/{rng.choice(vocabulary)}/{rng.choice(vocabulary)}', typo(rng.choice(live), rng))
+    return redirects
+
+def generate_docs_tree(root, pages, seed=42):
+    """Write a synthetic project of pages MDX pages under root (reusing a matching existing tree)"""
+    manifest_path = os.path.join(root, MANIFEST)
+    manifest = {'version': GENERATOR_VERSION, 'pages': pages, 'seed': seed}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            if json.load(f) == manifest:
+                return False
+    except (OSError, ValueError):
+        pass
+
+    rng = random.Random(seed)
+    vocabulary = synthetic_vocabulary(max(len(WORDS), pages // 10), rng)
+    paths = generate_layout(pages, rng, vocabulary)
+
+    # Titles and headings first, so deep links can target real anchors
+    page_data = {}
+    headings = {}
+    by_directory = {}
+    for path in paths:
+        page_headings = [' '.join(rng.sample(vocabulary, 2)) for _ in range(rng.randint(2, 6))]
+        page_data[path] = {'title': ' '.join(rng.sample(vocabulary, 2)).title(),
+                           'headings': page_headings}
+        headings[path] = page_headings
+        by_directory.setdefault(os.path.dirname(path), []).append(path)
+    pages_info = {'paths': paths, 'headings': headings, 'by_directory': by_directory}
+
+    redirects = generate_redirects(paths, rng, vocabulary)
+    redirect_sources = [rule['source'] for rule in redirects if ':' not in rule['source']]
+    images = [f'/img/bench/{i:05d}.png' for i in range(max(10, pages // 50))]
+    urls = [page_url(path) for path in paths]
+
+    # Start from an empty tree so shrinking the page count doesn't leave stale files
+    docs_dir = os.path.join(root, 'docs')
+    public_dir = os.path.join(root, 'public')
+    for directory in (docs_dir, public_dir):
+        if os.path.exists(directory):
+            for dirpath, dirnames, filenames in os.walk(directory, topdown=False):
+                for name in filenames:
+                    os.remove(os.path.join(dirpath, name))
+                for name in dirnames:
+                    os.rmdir(os.path.join(dirpath, name))
+
+    for path in paths:
+        full_path = os.path.join(docs_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w', encoding='utf-8') as f:
+            f.write(page_content(path, page_data[path], pages_info, urls, redirect_sources,
+                                 images, rng, vocabulary))
+
+    os.makedirs(os.path.join(public_dir, 'img', 'bench'), exist_ok=True)
+    for image in images:
+        with open(os.path.join(public_dir, image.lstrip('/')), 'wb') as f:
+            f.write(PIXEL_PNG)
+
+    with open(os.path.join(root, 'redirects.json'), 'w', encoding='utf-8') as f:
+        json.dump(redirects, f, indent=2)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    return True
+
+def main():
+    """Main function - generate one synthetic docs tree"""
+    parser = argparse.ArgumentParser(description='Generate a synthetic docs tree for benchmarks')
+    parser.add_argument('output', help='Project directory to create (docs/, public/, redirects.json)')
+    parser.add_argument('--pages', type=int, default=10000, help='Number of MDX pages')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    if generate_docs_tree(args.output, args.pages, args.seed):
+        print(f"✅ Generated {args.pages} pages in {args.output}")
+    else:
+        print(f"✅ {args.output} already holds {args.pages} pages (seed {args.seed})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+check-assets.py
+
+Page weight check for the images and other assets MDX pages load.
+Resolves every ![]() image and src="..." asset of each page (against public/ for
+absolute paths, the page's directory for relative ones), sums the bytes each
+page loads and flags:
+
+    - assets larger than the per-asset budget
+    - pages whose assets add up to more than the per-page budget
+    - images wider than --max-width pixels (screenshots that were never resized)
+    - PNG/JPEG/GIF images that would be much smaller as WebP or AVIF
+
+An asset used several times on one page is counted once, as the browser only
+downloads it once. Missing assets are left to check-links.py.
+
+Usage:
+    python check-assets.py [--asset-budget KB] [--page-budget KB] [--max-width PX] [--no-cache]
+                           [--metrics json] [--metrics-file PATH] [--profile PATH]
+
+Options:
+    --asset-budget KB    Largest acceptable single asset (default 500)
+    --page-budget KB     Largest acceptable total asset weight per page (default 2048)
+    --max-width PX       Widest acceptable image (default 2000)
+    --no-cache           Ignore and don't update the shared docs index cache
+    --metrics json       Emit per-phase timings and counters (stderr)
+    --metrics-file PATH  Write --metrics output to PATH instead
+    --profile PATH       Write a cProfile of the run to PATH
+
+Exits 1 if any asset or page is over budget; size and format findings are warnings.
+"""
+
+import sys
+import os
+import struct
+import argparse
+from urllib.parse import unquote
+
+from docs_index import find_docs_dir, load_index, project_root_for, split_fragment
+from run_metrics import add_metrics_arguments, start_metrics
+
+DEFAULT_ASSET_BUDGET = 500    # KB
+DEFAULT_PAGE_BUDGET = 2048    # KB
+DEFAULT_MAX_WIDTH = 2000      # Pixels - about twice the docs content column, for high-DPI screens
+
+# Raster formats with much smaller modern equivalents, and the smallest size worth converting
+LEGACY_FORMATS = {'.png': 'PNG', '.jpg': 'JPEG', '.jpeg': 'JPEG', '.gif': 'GIF', '.bmp': 'BMP',
+                  '.tif': 'TIFF', '.tiff': 'TIFF'}
+LEGACY_FORMAT_MIN_BYTES = 50 * 1024
+
+def format_size(size):
+    """Human-readable byte count (KB/MB)"""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.0f} KB"
+
+def resolve_asset(docs_root, public_dir, rel_path, link):
+    """Absolute path of the local file an asset link loads, or None (external, page or missing)"""
+    path = unquote(split_fragment(link)[0].split('?', 1)[0])
+    if not path or '://' in path or path.startswith(('//', 'data:', 'mailto:')):
+        return None
+    if path.startswith('/'):
+        # Next.js serves public/ at the site root
+        candidates = [os.path.join(public_dir, path.lstrip('/'))]
+    else:
+        candidates = [os.path.join(docs_root, os.path.dirname(rel_path), path)]
+    for candidate in candidates:
+        candidate = os.path.normpath(candidate)
+        if os.path.isfile(candidate) and not candidate.endswith(('.mdx', '.md')):
+            return candidate
+    return None
+
+def png_size(header):
+    """(width, height) from a PNG IHDR chunk"""
+    if header[:8] == b'\x89PNG\r\n\x1a\n' and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    return None
+
+def gif_size(header):
+    """(width, height) from a GIF logical screen descriptor"""
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', header[6:10])
+    return None
+
+def webp_size(header):
+    """(width, height) from a WebP VP8, VP8L or VP8X header"""
+    if header[:4] != b'RIFF' or header[8:12] != b'WEBP':
+        return None
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3fff, height & 0x3fff
+    if chunk == b'VP8L':
+        bits = int.from_bytes(header[21:25], 'little')
+        return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    if chunk == b'VP8X':
+        return int.from_bytes(header[24:27], 'little') + 1, int.from_bytes(header[27:30], 'little') + 1
+    return None
+
+def jpeg_size(f):
+    """(width, height) from the first JPEG start-of-frame marker, walking segment headers"""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        kind = marker[1]
+        if kind == 0xFF:
+            f.seek(-1, os.SEEK_CUR)  # Fill byte
+            continue
+        if kind in (0xD8, 0x01) or 0xD0 <= kind <= 0xD7:
+            continue  # Markers without a length
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        segment_length = struct.unpack('>H', length)[0]
+        # SOF0-SOF15, except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= kind <= 0xCF and kind not in (0xC4, 0xC8, 0xCC):
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>HH', frame[1:5])
+            return width, height
+        f.seek(segment_length - 2, os.SEEK_CUR)
+
+def image_size(path):
+    """(width, height) of a PNG, JPEG, GIF or WebP image from its header, or None"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(32)
+            if header[:2] == b'\xff\xd8':
+                return jpeg_size(f)
+    except OSError:
+        return None
+    return png_size(header) or gif_size(header) or webp_size(header)
+
+def main():
+    """Main function - sum the asset weight of every page and report budget violations"""
+    parser = argparse.ArgumentParser(description='Check the weight of images and assets loaded by documentation pages')
+    parser.add_argument('--asset-budget', type=int, default=DEFAULT_ASSET_BUDGET, metavar='KB',
+                       help=f'Largest acceptable single asset (default {DEFAULT_ASSET_BUDGET})')
+    parser.add_argument('--page-budget', type=int, default=DEFAULT_PAGE_BUDGET, metavar='KB',
+                       help=f'Largest acceptable total asset weight per page (default {DEFAULT_PAGE_BUDGET})')
+    parser.add_argument('--max-width', type=int, default=DEFAULT_MAX_WIDTH, metavar='PX',
+                       help=f'Widest acceptable image (default {DEFAULT_MAX_WIDTH})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Ignore and don't update the shared docs index cache")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+    metrics = start_metrics(args, 'check-assets')
+    asset_budget = args.asset_budget * 1024
+    page_budget = args.page_budget * 1024
+
+    docs_dir = find_docs_dir()
+    if not docs_dir:
+        print("❌ Error: docs directory not found")
+        print("Make sure you're running this from the project root or scripts folder")
+        sys.exit(1)
+
+    print("🔍 Checking asset weight in documentation...\n")
+    print(f"Using docs directory: {docs_dir}")
+    print(f"Budgets: {format_size(asset_budget)} per asset, {format_size(page_budget)} per page, "
+          f"{args.max_width}px wide\n")
+
+    with metrics.phase('index'):
+        index = load_index(docs_dir, use_cache=not args.no_cache)
+    metrics.cache('docs_index', len(index['files']) - index['parsed'], index['parsed'])
+    docs_root = os.path.normpath(os.path.abspath(docs_dir))
+    public_dir = os.path.join(project_root_for(docs_dir), 'public')
+
+    # Each distinct asset is stat'ed (and its header read) once, however many pages use it
+    assets = {}  # path -> {size, dimensions}
+    pages = {}   # src -> [(link, path)] of distinct assets, in order of appearance
+    with metrics.phase('resolve'):
+        for rel_path, entry in index['files'].items():
+            seen = set()
+            page_assets = []
+            for link in entry.get('assets', []):
+                path = resolve_asset(docs_root, public_dir, rel_path, link)
+                if path is None or path in seen:
+                    continue
+                seen.add(path)
+                page_assets.append((link, path))
+                if path not in assets:
+                    assets[path] = {'size': os.path.getsize(path), 'dimensions': image_size(path)}
+            if page_assets:
+                pages[os.path.relpath(os.path.join(docs_dir, rel_path), '.')] = page_assets
+    metrics.count('assets', len(assets))
+    metrics.count('pages_with_assets', len(pages))
+
+    # Findings per page: over-budget assets and pages fail, size and format findings warn
+    over_budget_assets = set()
+    over_budget_pages = 0
+    warned_assets = set()
+    reports = {}
+    for src, page_assets in pages.items():
+        total = sum(assets[path]['size'] for _, path in page_assets)
+        lines = []
+        for link, path in page_assets:
+            size = assets[path]['size']
+            dimensions = assets[path]['dimensions']
+            problems = []
+            failed = size > asset_budget
+            if failed:
+                problems.append(f"over the {format_size(asset_budget)} budget")
+                over_budget_assets.add(path)
+            if dimensions and dimensions[0] > args.max_width:
+                problems.append(f"{dimensions[0]}×{dimensions[1]}px, resize to {args.max_width}px wide")
+            extension = os.path.splitext(path)[1].lower()
+            if extension in LEGACY_FORMATS and size >= LEGACY_FORMAT_MIN_BYTES:
+                problems.append(f"{LEGACY_FORMATS[extension]}, convert to WebP or AVIF")
+            if problems:
+                if not failed:
+                    warned_assets.add(path)
+                icon = "❌" if failed else "⚠️ "
+                lines.append(f"   {icon} {link}  {format_size(size)} ({'; '.join(problems)})")
+        if total > page_budget:
+            over_budget_pages += 1
+        if lines or total > page_budget:
+            reports[src] = (total, len(page_assets), lines)
+
+    # Display results
+    for src, (total, count, lines) in reports.items():
+        status = f"❌ over the {format_size(page_budget)} page budget" if total > page_budget else "within budget"
+        print(f"📄 {src} - {format_size(total)} in {count} assets, {status}")
+        for line in lines:
+            print(line)
+        print()
+
+    total_bytes = sum(asset['size'] for asset in assets.values())
+    print(f"Checked {len(assets)} assets ({format_size(total_bytes)}) across {len(pages)} pages")
+    if warned_assets:
+        print(f"⚠️  {len(warned_assets)} assets within budget could be resized or converted")
+    if over_budget_assets or over_budget_pages:
+        print(f"❌ {len(over_budget_assets)} assets and {over_budget_pages} pages over budget")
+        sys.exit(1)
+    print("✅ All assets and pages within budget!")
+
+if __name__ == '__main__':
+    main()
@@ -3,83 +3,69 @@
 check-links.py
 
 Simple script to check for broken internal links in MDX documentation files.
-Checks both markdown links [text](url) and href attributes href="url".
+Checks markdown links [text](url), images, reference definitions and href/src
+attributes outside code, including #anchor fragments. Generated endpoint pages
+are checked against specs/competitions.json, and links through redirects.json
+are followed like Next.js does and reported with their hop count.
 
 Usage:
-    python check-links.py
+    python check-links.py [--no-cache] [--incremental] [--state PATH] [--jobs N]
+                          [--external] [--external-ttl SECONDS] [--external-concurrency N]
+                          [--external-rate N] [--metrics json] [--metrics-file PATH] [--profile PATH]
+                          [--watch [--poll]] [--shard I/N [--shard-output PATH]]
+    python check-links.py merge PARTIAL...
+
+Options:
+    --no-cache     Ignore and don't update the shared docs index cache
+    --incremental  Only re-check changed files and files linking to added/removed targets
+    --state PATH   State file for --incremental (default: .cache/link-tools/check-links-state.json)
+    --jobs N       Check files in N worker processes (0 = one per CPU, default 1)
+    --external     Also check http(s) links over the network (results cached for --external-ttl)
+    --external-ttl SECONDS      Reuse cached external results younger than this (default 86400, 0 = never)
+    --external-concurrency N    External requests in flight at once (default 32)
+    --external-rate N           External requests per second per host (default 20, 0 = unlimited)
+    --metrics json       Emit per-phase timings, per-file cost, probe counts and cache hit rates (stderr)
+    --metrics-file PATH  Write --metrics output to PATH instead
+    --profile PATH       Write a cProfile of the run to PATH
+    --watch        Keep running: re-check changed files and their inbound linkers on every save
+    --poll         With --watch, poll for changes instead of using inotify
+    --shard I/N    Only check shard I of N (source files split by a stable hash) and write its
+                   partial results; exits 0 once they are written
+    --shard-output PATH  Partial results file (default: .cache/link-tools/check-links-shard-I-of-N.json)
+
+Subcommands:
+    merge PARTIAL...  Combine the results of every --shard run into the report and exit code
+                      a single full run would produce
 """
 
 import sys
 import os
-import re
-import glob
+import json
+import hashlib
+import time
+import argparse
+from collections import Counter
 from urllib.parse import urlparse
 
-def find_docs_dir():
-    """Find the docs directory relative to script location - works from project root or scripts folder"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Try current directory first (if run from project root)
-    docs_dir = os.path.join(script_dir, 'docs')
-    if os.path.exists(docs_dir):
-        return docs_dir
-    
-    # Try parent directory (if run from scripts folder)
-    docs_dir = os.path.join(script_dir, '..', 'docs')
-    if os.path.exists(docs_dir):
-        return docs_dir
-    
-    # Try relative to current working directory
-    docs_dir = 'docs'
-    if os.path.exists(docs_dir):
-        return docs_dir
-    
-    return None
+from docs_index import (find_redirects_file, load_index, project_root_for, write_json_atomic,
+                        map_jobs, parse_jobs, snapshot_tree, snapshot_exists, snapshot_isdir,
+                        in_snapshot, split_fragment, content_hash, parse_file)
+from docs_roots import (load_roots, load_root_indexes, describe_roots, mount_table, resolve_mount,
+                        outer_dirs)
+from redirect_matcher import RedirectMatcher, load_redirects
+from run_metrics import add_metrics_arguments, start_metrics
+from fs_watch import open_watcher
+from openapi_index import load_spec_index, ENDPOINTS_DIR
+from external_links import (ExternalLinkChecker, DEFAULT_TTL, DEFAULT_CONCURRENCY,
+                            DEFAULT_HOST_RATE, is_external, is_broken, describe)
 
-def is_template_or_dynamic(link):
-    """Check if link is a template variable or dynamic content that should be ignored"""
-    # Template variables: ${variable}, {variable}, {{variable}}
-    if ('${' in link and '}' in link) or ('{' in link and '}' in link):
-        return True
-    
-    # Dynamic placeholders: [variable], <variable>
-    if ('[' in link and ']' in link) or ('<' in link and '>' in link):
-        return True
-    
-    # Common template patterns: :variable, @variable
-    if link.startswith(':') or link.startswith('@'):
-        return True
-    
-    # Interpolation patterns: %variable%, %{variable}
-    if ('%' in link and link.count('%') >= 2) or ('%{' in link and '}' in link):
-        return True
-    
-    return False
+# Bump whenever the link resolution rules change so stale incremental results are discarded
+STATE_VERSION = 9
+# Bump whenever the layout of --shard result files changes
+SHARD_VERSION = 1
 
-def find_links(file_path):
-    """Extract all links from file - both markdown [text](url) and HTML href="url" formats"""
-    # Regex for markdown links: [text](url)
-    markdown_pattern = re.compile(r'\[[^\]]+\]\(([^)]+)\)')
-    # Regex for href attributes: href="url" or href='url' (case insensitive)
-    href_pattern = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract URLs from both link types
-        markdown_links = markdown_pattern.findall(content)
-        href_links = href_pattern.findall(content)
-        
-        # Filter out template variables and dynamic content
-        filtered_links = [link for link in markdown_links + href_links if not is_template_or_dynamic(link)]
-        
-        # Return combined list of all found URLs
-        return filtered_links
-        
-    except Exception as e:
-        print(f"Warning: Could not read {file_path}: {e}")
-        return []
+# Per-process filesystem snapshot, redirect matcher and link memo for check_file_task, set by init_worker
+worker_state = {}
 
 def is_internal(link):
     """Check if link is internal (relative/absolute path) vs external (http/https URL)"""
@@ -91,8 +77,8 @@ def normalize_link(link):
     """Clean link by removing URL fragments (#section) and query params (?param=value)"""
     return link.split('#', 1)[0].split('?', 1)[0].strip()
 
-def check_file_exists(path):
-    """Check if file/directory exists, trying common variations (.mdx, .md, /index.mdx)"""
+def link_candidates(path, snapshot):
+    """Candidate paths tried for a link target (.mdx, .md and /index.mdx variations)"""
     candidates = [path]
     
     # Try adding file extensions if not present
@@ -101,75 +87,445 @@ def check_file_exists(path):
         candidates.append(path + '.md')
     
     # Try index files if path is a directory
-    if os.path.isdir(path):
+    if snapshot_isdir(snapshot, path):
         candidates.append(os.path.join(path, 'index.mdx'))
         candidates.append(os.path.join(path, 'index.md'))
     
-    return any(os.path.exists(c) for c in candidates)
+    return candidates
 
-def main():
-    """Main function - scan all MDX files and report broken internal links"""
-    docs_dir = find_docs_dir()
+def find_existing(path, snapshot, deps=None, stats=None):
+    """Return the existing candidate for a link target (preferring files), or None"""
+    if deps is not None:
+        # Record every path whose appearance or removal could change this answer
+        deps.update((path, path + '.mdx', path + '.md',
+                     os.path.join(path, 'index.mdx'), os.path.join(path, 'index.md')))
     
-    if not docs_dir:
-        print("❌ Error: docs directory not found")
-        print("Make sure you're running this from the project root or scripts folder")
-        sys.exit(1)
+    candidates = link_candidates(path, snapshot)
+    if stats is not None:
+        # Probes answered by the snapshot vs. ones that fall through to a real stat()
+        stats['probes'] += len(candidates)
+        stats['fs_probes'] += sum(1 for c in candidates if not in_snapshot(snapshot, c))
+    existing = [c for c in candidates if snapshot_exists(snapshot, c)]
+    files = [c for c in existing if c in snapshot['files']]
+    return (files or existing or [None])[0]
+
+def check_file_exists(path, snapshot, deps=None, stats=None):
+    """Check if file/directory exists, trying common variations (.mdx, .md, /index.mdx)"""
+    return find_existing(path, snapshot, deps, stats) is not None
+
+def resolve_link(mounts, public_dir, rel_dir, norm, snapshot, stats=None):
+    """Resolve one normalized link against the snapshot, returning (resolved path or None, deps)"""
+    deps = set()
     
-    print("🔍 Checking for broken links in documentation...\n")
-    print(f"Using docs directory: {docs_dir}")
-    print("Checking both markdown links [text](url) and href attributes href=\"url\"")
-    print("Filtering out template variables (${var}, {var}, [var], <var>, :var, @var, %var%)\n")
+    # Resolve link path relative to file location
+    if norm.startswith('/'):
+        # Absolute path: could be a page in the docs root serving that URL prefix or NextJS public assets
+        root_dir, root_path, exclude = resolve_mount(mounts, norm)
+        target = root_dir and os.path.normpath(os.path.join(root_dir, root_path.lstrip('/')))
+        if target and any(target == ex or target.startswith(ex + os.sep) for ex in exclude):
+            target = None  # A nested root's pages are only served under that root's own prefix
+        
+        # If not found in docs, try NextJS public directory
+        if not target or not check_file_exists(target, snapshot, deps, stats):
+            public_target = os.path.normpath(os.path.join(public_dir, norm.lstrip('/')))
+            if check_file_exists(public_target, snapshot, deps, stats):
+                target = public_target
+            elif not target:
+                return None, deps
+    else:
+        # Relative path: relative to current file's directory
+        target = os.path.normpath(os.path.join(rel_dir, norm))
+        
+    # Check if target file exists
+    return find_existing(target, snapshot, deps, stats), deps
+
+def has_anchor(anchors, page, fragment):
+    """Check a #fragment against a page's heading/id index (unknown pages always pass)"""
+    page_anchors = anchors.get(page)
+    return page_anchors is None or fragment in page_anchors
+
+def check_links(mounts, public_dir, mdx, links, snapshot, anchors, deps=None, memo=None,
+                redirect_matcher=None, stats=None):
+    """
+    Check one file's links (including #anchors), in order of appearance.
     
-    # Get all MDX files recursively
-    mdx_files = glob.glob(os.path.join(docs_dir, '**/*.mdx'), recursive=True)
-    broken = {}  # Dictionary to store broken links by file
-    total_files = 0
-    total_links = 0
+    mounts is the (URL prefix, docs root, excluded dirs) table absolute links resolve through.
+    Returns (broken links, redirected links) where redirected links are
+    (link, final destination, hops) for links that go through redirects.json.
+    If stats is given, memo hits/misses and existence probes are added to it.
+    """
+    rel_dir = os.path.dirname(mdx)  # Directory containing current file
+    broken = []
+    redirected = []
+    if memo is None:
+        memo = {}
     
-    # Process each MDX file
-    for mdx in mdx_files:
-        total_files += 1
-        links = find_links(mdx)
-        rel_dir = os.path.dirname(mdx)  # Directory containing current file
+    # Check each link found in the file
+    for link in links:
+        # Skip external links (http/https)
+        if not is_internal(link):
+            continue
         
-        # Check each link found in the file
-        for link in links:
-            total_links += 1
+        # Clean up link (remove fragments/queries), keeping the fragment for anchor checks
+        norm = normalize_link(link)
+        fragment = split_fragment(link)[1]
+        if not norm:
+            # Same-page anchor (#section) - checked against this file's own headings
+            if fragment and not has_anchor(anchors, mdx, fragment):
+                broken.append(link)
+            continue
+        
+        # Next.js applies redirects before serving pages, so a matching source wins
+        hops = 0
+        if redirect_matcher and norm.startswith('/'):
+            redirect_key = ('redirect', norm)
+            if redirect_key not in memo:
+                memo[redirect_key] = redirect_matcher.redirect_chain(norm)
+            chain, cycle = memo[redirect_key]
+            hops = len(chain) - 1
+            if cycle:
+                broken.append(link)
+                continue
+            if hops and '://' in chain[-1]:
+                # Redirects off-site - nothing left to check locally
+                redirected.append((link, chain[-1], hops))
+                continue
+            if hops:
+                # Check the page the chain ends at instead of the link's own path
+                norm = normalize_link(chain[-1])
+        
+        # Identical links (per directory, for relative ones) are only resolved once
+        key = norm if norm.startswith('/') else (rel_dir, norm)
+        if key not in memo:
+            memo[key] = resolve_link(mounts, public_dir, rel_dir, norm, snapshot, stats)
+            if stats is not None:
+                stats['memo_misses'] += 1
+        elif stats is not None:
+            stats['memo_hits'] += 1
+        resolved, link_deps = memo[key]
+        if deps is not None:
+            deps.update(link_deps)
             
-            # Skip external links (http/https)
-            if not is_internal(link):
+        if resolved is None:
+            if link == ".+?":  # Skip regex false positives
+                continue
+            # Record broken link
+            broken.append(link)
+            continue
+        if fragment:
+            # Deep link (page#section) - the target's headings decide, so depend on its content
+            if deps is not None:
+                deps.add(resolved)
+            if not has_anchor(anchors, resolved, fragment):
+                broken.append(link)
                 continue
-                
-            # Clean up link (remove fragments/queries)
-            norm = normalize_link(link)
-            if not norm:
+        if hops:
+            redirected.append((link, norm, hops))
+    
+    return broken, redirected
+
+def init_worker(mounts, public_dir, snapshot, anchors, redirects):
+    """Process-pool initializer: ship the mounts, filesystem snapshot, anchor index and redirects to each worker once"""
+    worker_state['mounts'] = mounts
+    worker_state['public_dir'] = public_dir
+    worker_state['snapshot'] = snapshot
+    worker_state['anchors'] = anchors
+    worker_state['redirect_matcher'] = RedirectMatcher(redirects)  # Compiled once per worker
+    worker_state['memo'] = {}  # Resolved links shared across this worker's files
+
+def check_file_task(task):
+    """Process-pool task: check one file's links, returning (broken, redirected, deps or None, stats or None)"""
+    mdx, links, track_deps, collect_stats = task
+    deps = set() if track_deps else None
+    stats = dict.fromkeys(('memo_hits', 'memo_misses', 'probes', 'fs_probes'), 0) if collect_stats else None
+    start = time.perf_counter()
+    broken, redirected = check_links(worker_state['mounts'], worker_state['public_dir'], mdx, links,
+                                     worker_state['snapshot'], worker_state['anchors'], deps,
+                                     worker_state['memo'], worker_state['redirect_matcher'], stats)
+    if stats is not None:
+        stats['seconds'] = time.perf_counter() - start
+    return broken, redirected, deps, stats
+
+def anchors_key(anchors):
+    """Compact fingerprint of a page's anchors, so incremental runs notice heading changes"""
+    if anchors is None:
+        return None
+    return hashlib.sha1('\n'.join(anchors).encode('utf-8')).hexdigest()
+
+def apply_spec_index(spec_index, project_root, all_files, snapshot):
+    """
+    Make the snapshot list exactly the endpoint pages the OpenAPI spec generates.
+    
+    Pages for the spec's tags count as existing even before generate-openapi.ts
+    has run, and generated pages whose tag left the spec count as gone.
+    Returns {rel_path: anchors} of the generated pages, for #anchor checks.
+    """
+    pages = {}
+    for rel_path, anchors in spec_index['pages'].items():
+        path = os.path.join(project_root, os.path.normpath(rel_path))
+        if not in_snapshot(snapshot, path):
+            continue  # Endpoints directory outside every docs root
+        snapshot['files'].add(path)
+        directory = os.path.dirname(path)
+        while directory not in snapshot['dirs'] and in_snapshot(snapshot, directory):
+            snapshot['dirs'].add(directory)
+            directory = os.path.dirname(directory)
+        pages[relative_to(path, project_root)] = anchors
+    
+    # Generated pages are the ones whose anchors the docs index can't know
+    endpoints_dir = os.path.normpath(ENDPOINTS_DIR)
+    for rel_path, entry in all_files.items():
+        if (os.path.dirname(rel_path) == endpoints_dir and entry.get('anchors') is None
+                and rel_path not in pages):
+            snapshot['files'].discard(os.path.join(project_root, rel_path))
+    return pages
+
+def relative_to(path, root):
+    """Path relative to root - a cheap prefix strip for paths inside root"""
+    if path.startswith(root + os.sep):
+        return path[len(root) + 1:]
+    return os.path.relpath(path, root)
+
+def read_state(state_path):
+    """Load the incremental state file, or None if missing, stale or unreadable"""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    return state if state.get('version') == STATE_VERSION else None
+
+class LinkGraph:
+    """
+    In-memory link state for --watch: the docs index, filesystem snapshot, per-file
+    results and a reverse dependency map (path -> files whose links depend on it).
+    
+    Memory stays proportional to the tree, not to how long the watch runs: link
+    memos only live for one batch, and a file's dependency edges are replaced,
+    never accumulated, each time it is re-checked.
+    """
+    
+    def __init__(self, docs_dir, redirects_file, jobs=1, use_cache=True):
+        self.docs_dir = docs_dir
+        self.docs_root = os.path.normpath(os.path.abspath(docs_dir))
+        self.mounts = [('/', self.docs_root, [])]
+        self.public_dir = os.path.join(project_root_for(docs_dir), 'public')
+        self.redirects_file = redirects_file and os.path.normpath(os.path.abspath(redirects_file))
+        self.jobs = jobs
+        self.use_cache = use_cache
+        self.rebuild()
+    
+    def rebuild(self):
+        """Index, snapshot and check the whole tree from scratch"""
+        index = load_index(self.docs_dir, use_cache=self.use_cache)
+        self.files = index['files']
+        self.snapshot = snapshot_tree([self.docs_root, self.public_dir])
+        self.anchors = {os.path.join(self.docs_root, rel_path): (None if entry.get('anchors') is None
+                                                                 else set(entry['anchors']))
+                        for rel_path, entry in self.files.items()}
+        self.load_redirects()
+        self.results = {}     # rel_path -> broken links
+        self.deps = {}        # rel_path -> paths its results depend on
+        self.dependents = {}  # path -> rel_paths depending on it
+        self.untracked = set()  # Files with links resolving outside docs/ and public/
+        self.check(self.files, self.jobs)
+    
+    def load_redirects(self):
+        """(Re)load redirects.json"""
+        self.redirects = load_redirects(self.redirects_file) if self.redirects_file else []
+        self.redirect_matcher = RedirectMatcher(self.redirects)
+    
+    def check(self, rel_paths, jobs=1):
+        """Re-check files, replacing their results and dependency edges"""
+        rel_paths = [rel_path for rel_path in rel_paths if rel_path in self.files]
+        if jobs > 1 and len(rel_paths) > 1:
+            tasks = [(os.path.join(self.docs_root, rel_path), self.files[rel_path]['links'], True, False)
+                     for rel_path in rel_paths]
+            checked = map_jobs(check_file_task, tasks, jobs, initializer=init_worker,
+                               initargs=(self.mounts, self.public_dir, self.snapshot, self.anchors,
+                                         self.redirects))
+        else:
+            memo = {}  # Shared by this batch only, so nothing stale survives a change
+            checked = []
+            for rel_path in rel_paths:
+                deps = set()
+                file_broken, _ = check_links(self.mounts, self.public_dir,
+                                             os.path.join(self.docs_root, rel_path),
+                                             self.files[rel_path]['links'], self.snapshot, self.anchors,
+                                             deps, memo, self.redirect_matcher)
+                checked.append((file_broken, None, deps, None))
+        
+        for rel_path, (file_broken, _, deps, _) in zip(rel_paths, checked):
+            self.forget(rel_path)
+            self.results[rel_path] = file_broken
+            self.deps[rel_path] = deps
+            for dep in deps:
+                self.dependents.setdefault(dep, set()).add(rel_path)
+            if any(not in_snapshot(self.snapshot, dep) for dep in deps):
+                self.untracked.add(rel_path)
+    
+    def forget(self, rel_path):
+        """Drop a file's results and dependency edges"""
+        self.results.pop(rel_path, None)
+        self.untracked.discard(rel_path)
+        for dep in self.deps.pop(rel_path, ()):
+            linkers = self.dependents.get(dep)
+            if linkers is not None:
+                linkers.discard(rel_path)
+                if not linkers:
+                    del self.dependents[dep]
+    
+    def update_snapshot(self, path):
+        """Bring one path's snapshot entries up to date, returning the paths that appeared or disappeared"""
+        files, dirs = self.snapshot['files'], self.snapshot['dirs']
+        is_dir = os.path.isdir(path)
+        if path in dirs:
+            if is_dir:
+                return set()  # Still a directory - changes inside it arrive as their own events
+            prefix = path + os.sep
+            before = {p for p in files | dirs if p == path or p.startswith(prefix)}
+        else:
+            before = {path} if path in files else set()
+        files.difference_update(before)
+        dirs.difference_update(before)
+        
+        if is_dir:
+            after = snapshot_tree([path])
+            files.update(after['files'])
+            dirs.update(after['dirs'])
+            now = after['files'] | after['dirs']
+        elif os.path.lexists(path):
+            files.add(path)
+            now = {path}
+        else:
+            now = set()
+        return before ^ now
+    
+    def apply(self, changed):
+        """Apply a batch of changed paths, returning the files that need re-checking"""
+        if self.redirects_file in changed:
+            # Any redirect rule can change how any absolute link resolves
+            self.load_redirects()
+            recheck = set(self.files)
+        else:
+            recheck = set(self.untracked)
+        
+        touched = set()  # Paths whose existence or (for pages) headings changed
+        for path in sorted(changed):
+            if not in_snapshot(self.snapshot, path):
+                continue
+            touched |= self.update_snapshot(path)
+        
+        # Pages: re-parse changed ones, add new ones, drop deleted ones
+        pages = {path for path in changed | touched
+                 if path.endswith('.mdx') and path.startswith(self.docs_root + os.sep)
+                 and not os.path.basename(path).startswith('.')}
+        for path in sorted(pages):
+            rel_path = relative_to(path, self.docs_root)
+            previous = self.files.get(rel_path)
+            if path in self.snapshot['files']:
+                try:
+                    entry, _ = parse_file(self.docs_dir, rel_path, previous)
+                except (OSError, UnicodeDecodeError):
+                    continue  # Mid-save or unreadable - the next event brings it back
+                self.files[rel_path] = entry
+                self.anchors[path] = None if entry.get('anchors') is None else set(entry['anchors'])
+                if previous is None or previous.get('hash') != entry['hash']:
+                    recheck.add(rel_path)
+                if previous is None or previous.get('anchors') != entry.get('anchors'):
+                    touched.add(path)
+            elif previous is not None:
+                del self.files[rel_path]
+                self.anchors.pop(path, None)
+                self.forget(rel_path)
+                touched.add(path)
+        
+        # Inbound linkers of every page or asset that appeared, disappeared or changed headings
+        for path in touched:
+            recheck |= self.dependents.get(path, set())
+        return sorted(rel_path for rel_path in recheck if rel_path in self.files)
+    
+    def broken(self):
+        """{src: broken links} for every file, in path order"""
+        return {os.path.relpath(os.path.join(self.docs_dir, rel_path), '.'): self.results[rel_path]
+                for rel_path in sorted(self.results) if self.results[rel_path]}
+
+def report_changes(before, after):
+    """Print links that broke or were fixed between two broken-link maps"""
+    for src in sorted(before.keys() | after.keys()):
+        old = Counter(before.get(src, ()))
+        new = Counter(after.get(src, ()))
+        for link in (new - old).elements():
+            print(f"   ❌ {src}: {link}")
+        for link in (old - new).elements():
+            print(f"   ✅ {src}: {link} (fixed)")
+
+def print_broken_summary(broken):
+    """One-line status for watch mode"""
+    if broken:
+        total_broken = sum(len(links) for links in broken.values())
+        print(f"❌ {total_broken} broken links in {len(broken)} files")
+    else:
+        print("✅ No broken links found!")
+
+def watch(docs_dir, args):
+    """--watch: check once, then re-check affected files on every change until interrupted"""
+    started = time.perf_counter()
+    graph = LinkGraph(docs_dir, find_redirects_file(), args.jobs, use_cache=not args.no_cache)
+    broken = graph.broken()
+    for src, links in broken.items():
+        print(f"📄 {src}")
+        for link in links:
+            print(f"   ❌ {link}")
+        print()
+    print(f"Checked {sum(len(entry['links']) for entry in graph.files.values())} links across "
+          f"{len(graph.files)} files in {(time.perf_counter() - started) * 1000:.0f} ms")
+    print_broken_summary(broken)
+    
+    watched_files = [graph.redirects_file] if graph.redirects_file else []
+    watcher = open_watcher([graph.docs_root, graph.public_dir], watched_files, polling=args.poll)
+    print(f"\n👀 Watching docs/, public/ and redirects.json ({watcher.kind}) - Ctrl+C to stop\n")
+    try:
+        while True:
+            changed = watcher.wait()
+            if changed == set():
                 continue
-                
-            # Resolve link path relative to file location
-            if norm.startswith('/'):
-                # Absolute path: could be docs root or NextJS public assets
-                target = os.path.join(docs_dir, norm.lstrip('/'))
-                
-                # If not found in docs, try NextJS public directory
-                if not check_file_exists(target):
-                    public_dir = os.path.join(os.path.dirname(docs_dir), 'public')
-                    public_target = os.path.join(public_dir, norm.lstrip('/'))
-                    if check_file_exists(public_target):
-                        target = public_target
+            started = time.perf_counter()
+            if changed is None:
+                # Kernel event queue overflowed - too much changed to know what, so start over
+                graph.rebuild()
+                rechecked = len(graph.files)
             else:
-                # Relative path: relative to current file's directory
-                target = os.path.join(rel_dir, norm)
-                
-            # Check if target file exists
-            if not check_file_exists(target):
-                src_rel = os.path.relpath(mdx, '.')
-                if link == ".+?":  # Skip regex false positives
-                    continue
-                # Record broken link
-                broken.setdefault(src_rel, []).append(link)
+                pending = graph.apply(changed)
+                graph.check(pending)
+                rechecked = len(pending)
+            new_broken = graph.broken()
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"[{time.strftime('%H:%M:%S')}] 🔁 Re-checked {rechecked} files in {elapsed:.0f} ms")
+            report_changes(broken, new_broken)
+            print_broken_summary(new_broken)
+            broken = new_broken
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+def print_report(broken, redirected, external_broken, external, total_links, total_files):
+    """Print the redirected/broken link report, returning True if any link is broken"""
+    if redirected:
+        print("↪️  Links resolving through redirects:\n")
+        for src, links in redirected.items():
+            print(f"📄 {src}")
+            for link, destination, hops in links:
+                print(f"   ↪️  {link} → {destination} ({hops} {'hop' if hops == 1 else 'hops'})")
+            print()
+        
+        total_redirected = sum(len(links) for links in redirected.values())
+        total_hops = sum(hops for links in redirected.values() for _, _, hops in links)
+        print(f"Redirected: {total_redirected} links cost {total_hops} redirect hops "
+              f"(run fix-links.py --redirects to rewrite them)\n")
     
-    # Display results
     if broken:
         print("❌ Found broken links:\n")
         for src, links in broken.items():
@@ -181,10 +537,363 @@ def main():
         total_broken = sum(len(links) for links in broken.values())
         print(f"Summary: {total_broken} broken links in {len(broken)} files")
         print(f"Checked {total_links} links across {total_files} files")
-        sys.exit(1)  # Exit with error code for CI/CD
     else:
         print("✅ No broken links found!")
         print(f"Checked {total_links} links across {total_files} files")
+    
+    if external_broken:
+        print("\n❌ Found broken external links:\n")
+        for src, links in external_broken.items():
+            print(f"📄 {src}")
+            for link, description in links:
+                print(f"   ❌ {link} ({description})")
+            print()
+        
+        total_broken = sum(len(links) for links in external_broken.values())
+        print(f"Summary: {total_broken} broken external links in {len(external_broken)} files")
+    elif external:
+        print("✅ No broken external links found!")
+    
+    return bool(broken or external_broken)
+
+def parse_shard(value):
+    """argparse type for --shard: 'i/n' with 1 <= i <= n, returned as (i, n)"""
+    index, _, count = value.partition('/')
+    index, count = int(index), int(count)
+    if not 1 <= index <= count:
+        raise ValueError(value)
+    return index, count
+
+def in_shard(rel_path, shard):
+    """Stable partition of source files: the same file lands in the same shard on every machine and run"""
+    index, count = shard
+    digest = hashlib.sha1(rel_path.replace(os.sep, '/').encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count == index - 1
+
+def tree_fingerprint(rel_paths):
+    """Hash of the full source file list, so merge can tell whether shards checked the same tree"""
+    return hashlib.sha1('\n'.join(sorted(rel_paths)).encode('utf-8')).hexdigest()
+
+def write_shard(path, shard, tree, external, total_files, total_links, broken, redirected, external_broken):
+    """Write one shard's partial results for merge"""
+    write_json_atomic(path, {
+        'version': SHARD_VERSION,
+        'shard': list(shard),
+        'tree': tree,
+        'external': external,
+        'files': total_files,
+        'links': total_links,
+        'broken': broken,
+        'redirected': redirected,
+        'external_broken': external_broken,
+    })
+
+def merge_shards(paths):
+    """merge subcommand: combine every shard's partial results into one report and exit code"""
+    partials = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                partial = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error reading shard results {path}: {e}")
+            sys.exit(1)
+        if partial.get('version') != SHARD_VERSION:
+            print(f"❌ {path} was written by a different version of check-links.py")
+            sys.exit(1)
+        partials.append(partial)
+    
+    # Every shard of one partition of one tree, each exactly once - otherwise files went unchecked
+    count = partials[0]['shard'][1]
+    seen = sorted(partial['shard'][0] for partial in partials)
+    if (any(partial['shard'][1] != count for partial in partials)
+            or len({partial['tree'] for partial in partials}) != 1
+            or len({partial['external'] for partial in partials}) != 1):
+        print("❌ Shard results come from different partitions, trees or options")
+        sys.exit(1)
+    if seen != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - set(seen))
+        duplicated = sorted({i for i in seen if seen.count(i) > 1})
+        print(f"❌ Incomplete shard results for {count} shards "
+              f"(missing: {missing or 'none'}, duplicated: {duplicated or 'none'})")
+        sys.exit(1)
+    
+    print(f"🔍 Merging link check results from {count} shards...\n")
+    broken, redirected, external_broken = {}, {}, {}
+    for partial in partials:
+        broken.update(partial['broken'])
+        redirected.update({src: [tuple(item) for item in links]
+                           for src, links in partial['redirected'].items()})
+        external_broken.update({src: [tuple(item) for item in links]
+                                for src, links in partial['external_broken'].items()})
+    # Same (sorted path) order as a single full run
+    if print_report({src: broken[src] for src in sorted(broken)},
+                    {src: redirected[src] for src in sorted(redirected)},
+                    {src: external_broken[src] for src in sorted(external_broken)},
+                    partials[0]['external'],
+                    sum(partial['links'] for partial in partials),
+                    sum(partial['files'] for partial in partials)):
+        sys.exit(1)
+
+def main():
+    """Main function - scan all MDX files and report broken internal links"""
+    parser = argparse.ArgumentParser(description='Check for broken links in documentation')
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Ignore and don't update the shared docs index cache")
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only re-check changed files and files linking to added/removed targets')
+    parser.add_argument('--state', metavar='PATH',
+                       help='State file for --incremental (default: .cache/link-tools/check-links-state.json)')
+    parser.add_argument('--jobs', type=parse_jobs, default=1, metavar='N',
+                       help='Check files in N worker processes (0 = one per CPU, default 1)')
+    parser.add_argument('--external', action='store_true',
+                       help='Also check http(s) links over the network')
+    parser.add_argument('--external-ttl', type=int, default=DEFAULT_TTL, metavar='SECONDS',
+                       help='Reuse cached external results younger than this (default 86400, 0 = never)')
+    parser.add_argument('--external-concurrency', type=int, default=DEFAULT_CONCURRENCY, metavar='N',
+                       help='External requests in flight at once (default 32)')
+    parser.add_argument('--external-rate', type=float, default=DEFAULT_HOST_RATE, metavar='N',
+                       help='External requests per second per host (default 20, 0 = unlimited)')
+    add_metrics_arguments(parser)
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running: re-check changed files and their inbound linkers on every save')
+    parser.add_argument('--poll', action='store_true',
+                       help='With --watch, poll for changes instead of using inotify')
+    parser.add_argument('--shard', type=parse_shard, metavar='I/N',
+                       help='Only check shard I of N (files split by a stable hash) and write partial results')
+    parser.add_argument('--shard-output', metavar='PATH',
+                       help='Partial results file for --shard (default: .cache/link-tools/check-links-shard-I-of-N.json)')
+    subcommands = parser.add_subparsers(dest='command')
+    merge_parser = subcommands.add_parser('merge', help='Combine --shard results into one report and exit code')
+    merge_parser.add_argument('partials', nargs='+', metavar='PARTIAL',
+                              help='Result files written by every --shard run')
+    args = parser.parse_args()
+    if args.watch and (args.incremental or args.external or args.shard):
+        parser.error('--watch cannot be combined with --incremental, --external or --shard')
+    if args.command == 'merge':
+        merge_shards(args.partials)
+        return
+    metrics = start_metrics(args, 'check-links')
+
+    try:
+        layout = load_roots()
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    
+    if not layout:
+        print("❌ Error: docs directory not found")
+        print("Make sure you're running this from the project root or scripts folder")
+        sys.exit(1)
+    project_root, roots = layout
+    if args.watch and (len(roots) > 1 or roots[0]['prefix'] != '/'):
+        parser.error('--watch supports a single docs root served at / (no docs-roots.json)')
+    
+    print("🔍 Checking for broken links in documentation...\n")
+    print(describe_roots(project_root, roots))
+    print("Checking markdown links [text](url), images and href=\"url\"/src=\"url\" attributes outside code")
+    print("Filtering out template variables (${var}, {var}, [var], <var>, :var, @var, %var%)\n")
+    
+    if args.watch:
+        watch(roots[0]['dir'], args)
+        return
+    
+    # Parse all MDX files once - every root from its own on-disk index, roots loaded in parallel
+    with metrics.phase('index'):
+        indexes = load_root_indexes(roots, use_cache=not args.no_cache, jobs=args.jobs)
+    all_files = {}  # Project-relative source path (docs/guide.mdx) -> index entry, across roots
+    for root, index in zip(roots, indexes):
+        metrics.cache('docs_index', len(index['files']) - index['parsed'], index['parsed'])
+        metrics.count('files_rehashed', index['rehashed'])
+        for rel_path, entry in index['files'].items():
+            all_files[relative_to(os.path.join(root['dir'], rel_path), project_root)] = entry
+    all_files = dict(sorted(all_files.items()))
+    cache_dir = os.path.join(project_root, '.cache', 'link-tools')
+    
+    # Sharded runs check (and report) only their own slice of the source files
+    files = all_files
+    if args.shard:
+        tree = tree_fingerprint(files)
+        files = {rel_path: entry for rel_path, entry in files.items() if in_shard(rel_path, args.shard)}
+        shard_name = f"{args.shard[0]}-of-{args.shard[1]}"
+        shard_path = args.shard_output or os.path.join(cache_dir, f'check-links-shard-{shard_name}.json')
+        print(f"Shard {args.shard[0]}/{args.shard[1]}: checking {len(files)} of {len(all_files)} files\n")
+    broken = {}  # Dictionary to store broken links by file
+    redirected = {}  # Links that only reach their page through redirects.json, by file
+    total_files = 0
+    total_links = 0
+    
+    # One scandir walk of the docs roots and public/ replaces per-link stat calls
+    public_dir = os.path.join(project_root, 'public')
+    mounts = mount_table(roots)  # Absolute links resolve in the root with the longest matching prefix
+    with metrics.phase('snapshot'):
+        snapshot = snapshot_tree(outer_dirs(roots) + [public_dir])
+    metrics.count('snapshot_entries', len(snapshot['files']) + len(snapshot['dirs']))
+    
+    # Generated endpoint pages and their anchors, straight from the OpenAPI spec (cached by content hash)
+    spec_anchors = {}  # rel_path -> anchors of each page generated from the spec
+    with metrics.phase('openapi'):
+        try:
+            spec_index = load_spec_index(project_root, use_cache=not args.no_cache)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load the OpenAPI spec: {e}")
+            spec_index = None
+        if spec_index:
+            spec_anchors = apply_spec_index(spec_index, project_root, all_files, snapshot)
+            metrics.cache('openapi_index', not spec_index['parsed'], spec_index['parsed'])
+    
+    # Heading slugs / ids per page (from the docs indexes and the spec) for #anchor validation
+    with metrics.phase('anchors'):
+        page_anchors = {rel_path: entry.get('anchors') for rel_path, entry in all_files.items()}
+        page_anchors.update(spec_anchors)
+        anchors = {os.path.join(project_root, rel_path): None if page_anchors[rel_path] is None
+                   else set(page_anchors[rel_path]) for rel_path in page_anchors}
+    
+    # Redirect rules, followed for absolute links like Next.js does
+    with metrics.phase('redirects'):
+        redirects_file = find_redirects_file()
+        redirects = load_redirects(redirects_file) if redirects_file else []
+        redirects_hash = content_hash(json.dumps(redirects, sort_keys=True).encode('utf-8'))
+    
+    # Incremental mode: diff the docs/public file listing against the previous run
+    state_name = f'check-links-state-{shard_name}.json' if args.shard else 'check-links-state.json'
+    state_path = args.state or os.path.join(cache_dir, state_name)
+    state = read_state(state_path) if args.incremental else None
+    if state and state.get('redirects') != redirects_hash:
+        state = None  # Any redirect rule change can affect any absolute link
+    # So can remounting a root or changing what it excludes
+    roots_hash = content_hash(json.dumps([(root['prefix'], relative_to(root['dir'], project_root),
+                                           sorted(relative_to(ex, project_root) for ex in root['exclude']))
+                                          for root in roots]).encode('utf-8'))
+    if state and state.get('roots') != roots_hash:
+        state = None
+    previous = state['files'] if state else {}
+    if args.incremental:
+        paths = {relative_to(p, project_root) for p in snapshot['files'] | snapshot['dirs']}
+        changed_paths = paths.symmetric_difference(state['paths']) if state else paths
+        
+        # Pages whose headings changed invalidate deep links into them
+        for rel_path, entry in all_files.items():
+            prev = previous.get(rel_path)
+            if prev and prev['anchors'] != anchors_key(page_anchors[rel_path]):
+                changed_paths.add(rel_path)
+        
+        # So do spec edits, but only for the generated pages whose anchors they change
+        spec_keys = {rel_path: anchors_key(spec_anchors[rel_path]) for rel_path in spec_anchors}
+        if state:
+            previous_spec_keys = state['openapi']
+            changed_paths.update(rel_path for rel_path in spec_keys.keys() | previous_spec_keys.keys()
+                                 if spec_keys.get(rel_path) != previous_spec_keys.get(rel_path))
+    new_state_files = {}
+    results = {}  # rel_path -> broken links, filled from state or by checking
+    pending = []  # Files that need (re-)checking this run
+    
+    # Decide which files can reuse their previous result
+    for rel_path, entry in files.items():
+        total_files += 1
+        total_links += len(entry['links'])
+        
+        prev = previous.get(rel_path)
+        if (prev and entry.get('hash') and prev['hash'] == entry['hash']
+                and not prev['untracked'] and changed_paths.isdisjoint(prev['deps'])):
+            # Unchanged file whose link targets were neither added nor removed
+            results[rel_path] = (prev['broken'], [tuple(item) for item in prev['redirected']])
+            # (a generated page's anchors can change with the spec while its own content doesn't)
+            new_state_files[rel_path] = dict(prev, anchors=anchors_key(page_anchors[rel_path]))
+        else:
+            pending.append(rel_path)
+    
+    if args.incremental:
+        metrics.cache('incremental', len(files) - len(pending), len(pending))
+    
+    # Check the remaining files, optionally in parallel (results come back in order)
+    # (one pool for every root, so roots are checked in parallel with each other too)
+    tasks = [(os.path.join(project_root, rel_path), all_files[rel_path]['links'],
+              args.incremental, args.metrics is not None) for rel_path in pending]
+    with metrics.phase('check'):
+        checked = map_jobs(check_file_task, tasks, args.jobs, initializer=init_worker,
+                           initargs=(mounts, public_dir, snapshot, anchors, redirects))
+    for rel_path, (file_broken, file_redirected, deps, stats) in zip(pending, checked):
+        results[rel_path] = (file_broken, file_redirected)
+        if stats is not None:
+            metrics.file_cost(rel_path, stats.pop('seconds'), links=len(all_files[rel_path]['links']),
+                              probes=stats['probes'])
+            metrics.cache('link_memo', stats.pop('memo_hits'), stats.pop('memo_misses'))
+            metrics.count_all(stats)
+        if args.incremental:
+            rel_deps = {relative_to(d, project_root) for d in deps}
+            new_state_files[rel_path] = {
+                'hash': all_files[rel_path].get('hash'),
+                'anchors': anchors_key(page_anchors[rel_path]),
+                'broken': file_broken,
+                'redirected': file_redirected,
+                'deps': sorted(rel_deps),
+                # Links resolving outside the docs roots and public/ can't be tracked - always re-check
+                'untracked': any(d.startswith('..') for d in rel_deps),
+            }
+    
+    # Merge in index (sorted path) order so output never depends on scheduling
+    for rel_path in files:
+        file_broken, file_redirected = results[rel_path]
+        src = os.path.relpath(os.path.join(project_root, rel_path), '.')
+        if file_broken:
+            broken[src] = file_broken
+        if file_redirected:
+            redirected[src] = file_redirected
+    
+    if args.incremental:
+        with metrics.phase('state'):
+            write_json_atomic(state_path, {
+                'version': STATE_VERSION,
+                'redirects': redirects_hash,
+                'roots': roots_hash,
+                'paths': sorted(paths),
+                'openapi': spec_keys,
+                'files': new_state_files,
+            })
+        print(f"Incremental: re-checked {len(pending)} of {total_files} files\n")
+    
+    # External links: every distinct URL checked once, concurrently, through the TTL cache
+    external_broken = {}  # Dead http(s) links by file: [(link, description)]
+    if args.external:
+        external_links = {}  # src -> external links in order of appearance
+        for rel_path, entry in files.items():
+            links = [link for link in entry['links'] if is_external(link)]
+            if links:
+                external_links[os.path.relpath(os.path.join(project_root, rel_path), '.')] = links
+        
+        checker = ExternalLinkChecker(os.path.join(cache_dir, 'external-links.json'),
+                                      ttl=args.external_ttl, concurrency=args.external_concurrency,
+                                      host_rate=args.external_rate)
+        started = time.time()
+        with metrics.phase('external'):
+            external_results = checker.check(link.split('#', 1)[0]
+                                             for links in external_links.values() for link in links)
+        metrics.cache('external', checker.cached, checker.fetched)
+        for src, links in external_links.items():
+            dead = [(link, describe(external_results[link.split('#', 1)[0]])) for link in links
+                    if is_broken(external_results[link.split('#', 1)[0]])]
+            if dead:
+                external_broken[src] = dead
+        print(f"External: checked {checker.fetched} URLs ({checker.cached} cached) "
+              f"in {time.time() - started:.1f}s\n")
+    
+    metrics.count('files', total_files)
+    metrics.count('links', total_links)
+    metrics.count('broken_links', sum(len(links) for links in broken.values()))
+    metrics.count('redirected_links', sum(len(links) for links in redirected.values()))
+    
+    if args.shard:
+        write_shard(shard_path, args.shard, tree, args.external, total_files, total_links,
+                    broken, redirected, external_broken)
+    
+    # Display results
+    failed = print_report(broken, redirected, external_broken, args.external, total_links, total_files)
+    if args.shard:
+        print(f"\n📦 Shard {args.shard[0]}/{args.shard[1]} results written to {shard_path} "
+              f"(combine with: check-links.py merge)")
+    elif failed:
+        sys.exit(1)  # Exit with error code for CI/CD
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
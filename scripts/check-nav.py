@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+check-nav.py
+
+Navigation reachability check: which pages can a reader actually get to?
+
+Combines the sidebar defined by docs/meta.json and the per-folder meta.json
+files (with fumadocs semantics: "..." rest items, "!name" exclusions, "...folder"
+extraction, "---Separator---" items and "[Text](url)" links; folders without a
+pages list show everything in them) with the internal links extracted into the
+cached docs index (links to redirected URLs follow the redirect). One 0-1
+breadth-first traversal from the sidebar root then gives every page's click
+depth: sidebar entries are one click away, opening a folder is a click (its
+index page opens with it), following a link is a click.
+
+Reports:
+    - pages unreachable from the sidebar root (built, indexed and embedded, but
+      nothing leads to them)
+    - meta.json entries that point at missing pages or folders
+    - the click depth of every page (--depths; a summary by depth otherwise)
+
+Usage:
+    python check-nav.py [--depths] [--no-cache]
+                        [--metrics json] [--metrics-file PATH] [--profile PATH]
+
+Options:
+    --depths             List every page's click depth
+    --no-cache           Ignore and don't update the shared docs index cache
+    --metrics json       Emit per-phase timings and counters (stderr)
+    --metrics-file PATH  Write --metrics output to PATH instead
+    --profile PATH       Write a cProfile of the run to PATH
+
+Exits 1 if any page is unreachable or any meta.json entry is missing.
+"""
+
+import sys
+import os
+import re
+import json
+import glob
+import posixpath
+import argparse
+from collections import Counter, defaultdict, deque
+
+from docs_index import find_docs_dir, find_redirects_file, load_index
+from backlinks import canonical_url, link_target
+from redirect_matcher import RedirectMatcher, load_redirects
+from run_metrics import add_metrics_arguments, start_metrics
+
+# meta.json link items: [Text](url)
+META_LINK_PATTERN = re.compile(r'^(?:external:)?\[[^\]]*\]\(([^)]*)\)$')
+
+def folder_node(folder):
+    """Graph node of a docs folder ('' is the sidebar root) - kept apart from page URLs"""
+    return 'folder:' + folder
+
+def list_folders(files):
+    """{folder: sorted child names} for every folder holding MDX pages (files as rel paths without .mdx)"""
+    children = defaultdict(set)
+    for page in files:
+        parts = page.split('/')
+        for depth in range(len(parts)):
+            children['/'.join(parts[:depth])].add(parts[depth])
+    return {folder: sorted(names) for folder, names in children.items()}
+
+def read_meta(meta_path):
+    """Parsed meta.json, or None if it can't be read"""
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read {meta_path}: {e}")
+        return None
+    return meta if isinstance(meta, dict) else None
+
+def folder_edges(folder, meta, pages, folders, urls, aliases):
+    """
+    Navigation edges out of one sidebar folder, in a meta.json's pages order.
+
+    Returns (edges, missing): edges are (weight, target node) - 1 for a click,
+    0 for items shown inline by "...folder" - and missing lists the entries that
+    point at nothing.
+    """
+    def item_node(path):
+        """Node for a folder-relative item path: a page, a folder or None"""
+        if path in pages:
+            return pages[path]
+        if path in folders:
+            return folder_node(path)
+        return None
+
+    names = folders.get(folder, [])
+    items = meta.get('pages') if meta else None
+    if not isinstance(items, list):
+        # No pages list: fumadocs shows everything in the folder
+        items = ['...']
+
+    edges = []
+    missing = []
+    listed = set()
+    excluded = set()
+    rest = False
+    for item in items:
+        if not isinstance(item, str) or item.startswith('---'):
+            continue
+        if item in ('...', 'z...a'):
+            rest = True
+            continue
+        if item.startswith('!'):
+            excluded.add(posixpath.normpath(posixpath.join(folder, item[1:])))
+            continue
+        link = META_LINK_PATTERN.match(item)
+        if link:
+            url = link.group(1)
+            if '://' not in url and not url.startswith(('mailto:', '#')):
+                target = canonical_url(url.split('#', 1)[0], aliases)
+                if target in urls:
+                    edges.append((1, target))
+                else:
+                    missing.append(item)
+            continue
+        extract = item.startswith('...')
+        path = posixpath.normpath(posixpath.join(folder, item[3:] if extract else item))
+        listed.add(path)
+        node = item_node(path)
+        if node is None or (extract and path not in folders):
+            missing.append(item)
+        else:
+            edges.append((0 if extract else 1, node))
+
+    if rest:
+        for name in names:
+            path = posixpath.join(folder, name) if folder else name
+            if path not in listed and path not in excluded and name != 'index':
+                edges.append((1, item_node(path)))
+
+    # A folder's title opens its index page
+    index = posixpath.join(folder, 'index') if folder else 'index'
+    if index in pages:
+        edges.append((0, pages[index]))
+    return edges, missing
+
+def build_graph(docs_dir, index, matcher):
+    """
+    Merge meta.json navigation and internal link edges into one graph.
+
+    Returns (graph, pages, missing) where graph is {node: [(weight, node)]},
+    pages maps folder-relative page paths to their URL and missing lists
+    (meta.json path, entry) for entries pointing at nothing.
+    """
+    pages = {rel_path[:-len('.mdx')].replace(os.sep, '/'): entry['url']
+             for rel_path, entry in index['files'].items()}
+    folders = list_folders(pages)
+    aliases = index['aliases']
+    urls = set(pages.values())
+    graph = defaultdict(list)
+    missing = []
+
+    # Navigation: every folder's sidebar items (folders without a meta.json list everything)
+    metas = {}
+    for meta_path in glob.glob(os.path.join(docs_dir, '**/meta.json'), recursive=True):
+        folder = os.path.relpath(os.path.dirname(meta_path), docs_dir).replace(os.sep, '/')
+        metas['' if folder == '.' else folder] = meta_path
+    for folder in sorted(folders.keys() | metas.keys()):
+        meta = read_meta(metas[folder]) if folder in metas else None
+        edges, folder_missing = folder_edges(folder, meta, pages, folders, urls, aliases)
+        graph[folder_node(folder)].extend(edges)
+        missing.extend((metas[folder], entry) for entry in folder_missing)
+        if folder and meta and meta.get('root'):
+            # Root folders are sidebar tabs, switchable from anywhere
+            graph[folder_node('')].append((1, folder_node(folder)))
+
+    # Links: every internal link that lands on a page, directly or through redirects
+    for rel_path, entry in index['files'].items():
+        for link in entry['links']:
+            target = link_target(rel_path, link, aliases)
+            if target is None:
+                continue
+            if target not in urls and matcher:
+                final, _, cycle = matcher.final_destination(target)
+                target = None if cycle else canonical_url(final, aliases)
+            if target in urls and target != entry['url']:
+                graph[entry['url']].append((1, target))
+    return graph, pages, missing
+
+def click_depths(graph, start):
+    """{node: fewest clicks from start} in one 0-1 breadth-first traversal (linear in the graph)"""
+    depths = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        depth = depths[node]
+        for weight, target in graph.get(node, ()):
+            if target in depths and depths[target] <= depth + weight:
+                continue
+            depths[target] = depth + weight
+            if weight:
+                queue.append(target)
+            else:
+                queue.appendleft(target)
+    return depths
+
+def main():
+    """Main function - report unreachable pages, missing meta.json entries and click depths"""
+    parser = argparse.ArgumentParser(description='Check which documentation pages the sidebar and links reach')
+    parser.add_argument('--depths', action='store_true',
+                       help="List every page's click depth")
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Ignore and don't update the shared docs index cache")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+    metrics = start_metrics(args, 'check-nav')
+
+    docs_dir = find_docs_dir()
+    if not docs_dir:
+        print("❌ Error: docs directory not found")
+        print("Make sure you're running this from the project root or scripts folder")
+        sys.exit(1)
+
+    print("🧭 Checking navigation reachability in documentation...\n")
+    print(f"Using docs directory: {docs_dir}")
+
+    with metrics.phase('index'):
+        index = load_index(docs_dir, use_cache=not args.no_cache)
+    metrics.cache('docs_index', len(index['files']) - index['parsed'], index['parsed'])
+    redirects_file = find_redirects_file()
+    matcher = None
+    if redirects_file:
+        try:
+            matcher = RedirectMatcher(load_redirects(redirects_file))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load redirects from {redirects_file}: {e}")
+
+    with metrics.phase('graph'):
+        graph, pages, missing = build_graph(docs_dir, index, matcher)
+    with metrics.phase('traverse'):
+        depths = click_depths(graph, folder_node(''))
+    metrics.count('nodes', len(graph.keys() | depths.keys()))
+    metrics.count('edges', sum(len(edges) for edges in graph.values()))
+
+    page_depths = {url: depths[url] for url in pages.values() if url in depths}
+    unreachable = sorted(rel_path for rel_path, url in pages.items() if url not in depths)
+    # How many links point at each unreachable page (all from other unreachable pages)
+    inbound = Counter(target for node, edges in graph.items() if not node.startswith('folder:')
+                      for _, target in edges)
+    print(f"Found {len(pages)} pages, {len(page_depths)} reachable from the sidebar\n")
+
+    # Display results
+    if missing:
+        print("❌ meta.json entries pointing at missing pages:\n")
+        for meta_path, entry in missing:
+            print(f"   🚫 {os.path.relpath(meta_path, '.')}: {json.dumps(entry)}")
+        print()
+
+    if unreachable:
+        print("❌ Pages unreachable from the sidebar root:\n")
+        for rel_path in unreachable:
+            links = inbound[pages[rel_path]]
+            note = "only linked from unreachable pages" if links else "no inbound links"
+            print(f"   📄 {os.path.relpath(os.path.join(docs_dir, rel_path + '.mdx'), '.')} ({note})")
+        print()
+
+    if args.depths:
+        print("📊 Click depth from the sidebar root:\n")
+        for url, depth in sorted(page_depths.items(), key=lambda item: (item[1], item[0])):
+            print(f"   {depth}  {url}")
+        print()
+    histogram = Counter(page_depths.values())
+    summary = ', '.join(f"{depth}: {histogram[depth]}" for depth in sorted(histogram))
+    print(f"📊 Pages by click depth: {summary or 'none'}")
+    if page_depths:
+        deepest = max(page_depths.values())
+        urls = sorted(url for url, depth in page_depths.items() if depth == deepest)
+        more = f" and {len(urls) - 5} more" if len(urls) > 5 else ""
+        print(f"Deepest pages ({deepest} clicks): {', '.join(urls[:5])}{more}")
+
+    metrics.count('pages', len(pages))
+    metrics.count('unreachable_pages', len(unreachable))
+    metrics.count('missing_meta_entries', len(missing))
+    if missing or unreachable:
+        print(f"❌ {len(unreachable)} unreachable pages, {len(missing)} missing meta.json entries")
+        sys.exit(1)
+    print("✅ Every page is reachable and every meta.json entry exists!")
+
+if __name__ == '__main__':
+    main()
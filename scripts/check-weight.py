@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+check-weight.py
+
+Content weight check for MDX pages: long tables, large inline code samples and
+dozens of embedded components all inflate a route's rendered HTML and client
+bundle. The metrics come from the shared docs index, which measures each page in
+the same read that extracts its links (so unchanged pages cost nothing):
+
+    - bytes of MDX source
+    - bytes inside fenced code blocks
+    - JSX components used (<Callout>, <Tabs.Tab>, ...)
+    - markdown table rows
+    - images and other assets loaded with the page
+    - links
+
+Pages over any budget are reported, and every page is compared against a
+baseline recorded in .cache/link-tools/page-weight.json: the per-page deltas are
+listed, and a page that grew by more than --max-growth percent fails, so a change
+that doubles a page's weight is caught in review. The baseline is recorded on the
+first run and only replaced with --update-baseline.
+
+Usage:
+    python check-weight.py [--max-size KB] [--max-code KB] [--max-components N]
+                           [--max-images N] [--max-links N] [--max-growth PCT]
+                           [--baseline PATH] [--update-baseline] [--no-cache] [--jobs N]
+                           [--metrics json] [--metrics-file PATH] [--profile PATH]
+
+Options:
+    --max-size KB        Largest acceptable page source (default 64)
+    --max-code KB        Most fenced code per page (default 32)
+    --max-components N   Most JSX components per page (default 100)
+    --max-images N       Most images and assets per page (default 25)
+    --max-links N        Most links per page (default 150)
+    --max-growth PCT     Largest acceptable growth of a page since the baseline (default 50)
+    --baseline PATH      Baseline file (default .cache/link-tools/page-weight.json)
+    --update-baseline    Record this run's metrics as the new baseline
+    --no-cache           Ignore and don't update the shared docs index cache
+    --jobs N             Index docs roots in N worker processes (0 = one per CPU, default 1)
+    --metrics json       Emit per-phase timings and counters (stderr)
+    --metrics-file PATH  Write --metrics output to PATH instead
+    --profile PATH       Write a cProfile of the run to PATH
+
+Exits 1 if any page is over budget or grew more than --max-growth since the baseline.
+"""
+
+import sys
+import os
+import json
+import argparse
+
+from docs_index import write_json_atomic, parse_jobs
+from docs_roots import load_roots, load_root_indexes, describe_roots
+from run_metrics import add_metrics_arguments, start_metrics
+
+# Bump whenever the baseline layout or the metrics change meaning
+BASELINE_VERSION = 1
+
+DEFAULT_MAX_SIZE = 64         # KB
+DEFAULT_MAX_CODE = 32         # KB
+DEFAULT_MAX_COMPONENTS = 100
+DEFAULT_MAX_IMAGES = 25
+DEFAULT_MAX_LINKS = 150
+DEFAULT_MAX_GROWTH = 50       # Percent
+GROWTH_MIN_BYTES = 2 * 1024   # Smaller growth never fails, however large in percent (stubs being filled in)
+
+def format_size(size):
+    """Human-readable byte count (B/KB/MB)"""
+    if size < 1024:
+        return f"{size} B"
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.1f} KB"
+
+def component_count(weight):
+    """Total JSX components on a page"""
+    return sum(weight['components'].values())
+
+def describe_weight(weight):
+    """One-line summary of a page's metrics"""
+    return (f"{format_size(weight['bytes'])}, {format_size(weight['code_bytes'])} code, "
+            f"{component_count(weight)} components, {weight['table_rows']} table rows, "
+            f"{weight['images']} images, {weight['links']} links")
+
+def budget_problems(weight, budgets):
+    """Descriptions of every budget a page's metrics exceed"""
+    problems = []
+    if weight['bytes'] > budgets['size']:
+        problems.append(f"{format_size(weight['bytes'])} over the {format_size(budgets['size'])} page budget")
+    if weight['code_bytes'] > budgets['code']:
+        problems.append(f"{format_size(weight['code_bytes'])} of code over the {format_size(budgets['code'])} budget")
+    components = component_count(weight)
+    if components > budgets['components']:
+        heaviest = sorted(weight['components'].items(), key=lambda item: (-item[1], item[0]))[:3]
+        top = ', '.join(f"{name} ×{count}" for name, count in heaviest)
+        problems.append(f"{components} components over the budget of {budgets['components']} ({top})")
+    if weight['images'] > budgets['images']:
+        problems.append(f"{weight['images']} images over the budget of {budgets['images']}")
+    if weight['links'] > budgets['links']:
+        problems.append(f"{weight['links']} links over the budget of {budgets['links']}")
+    return problems
+
+def weight_delta(old, new):
+    """Human-readable change between two metric sets, or None if nothing changed"""
+    changes = []
+    for key, label in (('bytes', ''), ('code_bytes', ' code')):
+        diff = new[key] - old[key]
+        if diff:
+            percent = f" ({diff / old[key]:+.0%})" if old[key] and abs(diff) * 100 >= old[key] else ""
+            changes.append(f"{'+' if diff > 0 else '-'}{format_size(abs(diff))}{label}{percent}")
+    for key, label, old_count, new_count in (
+            ('components', 'components', component_count(old), component_count(new)),
+            ('table_rows', 'table rows', old['table_rows'], new['table_rows']),
+            ('images', 'images', old['images'], new['images']),
+            ('links', 'links', old['links'], new['links'])):
+        if new_count != old_count:
+            changes.append(f"{new_count - old_count:+d} {label}")
+    return ', '.join(changes) or None
+
+def grew_too_much(old, new, max_growth):
+    """Whether a page's source grew by more than max_growth percent (and at least GROWTH_MIN_BYTES)"""
+    growth = new['bytes'] - old['bytes']
+    return growth >= GROWTH_MIN_BYTES and growth * 100 > old['bytes'] * max_growth
+
+def read_baseline(baseline_path):
+    """Baseline {source path: metrics}, or None if missing, stale or unreadable"""
+    try:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data.get('pages') if data.get('version') == BASELINE_VERSION else None
+
+def main():
+    """Main function - check every page's content weight against budgets and the baseline"""
+    parser = argparse.ArgumentParser(description='Check the content weight of documentation pages')
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_SIZE, metavar='KB',
+                       help=f'Largest acceptable page source (default {DEFAULT_MAX_SIZE})')
+    parser.add_argument('--max-code', type=int, default=DEFAULT_MAX_CODE, metavar='KB',
+                       help=f'Most fenced code per page (default {DEFAULT_MAX_CODE})')
+    parser.add_argument('--max-components', type=int, default=DEFAULT_MAX_COMPONENTS, metavar='N',
+                       help=f'Most JSX components per page (default {DEFAULT_MAX_COMPONENTS})')
+    parser.add_argument('--max-images', type=int, default=DEFAULT_MAX_IMAGES, metavar='N',
+                       help=f'Most images and assets per page (default {DEFAULT_MAX_IMAGES})')
+    parser.add_argument('--max-links', type=int, default=DEFAULT_MAX_LINKS, metavar='N',
+                       help=f'Most links per page (default {DEFAULT_MAX_LINKS})')
+    parser.add_argument('--max-growth', type=int, default=DEFAULT_MAX_GROWTH, metavar='PCT',
+                       help=f'Largest acceptable growth of a page since the baseline (default {DEFAULT_MAX_GROWTH})')
+    parser.add_argument('--baseline', metavar='PATH',
+                       help='Baseline file (default .cache/link-tools/page-weight.json)')
+    parser.add_argument('--update-baseline', action='store_true',
+                       help="Record this run's metrics as the new baseline")
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Ignore and don't update the shared docs index cache")
+    parser.add_argument('--jobs', type=parse_jobs, default=1, metavar='N',
+                       help='Index docs roots in N worker processes (0 = one per CPU, default 1)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+    metrics = start_metrics(args, 'check-weight')
+    budgets = {'size': args.max_size * 1024, 'code': args.max_code * 1024,
+               'components': args.max_components, 'images': args.max_images, 'links': args.max_links}
+
+    try:
+        layout = load_roots()
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if not layout:
+        print("❌ Error: docs directory not found")
+        print("Make sure you're running this from the project root or scripts folder")
+        sys.exit(1)
+    project_root, roots = layout
+
+    print("⚖️  Checking content weight in documentation...\n")
+    print(describe_roots(project_root, roots))
+    print(f"Budgets: {format_size(budgets['size'])} per page, {format_size(budgets['code'])} of code, "
+          f"{budgets['components']} components, {budgets['images']} images, {budgets['links']} links\n")
+
+    with metrics.phase('index'):
+        indexes = load_root_indexes(roots, use_cache=not args.no_cache, jobs=args.jobs)
+    pages = {}  # Project-relative source path -> weight metrics, across roots
+    for root, index in zip(roots, indexes):
+        metrics.cache('docs_index', len(index['files']) - index['parsed'], index['parsed'])
+        for rel_path, entry in index['files'].items():
+            if entry.get('weight'):
+                src = os.path.relpath(os.path.join(root['dir'], rel_path), project_root).replace(os.sep, '/')
+                pages[src] = entry['weight']
+
+    baseline_path = args.baseline or os.path.join(project_root, '.cache', 'link-tools', 'page-weight.json')
+    baseline = read_baseline(baseline_path)
+
+    # Findings per page: budget violations and growth since the baseline fail, other deltas are listed
+    over_budget = 0
+    grew = 0
+    reports = {}
+    deltas = []
+    for src in sorted(pages):
+        weight = pages[src]
+        lines = [f"   ❌ {problem}" for problem in budget_problems(weight, budgets)]
+        over_budget += bool(lines)
+        old = baseline.get(src) if baseline else None
+        if old:
+            delta = weight_delta(old, weight)
+            if grew_too_much(old, weight, args.max_growth):
+                grew += 1
+                lines.append(f"   ❌ grew more than {args.max_growth}% since the baseline "
+                             f"({format_size(old['bytes'])} → {format_size(weight['bytes'])}): {delta}")
+            elif delta:
+                deltas.append((weight['bytes'] - old['bytes'], src, delta))
+        if lines:
+            reports[src] = lines
+    metrics.count('pages', len(pages))
+    metrics.count('pages_over_budget', over_budget)
+    metrics.count('pages_grown', grew)
+
+    # Display results
+    for src, lines in reports.items():
+        print(f"📄 {os.path.relpath(os.path.join(project_root, src), '.')} - {describe_weight(pages[src])}")
+        for line in lines:
+            print(line)
+        print()
+
+    if baseline is not None:
+        added = sorted(pages.keys() - baseline.keys())
+        removed = sorted(baseline.keys() - pages.keys())
+        if deltas or added or removed:
+            print("📈 Changes since the baseline:\n")
+            for _, src, delta in sorted(deltas, key=lambda item: (-item[0], item[1])):
+                print(f"   {os.path.relpath(os.path.join(project_root, src), '.')}: {delta}")
+            for src in added:
+                print(f"   {os.path.relpath(os.path.join(project_root, src), '.')}: new page, "
+                      f"{describe_weight(pages[src])}")
+            for src in removed:
+                print(f"   {src}: removed")
+            print()
+
+    heaviest = sorted(pages, key=lambda src: (-pages[src]['bytes'], src))[:5]
+    if heaviest:
+        print("📊 Heaviest pages:\n")
+        for src in heaviest:
+            print(f"   {os.path.relpath(os.path.join(project_root, src), '.')} - {describe_weight(pages[src])}")
+        print()
+
+    print(f"Checked {len(pages)} pages ({format_size(sum(weight['bytes'] for weight in pages.values()))})")
+    if baseline is None or args.update_baseline:
+        write_json_atomic(baseline_path, {'version': BASELINE_VERSION, 'pages': pages})
+        print(f"📌 Recorded the baseline in {os.path.relpath(baseline_path, '.')}")
+    if over_budget or grew:
+        print(f"❌ {over_budget} pages over budget, {grew} pages grew more than {args.max_growth}% "
+              f"since the baseline")
+        sys.exit(1)
+    print("✅ All pages within budget!")
+
+if __name__ == '__main__':
+    main()
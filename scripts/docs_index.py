@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+docs_index.py
+
+Shared docs index used by check-links.py, fix-links.py, fix-redirects.py,
+backlinks.py, check-assets.py and check-weight.py. Parses the docs tree once into
+a serialized cache holding the URL set, the links (and their spans), page assets,
+heading anchors and content weight metrics extracted from each file and the
+index/non-index URL aliases.
+
+Cached entries are keyed by file mtime and content hash: files whose mtime and
+size are unchanged are not re-read, and files that were touched but whose
+content hash is unchanged are not re-parsed.
+
+With several docs roots (docs_roots.py, docs-roots.json) each root gets its own
+index and cache file; nested roots are excluded from the outer root's index.
+
+Usage:
+    from docs_index import find_docs_dir, load_index
+"""
+
+import os
+import re
+import json
+import glob
+import hashlib
+import unicodedata
+from urllib.parse import unquote
+from concurrent.futures import ProcessPoolExecutor
+
+from mdx_links import iter_links, frontmatter_end
+
+# Bump whenever the cached data layout or the link extraction rules change
+CACHE_VERSION = 6
+
+# ATX headings (## Heading), with an optional closing sequence of #s
+HEADING_PATTERN = re.compile(r'^ {0,3}#{1,6}[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$')
+# Custom heading ids supported by fumadocs: ## Heading [#custom-id]
+CUSTOM_ID_PATTERN = re.compile(r'\s*\[#([^\]]+)\]$')
+# Explicit ids on JSX/HTML elements: <div id="section">
+ID_ATTRIBUTE_PATTERN = re.compile(r'\bid=["\']([^"\']+)["\']')
+# Code fence openers/closers (``` or ~~~)
+FENCE_PATTERN = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+# JSX component opening tags: <Callout, <Tabs.Tab (capitalized, unlike HTML elements)
+COMPONENT_PATTERN = re.compile(r'<([A-Z][A-Za-z0-9]*(?:\.[A-Za-z0-9]+)*)')
+# Inline code spans, blanked before looking for components on a line
+INLINE_CODE_PATTERN = re.compile(r'`[^`\n]*`')
+# Markdown table rows (delimiter rows included)
+TABLE_ROW_PATTERN = re.compile(r'^ {0,3}\|')
+
+def find_docs_dir():
+    """Find the docs directory relative to script location - works from project root or scripts folder"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # Try current directory first (if run from project root)
+    docs_dir = os.path.join(script_dir, 'docs')
+    if os.path.exists(docs_dir):
+        return docs_dir
+
+    # Try parent directory (if run from scripts folder)
+    docs_dir = os.path.join(script_dir, '..', 'docs')
+    if os.path.exists(docs_dir):
+        return docs_dir
+
+    # Try relative to current working directory
+    docs_dir = 'docs'
+    if os.path.exists(docs_dir):
+        return docs_dir
+
+    return None
+
+def find_redirects_file():
+    """Find the redirects.json file - works from project root or scripts folder"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # Try parent directory (if run from scripts folder)
+    redirects_file = os.path.join(script_dir, '..', 'redirects.json')
+    if os.path.exists(redirects_file):
+        return redirects_file
+
+    # Try current directory
+    redirects_file = os.path.join(script_dir, 'redirects.json')
+    if os.path.exists(redirects_file):
+        return redirects_file
+
+    # Try relative to current working directory
+    redirects_file = 'redirects.json'
+    if os.path.exists(redirects_file):
+        return redirects_file
+
+    return None
+
+def project_root_for(docs_dir):
+    """The project root is the directory containing docs/ (and public/, redirects.json)"""
+    return os.path.dirname(os.path.abspath(docs_dir))
+
+def default_cache_dir(docs_dir):
+    """Directory holding the link tools' caches - .cache/link-tools/ next to the docs directory"""
+    return os.path.join(project_root_for(docs_dir), '.cache', 'link-tools')
+
+def default_cache_path(docs_dir):
+    """Location of the serialized docs index"""
+    return os.path.join(default_cache_dir(docs_dir), 'docs-index.json')
+
+def is_template_or_dynamic(link):
+    """Check if link is a template variable or dynamic content that should be ignored"""
+    # Template variables: ${variable}, {variable}, {{variable}}
+    if ('${' in link and '}' in link) or ('{' in link and '}' in link):
+        return True
+
+    # Dynamic placeholders: [variable], <variable>
+    if ('[' in link and ']' in link) or ('<' in link and '>' in link):
+        return True
+
+    # Common template patterns: :variable, @variable
+    if link.startswith(':') or link.startswith('@'):
+        return True
+
+    # Interpolation patterns: %variable%, %{variable}
+    if ('%' in link and link.count('%') >= 2) or ('%{' in link and '}' in link):
+        return True
+
+    return False
+
+# Link kinds the browser fetches when the page loads (as opposed to navigations)
+ASSET_LINK_KINDS = ('image', 'src')
+
+def extract_links(content):
+    """Extract all links from MDX content in order of appearance (code and JSX expressions skipped)"""
+    # Filter out template variables and dynamic content
+    return [span.url for span in iter_links(content) if not is_template_or_dynamic(span.url)]
+
+def extract_links_and_assets(content):
+    """
+    extract_links() plus the subset loaded with the page (![]() images and src=
+    attributes) and every link's [kind, url, start, end, line, column] span, in one pass
+    """
+    links = []
+    assets = []
+    spans = []
+    for span in iter_links(content):
+        if is_template_or_dynamic(span.url):
+            continue
+        links.append(span.url)
+        spans.append([span.kind, span.url, span.start, span.end, span.line, span.column])
+        if span.kind in ASSET_LINK_KINDS:
+            assets.append(span.url)
+    return links, assets, spans
+
+def slugify(text):
+    """Heading slug using the site's rules (github-slugger, as used by fumadocs)"""
+    # Lowercase, drop punctuation/symbols except - and _, then spaces become hyphens
+    kept = ''.join(ch for ch in text.lower()
+                   if ch in '-_ ' or unicodedata.category(ch)[0] in 'LNM')
+    return kept.replace(' ', '-')
+
+def heading_text(raw):
+    """Plain text content of a markdown heading (links, code, emphasis and JSX tags flattened)"""
+    text = re.sub(r'!?\[([^\]]*)\]\([^)]*\)', r'\1', raw)  # [text](url) → text
+    text = re.sub(r'`([^`]*)`', r'\1', text)                # `code` → code
+    text = re.sub(r'<[^>]+>', '', text)                     # <Badge>, </Badge> → removed
+    text = re.sub(r'(\*{1,3}|_{1,3}|~~)(\S(?:.*?\S)?)\1', r'\2', text)  # **bold** → bold
+    return text.strip()
+
+def extract_anchors(content):
+    """
+    Fragment ids a page exposes: heading slugs plus explicit id="..." attributes.
+
+    Returns None for generated pages (fumadocs-openapi frontmatter) whose
+    headings are rendered at build time and can't be known from the MDX.
+    """
+    lines = content.split('\n')
+    start = 0
+
+    # Skip YAML frontmatter
+    if lines and lines[0].strip() == '---':
+        for i in range(1, len(lines)):
+            if lines[i].strip() == '---':
+                if any(line.startswith('_openapi:') for line in lines[1:i]):
+                    return None
+                start = i + 1
+                break
+
+    anchors = []
+    occurrences = {}  # github-slugger de-duplication: slug, slug-1, slug-2...
+    fence = None
+    for line in lines[start:]:
+        # Track fenced code blocks so commented code (# foo) isn't mistaken for a heading
+        fence_match = FENCE_PATTERN.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+            continue
+        if fence is not None:
+            continue
+
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            raw = heading.group(1)
+            custom = CUSTOM_ID_PATTERN.search(raw)
+            if custom:
+                slug = custom.group(1)
+            else:
+                slug = original = slugify(heading_text(raw))
+                while slug in occurrences:
+                    occurrences[original] += 1
+                    slug = f"{original}-{occurrences[original]}"
+            occurrences[slug] = 0
+            anchors.append(slug)
+
+        anchors.extend(ID_ATTRIBUTE_PATTERN.findall(line))
+
+    return sorted(set(anchors))
+
+def page_weight(content):
+    """
+    What a page adds to its rendered HTML beyond prose: code block bytes, JSX
+    component usage ({name: count}) and markdown table rows, in one pass over its lines.
+    """
+    code_bytes = 0
+    components = {}
+    table_rows = 0
+    fence = None
+    for line in content[frontmatter_end(content):].split('\n'):
+        fence_match = FENCE_PATTERN.match(line)
+        if fence is not None or fence_match:
+            code_bytes += len(line.encode('utf-8')) + 1
+            if fence_match:
+                marker = fence_match.group(1)
+                if fence is None:
+                    fence = marker
+                elif marker[0] == fence[0] and len(marker) >= len(fence):
+                    fence = None
+            continue
+        if TABLE_ROW_PATTERN.match(line):
+            table_rows += 1
+        if '<' in line:
+            for name in COMPONENT_PATTERN.findall(INLINE_CODE_PATTERN.sub('', line)):
+                components[name] = components.get(name, 0) + 1
+    return {'code_bytes': code_bytes, 'components': components, 'table_rows': table_rows}
+
+def split_fragment(link):
+    """Split a link into (link without fragment, decoded fragment or None)"""
+    if '#' not in link:
+        return link, None
+    path, fragment = link.split('#', 1)
+    return path, unquote(fragment)
+
+def file_url(rel_path):
+    """Convert a docs-relative file path (agents/index.mdx) to its URL path (/agents/index)"""
+    path_without_ext = rel_path.replace('.mdx', '')
+    return '/' + path_without_ext.replace(os.sep, '/')
+
+def url_alias(url_path):
+    """Return the index/non-index twin of a URL (/path/index ↔ /path)"""
+    if url_path.endswith('/index'):
+        return url_path[:-6] or '/'  # Remove /index
+    return url_path.rstrip('/') + '/index'  # Add /index
+
+def content_hash(data):
+    """Hash raw file bytes - used to skip re-parsing files whose mtime changed but content did not"""
+    return hashlib.sha1(data).hexdigest()
+
+def map_jobs(func, items, jobs=1, initializer=None, initargs=()):
+    """
+    Apply func to every item, optionally spread over a process pool.
+
+    Results always come back in input order, so callers can merge them
+    deterministically. jobs <= 1 runs in-process; jobs == 0 is handled by the
+    callers' --jobs parsing (one worker per CPU).
+    """
+    items = list(items)
+    if jobs <= 1 or len(items) < 2:
+        if initializer:
+            initializer(*initargs)
+        return [func(item) for item in items]
+
+    # Several chunks per worker keeps the pool busy when file costs are uneven
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as pool:
+        return list(pool.map(func, items, chunksize=chunksize))
+
+def parse_jobs(value):
+    """argparse type for --jobs: a positive worker count, or 0 for one worker per CPU"""
+    jobs = int(value)
+    if jobs < 0:
+        raise ValueError(value)
+    return jobs or os.cpu_count() or 1
+
+def snapshot_tree(roots):
+    """
+    Walk roots once with os.scandir into sets of normalized absolute file and directory paths.
+
+    Lets callers answer existence questions with set lookups instead of one stat
+    per probe. Symlinks are recorded (as files or dirs) but not descended into.
+    """
+    roots = [os.path.normpath(os.path.abspath(root)) for root in roots]
+    files = set()
+    dirs = set()
+    stack = [root for root in roots if os.path.isdir(root)]
+    dirs.update(stack)
+
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.add(entry.path)
+                    stack.append(entry.path)
+                elif entry.is_symlink() and entry.is_dir():
+                    dirs.add(entry.path)
+                else:
+                    files.add(entry.path)
+
+    return {'roots': roots, 'files': files, 'dirs': dirs}
+
+def in_snapshot(snapshot, path):
+    """Check whether a normalized absolute path lies inside one of the snapshot's roots"""
+    return any(path == root or path.startswith(root + os.sep) for root in snapshot['roots'])
+
+def snapshot_exists(snapshot, path):
+    """os.path.exists() answered from the snapshot (falls back to a stat outside its roots)"""
+    if in_snapshot(snapshot, path):
+        return path in snapshot['files'] or path in snapshot['dirs']
+    return os.path.exists(path)
+
+def snapshot_isdir(snapshot, path):
+    """os.path.isdir() answered from the snapshot (falls back to a stat outside its roots)"""
+    if in_snapshot(snapshot, path):
+        return path in snapshot['dirs']
+    return os.path.isdir(path)
+
+def list_mdx_files(docs_dir, exclude=()):
+    """Sorted list of all MDX files under docs_dir, relative to docs_dir (skipping the exclude dirs)"""
+    mdx_files = glob.glob(os.path.join(docs_dir, '**/*.mdx'), recursive=True)
+    skip = tuple(os.path.relpath(path, docs_dir) + os.sep for path in exclude)
+    return sorted(rel_path for rel_path in (os.path.relpath(path, docs_dir) for path in mdx_files)
+                  if not rel_path.startswith(skip))
+
+def read_cache(cache_path):
+    """Load the cached per-file entries, or an empty dict if missing, stale or unreadable"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if data.get('version') != CACHE_VERSION:
+        return {}
+    return data.get('files', {})
+
+def write_json_atomic(path, data):
+    """Write data as compact JSON to path atomically (write to temp file, then rename)"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: Could not write cache file {path}: {e}")
+
+def write_cache(cache_path, index):
+    """Serialize the index's per-file entries to cache_path"""
+    write_json_atomic(cache_path, {
+        'version': CACHE_VERSION,
+        'files': index['files'],
+    })
+
+def parse_file(docs_dir, rel_path, cached):
+    """Build the index entry for one file, reusing the cached entry when mtime or content hash match"""
+    path = os.path.join(docs_dir, rel_path)
+    st = os.stat(path)
+
+    # Fast path: unchanged mtime and size means the file has not been touched
+    if cached and cached.get('mtime') == st.st_mtime and cached.get('size') == st.st_size:
+        return cached, False
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = content_hash(data)
+
+    # Touched but identical content: keep the parsed links, refresh the stat key
+    if cached and cached.get('hash') == digest:
+        entry = dict(cached, mtime=st.st_mtime, size=st.st_size)
+        return entry, False
+
+    content = data.decode('utf-8')
+    links, assets, spans = extract_links_and_assets(content)
+    weight = page_weight(content)
+    weight.update(bytes=len(data), images=len(assets), links=len(links) - len(assets))
+    entry = {
+        'mtime': st.st_mtime,
+        'size': st.st_size,
+        'hash': digest,
+        'url': file_url(rel_path),
+        'links': links,
+        'spans': spans,
+        'assets': assets,
+        'anchors': extract_anchors(content),
+        'weight': weight,
+    }
+    return entry, True
+
+def load_index(docs_dir, cache_path=None, use_cache=True, exclude=()):
+    """
+    Parse the docs tree into an index, reusing and refreshing the on-disk cache.
+    Directories in exclude (other docs roots nested inside this one) are left out.
+
+    Returns a dict with:
+        files    - {rel_path: {mtime, size, hash, url, links, spans, assets, anchors, weight}} in sorted
+                   path order (spans are each link's [kind, url, start, end, line, column], for
+                   in-place rewrites; assets are the image/src links the page loads)
+                   (anchors is None when a page's fragment ids can't be known)
+                   (weight is {bytes, code_bytes, components, table_rows, images, links})
+        urls     - set of every valid URL path, including index/non-index aliases
+        aliases  - {alias_url: file_url} for the index/non-index variations
+        parsed   - number of files that had to be (re-)parsed this run
+        rehashed - number of files re-read whose content hash matched the cache (not re-parsed)
+    """
+    if cache_path is None:
+        cache_path = default_cache_path(docs_dir)
+    cached_files = read_cache(cache_path) if use_cache else {}
+
+    files = {}
+    parsed = 0
+    rehashed = 0
+    dirty = False  # Whether the cache on disk needs rewriting
+    for rel_path in list_mdx_files(docs_dir, exclude):
+        cached = cached_files.get(rel_path)
+        try:
+            entry, was_parsed = parse_file(docs_dir, rel_path, cached)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Warning: Could not read {os.path.join(docs_dir, rel_path)}: {e}")
+            entry, was_parsed = {'url': file_url(rel_path), 'links': [], 'spans': [], 'assets': [],
+                                  'anchors': None, 'weight': None}, True
+        files[rel_path] = entry
+        parsed += was_parsed
+        rehashed += not was_parsed and cached is not None and entry is not cached
+        dirty = dirty or entry is not cached
+
+    urls = set()
+    aliases = {}
+    for entry in files.values():
+        urls.add(entry['url'])
+        aliases[url_alias(entry['url'])] = entry['url']
+    urls.update(aliases)
+
+    index = {'files': files, 'urls': urls, 'aliases': aliases, 'parsed': parsed, 'rehashed': rehashed}
+
+    # Only rewrite the cache when something was added, refreshed or deleted
+    if use_cache and (dirty or len(files) != len(cached_files)):
+        write_cache(cache_path, index)
+
+    return index
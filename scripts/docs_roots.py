@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+docs_roots.py
+
+Multi-root docs support for the link and redirect tools: versioned or
+multi-product content trees, each served under its own URL prefix.
+
+Roots are listed in docs-roots.json next to redirects.json:
+
+    {
+      "roots": [
+        {"path": "docs", "prefix": "/"},
+        {"path": "docs/v1", "prefix": "/v1"},
+        {"path": "content/sdk", "prefix": "/sdk", "name": "sdk"}
+      ]
+    }
+
+Each root is indexed and cached on its own (.cache/link-tools/docs-index-NAME.json),
+so an edit only re-parses files in the root it touches; a root nested inside
+another (docs/v1 above) is left out of the outer root's index. Absolute links
+resolve through the merged mount table - the longest matching URL prefix picks
+the root - so links between roots are checked like any other.
+
+Without docs-roots.json the single docs/ directory is the only root, served at /,
+and the tools behave exactly as before.
+
+Usage:
+    from docs_roots import load_roots, load_root_indexes, merged_urls
+    project_root, roots = load_roots()
+    indexes = load_root_indexes(roots, jobs=4)
+"""
+
+import os
+import re
+import json
+
+from docs_index import find_docs_dir, find_redirects_file, load_index, map_jobs, project_root_for
+from git_renames import load_rename_map
+
+ROOTS_FILE = 'docs-roots.json'
+
+def find_roots_config():
+    """docs-roots.json in the project root (next to redirects.json), or None"""
+    redirects_file = find_redirects_file()
+    candidates = [os.path.join(os.path.dirname(redirects_file), ROOTS_FILE)] if redirects_file else []
+    docs_dir = find_docs_dir()
+    if docs_dir:
+        candidates.append(os.path.join(project_root_for(docs_dir), ROOTS_FILE))
+    return next((path for path in candidates if os.path.isfile(path)), None)
+
+def normalize_prefix(prefix):
+    """URL prefix without a trailing slash ('/' for the site root)"""
+    if not isinstance(prefix, str) or not prefix.startswith('/'):
+        raise ValueError(f"prefix must be an absolute URL path, got {prefix!r}")
+    return prefix.rstrip('/') or '/'
+
+def root_name(path):
+    """Cache-safe name for a root directory (docs/v1 → docs-v1)"""
+    return re.sub(r'[^A-Za-z0-9._-]+', '-', path.replace(os.sep, '/')).strip('-') or 'root'
+
+def load_roots(config_path=None):
+    """
+    The docs roots to index and check.
+
+    Returns (project root, roots), where each root is a dict with name, dir
+    (absolute), prefix, exclude (dirs of other roots nested inside it), cache and
+    renames_cache (its own docs index and git rename files, None for the default
+    single root, which keeps the shared default caches). Returns None if
+    there is no config and no docs/ directory; raises ValueError for a malformed
+    docs-roots.json.
+    """
+    if config_path is None:
+        config_path = find_roots_config()
+    if config_path is None:
+        docs_dir = find_docs_dir()
+        if not docs_dir:
+            return None
+        root = {'name': 'docs', 'dir': os.path.normpath(os.path.abspath(docs_dir)), 'prefix': '/',
+                'exclude': [], 'cache': None, 'renames_cache': None}
+        return project_root_for(docs_dir), [root]
+
+    project_root = os.path.dirname(os.path.abspath(config_path))
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"could not read {config_path}: {e}")
+    entries = config.get('roots') if isinstance(config, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{config_path} must list at least one root under \"roots\"")
+
+    cache_dir = os.path.join(project_root, '.cache', 'link-tools')
+    roots = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get('path'), str):
+            raise ValueError(f"every root in {config_path} needs a \"path\", got {entry!r}")
+        directory = os.path.normpath(os.path.join(project_root, entry['path']))
+        if not os.path.isdir(directory):
+            raise ValueError(f"root directory {entry['path']} does not exist")
+        name = entry.get('name') or root_name(entry['path'])
+        roots.append({'name': name, 'dir': directory, 'prefix': normalize_prefix(entry.get('prefix', '/')),
+                      'exclude': [],
+                      'cache': os.path.join(cache_dir, f'docs-index-{root_name(name)}.json'),
+                      'renames_cache': os.path.join(cache_dir, f'git-renames-{root_name(name)}.json')})
+
+    for key in ('name', 'dir', 'prefix'):
+        values = [root[key] for root in roots]
+        duplicates = sorted({value for value in values if values.count(value) > 1})
+        if duplicates:
+            raise ValueError(f"roots in {config_path} share a {key}: {', '.join(duplicates)}")
+    for root in roots:
+        root['exclude'] = [other['dir'] for other in roots
+                           if other['dir'].startswith(root['dir'] + os.sep)]
+    return project_root, roots
+
+def describe_roots(project_root, roots):
+    """The "Using docs ..." line the tools print"""
+    if len(roots) == 1 and roots[0]['prefix'] == '/':
+        return f"Using docs directory: {roots[0]['dir']}"
+    described = ', '.join(f"{os.path.relpath(root['dir'], project_root)} ({root['prefix']})" for root in roots)
+    return f"Using docs roots: {described}"
+
+def outer_dirs(roots):
+    """Root directories not nested inside another root (what a filesystem walk needs to cover)"""
+    dirs = [root['dir'] for root in roots]
+    return [d for d in dirs if not any(d.startswith(other + os.sep) for other in dirs)]
+
+def mount_table(roots):
+    """[(URL prefix, root dir, excluded dirs)] with the longest prefixes first, for resolve_mount"""
+    return sorted(((root['prefix'], root['dir'], root['exclude']) for root in roots),
+                  key=lambda mount: -len(mount[0]))
+
+def resolve_mount(mounts, url_path):
+    """
+    (root dir, path inside the root, excluded dirs) serving an absolute URL
+    path, or (None, None, None). Targets inside the excluded dirs belong to a
+    nested root and are not served under this prefix.
+    """
+    for prefix, directory, exclude in mounts:
+        if prefix == '/':
+            return directory, url_path, exclude
+        if url_path == prefix or url_path.startswith(prefix + '/'):
+            return directory, url_path[len(prefix):] or '/', exclude
+    return None, None, None
+
+def prefixed_url(prefix, url):
+    """A root-relative URL (/guide, or / for the root's index) as served under prefix"""
+    if prefix == '/':
+        return url
+    return prefix if url == '/' else prefix + url
+
+def load_root_task(task):
+    """Worker entry point: (root, use_cache) → that root's docs index"""
+    root, use_cache = task
+    return load_index(root['dir'], cache_path=root['cache'], use_cache=use_cache, exclude=root['exclude'])
+
+def load_root_indexes(roots, use_cache=True, jobs=1):
+    """Every root's docs index (each from its own cache), loaded in parallel with jobs > 1"""
+    return map_jobs(load_root_task, [(root, use_cache) for root in roots], min(jobs, len(roots)))
+
+def merged_urls(roots, indexes):
+    """The merged URL index: every page URL (and index/non-index alias) across roots, with prefixes"""
+    urls = set()
+    for root, index in zip(roots, indexes):
+        urls.update(prefixed_url(root['prefix'], url) for url in index['urls'])
+    return urls
+
+def load_root_renames(roots, use_cache=True):
+    """Every root's git rename map ({old URL: current URL}), with the roots' URL prefixes applied"""
+    renames = {}
+    for root in roots:
+        root_renames = load_rename_map(root['dir'], use_cache=use_cache, cache_path=root['renames_cache'])
+        renames.update((prefixed_url(root['prefix'], old), prefixed_url(root['prefix'], new))
+                       for old, new in root_renames.items())
+    return renames
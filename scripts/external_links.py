@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+external_links.py
+
+Concurrent external (http/https) link checker used by check-links.py --external.
+
+Requests are scheduled with asyncio and run on pooled, keep-alive http.client
+connections in a thread pool. Each host gets its own connection pool, a cap on
+concurrent connections and a request rate limit, so a page full of links to
+one site doesn't hammer it. Every URL is tried with HEAD first, falling back to
+GET for servers that reject or mishandle HEAD, and redirects are followed.
+
+Results are cached on disk with a TTL so repeat runs (CI re-runs, local edits)
+only hit URLs that weren't checked recently. Transient failures - connection
+errors, timeouts, 429 and 5xx responses - are never cached.
+
+Usage:
+    from external_links import ExternalLinkChecker, is_broken
+    results = ExternalLinkChecker(cache_path).check(['https://example.com/'])
+"""
+
+import ssl
+import json
+import time
+import asyncio
+import threading
+import http.client
+from urllib.parse import urlsplit, urljoin
+from concurrent.futures import ThreadPoolExecutor
+
+from docs_index import write_json_atomic
+
+# Bump whenever the cached result layout or the broken/transient rules change
+CACHE_VERSION = 1
+
+DEFAULT_TTL = 24 * 60 * 60  # Seconds a cached result stays valid
+DEFAULT_CONCURRENCY = 32     # Requests in flight across all hosts
+DEFAULT_HOST_RATE = 20.0     # Requests started per second per host (0 = unlimited)
+HOST_CONNECTIONS = 8         # Concurrent connections per host
+REQUEST_TIMEOUT = 10         # Seconds per request (connect and each read)
+MAX_REDIRECTS = 5
+MAX_BODY = 64 * 1024         # GET bodies longer than this are abandoned (and the connection dropped)
+USER_AGENT = 'recall-docs-link-checker/1.0'
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Statuses that say more about bot protection than about the link - never reported as broken
+UNVERIFIABLE_STATUSES = {401, 403, 429}
+
+def is_external(link):
+    """Check if link is an absolute http(s) URL"""
+    return link.startswith(('http://', 'https://'))
+
+def is_broken(result):
+    """Check if a check result means the link is dead"""
+    status = result['status']
+    return status is None or (status >= 400 and status not in UNVERIFIABLE_STATUSES)
+
+def is_transient(result):
+    """Check if a result may change on retry and must not be cached"""
+    status = result['status']
+    return status is None or status == 429 or status >= 500
+
+def describe(result):
+    """Short human-readable form of a check result (404, connection refused, ...)"""
+    if result['status'] is None:
+        return result['error']
+    if result['final'] != result['url']:
+        return f"{result['status']} via {result['final']}"
+    return str(result['status'])
+
+class HostPool:
+    """Keep-alive connections, a connection cap and a rate limit for one scheme://host:port"""
+
+    def __init__(self, scheme, netloc, rate, timeout, ssl_context):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.idle = []  # Connections ready for reuse
+        self.lock = threading.Lock()  # idle is touched from executor threads
+        self.slots = asyncio.Semaphore(HOST_CONNECTIONS)
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_start = 0.0
+
+    async def throttle(self):
+        """Wait until this host's rate limit allows another request to start"""
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self.next_start)
+        self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def acquire(self):
+        """Return (connection, reused) - an idle pooled connection, or a new one"""
+        with self.lock:
+            if self.idle:
+                return self.idle.pop(), True
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.netloc, timeout=self.timeout,
+                                               context=self.ssl_context), False
+        return http.client.HTTPConnection(self.netloc, timeout=self.timeout), False
+
+    def release(self, conn, reusable):
+        """Return a connection to the pool, or close it if the response left it unusable"""
+        if reusable:
+            with self.lock:
+                self.idle.append(conn)
+        else:
+            conn.close()
+
+    def close(self):
+        """Close every idle connection"""
+        with self.lock:
+            for conn in self.idle:
+                conn.close()
+            self.idle = []
+
+def request(pool, method, target):
+    """Blocking request on a pooled connection, returning (status, Location header)"""
+    while True:
+        conn, reused = pool.acquire()
+        try:
+            conn.request(method, target, headers={'User-Agent': USER_AGENT, 'Accept': '*/*'})
+            response = conn.getresponse()
+            response.read(MAX_BODY)
+            # Only a fully read response on a connection the server keeps open can be reused
+            pool.release(conn, response.isclosed() and not response.will_close)
+            return response.status, response.getheader('Location')
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            if reused:
+                continue  # The server dropped an idle keep-alive connection - retry on a fresh one
+            raise
+
+class ExternalLinkChecker:
+    """Check http(s) URLs concurrently, reusing cached results younger than ttl seconds"""
+
+    def __init__(self, cache_path=None, ttl=DEFAULT_TTL, concurrency=DEFAULT_CONCURRENCY,
+                 host_rate=DEFAULT_HOST_RATE, timeout=REQUEST_TIMEOUT):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.concurrency = concurrency
+        self.host_rate = host_rate
+        self.timeout = timeout
+        self.fetched = 0  # URLs checked over the network this run
+        self.cached = 0   # URLs answered from the cache
+
+    def read_cache(self):
+        """Cached results still within the TTL, keyed by URL"""
+        if not self.cache_path or self.ttl <= 0:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        cutoff = time.time() - self.ttl
+        return {url: result for url, result in data.get('urls', {}).items()
+                if result.get('checked', 0) >= cutoff}
+
+    def write_cache(self, results):
+        """Persist every cacheable result (expired entries simply drop out)"""
+        if not self.cache_path:
+            return
+        write_json_atomic(self.cache_path, {
+            'version': CACHE_VERSION,
+            'urls': {url: result for url, result in sorted(results.items())
+                     if not is_transient(result)},
+        })
+
+    def check(self, urls):
+        """Check URLs (fragments ignored), returning {url: {url, status, error, final, checked}}"""
+        cached = self.read_cache()
+        results = {}
+        pending = []
+        for url in sorted(set(urls)):
+            if url in cached:
+                results[url] = cached[url]
+            else:
+                pending.append(url)
+        self.cached = len(results)
+        self.fetched = len(pending)
+
+        if pending:
+            results.update(asyncio.run(self.check_all(pending)))
+        self.write_cache(results)
+        return results
+
+    async def check_all(self, urls):
+        """Check every URL concurrently within the global and per-host limits"""
+        self.slots = asyncio.Semaphore(self.concurrency)
+        self.pools = {}
+        self.ssl_context = ssl.create_default_context()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            checked = await asyncio.gather(*(self.check_url(url, executor) for url in urls))
+        finally:
+            executor.shutdown(wait=True)
+            for pool in self.pools.values():
+                pool.close()
+        return dict(zip(urls, checked))
+
+    def pool_for(self, parts):
+        """The connection pool for a URL's scheme and host"""
+        key = (parts.scheme, parts.netloc.lower())
+        if key not in self.pools:
+            self.pools[key] = HostPool(parts.scheme, parts.netloc, self.host_rate, self.timeout,
+                                       self.ssl_context)
+        return self.pools[key]
+
+    async def fetch(self, parts, method, executor):
+        """One request within the global and per-host limits"""
+        pool = self.pool_for(parts)
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        # Wait for the host (its connection cap and rate limit) before taking a global slot,
+        # so one busy host's queue can't hold slots other hosts could use
+        async with pool.slots:
+            await pool.throttle()
+            async with self.slots:
+                return await asyncio.get_running_loop().run_in_executor(
+                    executor, request, pool, method, target)
+
+    async def check_url(self, url, executor):
+        """Check one URL: HEAD, falling back to GET, following redirects"""
+        result = {'url': url, 'status': None, 'error': None, 'final': url, 'checked': time.time()}
+        current = url.split('#', 1)[0]
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                parts = urlsplit(current)
+                if parts.scheme not in ('http', 'https') or not parts.hostname:
+                    result['error'] = f'unsupported URL {current}'
+                    return result
+                status, location = await self.fetch(parts, 'HEAD', executor)
+                if status >= 400:
+                    # Plenty of servers answer HEAD with 403/404/405 but serve GET fine
+                    status, location = await self.fetch(parts, 'GET', executor)
+                if status in REDIRECT_STATUSES and location:
+                    current = urljoin(current, location)
+                    continue
+                result['status'] = status
+                result['final'] = current
+                return result
+            result['error'] = f'more than {MAX_REDIRECTS} redirects'
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            result['error'] = str(e) or type(e).__name__
+        return result
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+find-duplicates.py
+
+Find near-duplicate documentation pages - content copied between sections
+(e.g. the same guide under user-guides/ and register-agent/) that inflates the
+build, the search index and the embeddings generated in prebuild.
+
+Each page's text is normalized (frontmatter, imports, JSX tags, link targets and
+markdown punctuation dropped, lowercased) and split into overlapping 5-word
+shingles. A MinHash signature of the shingle set (the minimum of each of 128
+random XOR masks over 64-bit shingle hashes) estimates the Jaccard similarity
+between any two pages, and LSH banding of the signatures turns up candidate pairs
+in roughly linear time instead of comparing every pair of pages.
+
+Signatures are cached by content hash in .cache/link-tools/minhash.json, so only
+new or edited pages are re-shingled on later runs.
+
+Usage:
+    python find-duplicates.py [--threshold N] [--no-cache] [--jobs N]
+                              [--metrics json] [--metrics-file PATH] [--profile PATH]
+
+Options:
+    --threshold N        Lowest similarity reported, 0-1 (default 0.8)
+    --no-cache           Ignore and don't update the signature and docs index caches
+    --jobs N             Compute signatures in N worker processes (0 = one per CPU, default 1)
+    --metrics json       Emit per-phase timings, counters and cache hit rates (stderr)
+    --metrics-file PATH  Write --metrics output to PATH instead
+    --profile PATH       Write a cProfile of the run to PATH
+
+Exits 1 if any pair of pages is at least --threshold similar.
+"""
+
+import sys
+import os
+import re
+import json
+import random
+import hashlib
+import argparse
+from collections import defaultdict
+from itertools import combinations
+
+from docs_index import (find_docs_dir, load_index, default_cache_dir, write_json_atomic, map_jobs,
+                        parse_jobs)
+from run_metrics import add_metrics_arguments, start_metrics
+
+# Bump whenever normalization, shingling or the hash family changes
+CACHE_VERSION = 1
+
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_SIZE = 5      # Words per shingle
+MIN_WORDS = 50        # Shorter pages (stubs, index pages) are too small to compare meaningfully
+NUM_PERM = 128        # Signature length; the estimate's standard error is about 1/sqrt(NUM_PERM)
+BANDS = 16            # LSH bands of NUM_PERM // BANDS rows: pairs above ~0.7 similarity share a band
+ROWS = NUM_PERM // BANDS
+SEED = 1              # Fixed, so cached signatures stay comparable between runs
+
+# XORing uniformly random 64-bit hashes with a random mask reorders them at random, and is
+# several times cheaper in Python than a modular (a*x + b) permutation
+_random = random.Random(SEED)
+MASKS = [_random.getrandbits(64) for _ in range(NUM_PERM)]
+
+FRONTMATTER_PATTERN = re.compile(r'\A---\s*\n.*?\n---\s*(?:\n|\Z)', re.DOTALL)
+IMPORT_EXPORT_PATTERN = re.compile(r'^(?:import|export)\s.*$', re.MULTILINE)
+IMAGE_PATTERN = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+LINK_PATTERN = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+TAG_PATTERN = re.compile(r'</?[A-Za-z][^<>]*/?>')
+WORD_PATTERN = re.compile(r'\w+')
+
+def page_words(content):
+    """The words of a page's prose and code, without markup"""
+    content = FRONTMATTER_PATTERN.sub('', content)
+    content = IMPORT_EXPORT_PATTERN.sub('', content)
+    content = IMAGE_PATTERN.sub(' ', content)
+    content = LINK_PATTERN.sub(r'\1', content)
+    content = TAG_PATTERN.sub(' ', content)
+    return WORD_PATTERN.findall(content.lower())
+
+def shingle_hashes(words):
+    """Set of 64-bit hashes of every SHINGLE_SIZE-word window"""
+    hashes = set()
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        shingle = ' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8')
+        hashes.add(int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), 'big'))
+    return hashes
+
+def minhash(hashes):
+    """MinHash signature: the minimum shingle hash under each XOR mask"""
+    return [min(x ^ mask for x in hashes) for mask in MASKS]
+
+def page_signature(path):
+    """MinHash signature of a page, or None if it is too short to compare"""
+    with open(path, 'r', encoding='utf-8') as f:
+        words = page_words(f.read())
+    if len(words) < MIN_WORDS:
+        return None
+    return minhash(shingle_hashes(words))
+
+def signature_task(path):
+    """Worker entry point: (signature, error message) for one page"""
+    try:
+        return page_signature(path), None
+    except (OSError, UnicodeDecodeError) as e:
+        return None, str(e)
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two pages: the fraction of signature slots that agree"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+def candidate_pairs(signatures):
+    """Pairs of pages that share at least one LSH band (sorted rel_path pairs)"""
+    pairs = set()
+    for band in range(BANDS):
+        buckets = defaultdict(list)
+        for rel_path, signature in signatures.items():
+            buckets[tuple(signature[band * ROWS:(band + 1) * ROWS])].append(rel_path)
+        for members in buckets.values():
+            pairs.update(combinations(sorted(members), 2))
+    return pairs
+
+def read_cache(cache_path):
+    """Cached {content hash: signature or None}, or an empty dict if missing, stale or unreadable"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != CACHE_VERSION or data.get('num_perm') != NUM_PERM:
+        return {}
+    return data.get('signatures', {})
+
+def main():
+    """Main function - report pairs of near-duplicate documentation pages"""
+    parser = argparse.ArgumentParser(description='Find near-duplicate documentation pages')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, metavar='N',
+                       help=f'Lowest similarity reported, 0-1 (default {DEFAULT_THRESHOLD})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Ignore and don't update the signature and docs index caches")
+    parser.add_argument('--jobs', type=parse_jobs, default=1, metavar='N',
+                       help='Compute signatures in N worker processes (0 = one per CPU, default 1)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+    if not 0 < args.threshold <= 1:
+        parser.error('--threshold must be between 0 and 1')
+    metrics = start_metrics(args, 'find-duplicates')
+
+    docs_dir = find_docs_dir()
+    if not docs_dir:
+        print("❌ Error: docs directory not found")
+        print("Make sure you're running this from the project root or scripts folder")
+        sys.exit(1)
+
+    print("🔍 Looking for near-duplicate pages in documentation...\n")
+    print(f"Using docs directory: {docs_dir}")
+
+    with metrics.phase('index'):
+        index = load_index(docs_dir, use_cache=not args.no_cache)
+    metrics.cache('docs_index', len(index['files']) - index['parsed'], index['parsed'])
+
+    # Signatures by content hash: only new or edited pages are shingled
+    cache_path = os.path.join(default_cache_dir(docs_dir), 'minhash.json')
+    cached = read_cache(cache_path) if not args.no_cache else {}
+    by_hash = {}     # content hash -> signature (None for pages too short to compare)
+    todo = {}        # content hash -> rel_path of one page with it, for hashes not cached yet
+    with metrics.phase('signatures'):
+        for rel_path, entry in index['files'].items():
+            digest = entry.get('hash')
+            if not digest or digest in by_hash:
+                continue
+            if digest in cached:
+                by_hash[digest] = cached[digest]
+            elif digest not in todo:
+                todo[digest] = rel_path
+        paths = [os.path.join(docs_dir, rel_path) for rel_path in todo.values()]
+        results = map_jobs(signature_task, paths, args.jobs)
+        for path, digest, (signature, error) in zip(paths, todo, results):
+            if error:
+                print(f"Warning: Could not read {path}: {error}")
+            else:
+                by_hash[digest] = signature
+        # Copies of a page share its signature
+        signatures = {rel_path: by_hash[entry['hash']] for rel_path, entry in index['files'].items()
+                      if by_hash.get(entry.get('hash')) is not None}
+    metrics.cache('signatures', len(index['files']) - len(todo), len(todo))
+
+    # Only rewrite the cache when pages were added, edited or deleted
+    if not args.no_cache and by_hash.keys() != cached.keys():
+        write_json_atomic(cache_path, {'version': CACHE_VERSION, 'num_perm': NUM_PERM,
+                                       'signatures': by_hash})
+
+    with metrics.phase('lsh'):
+        candidates = candidate_pairs(signatures)
+        duplicates = []
+        for a, b in candidates:
+            score = similarity(signatures[a], signatures[b])
+            if score >= args.threshold:
+                duplicates.append((score, a, b))
+        duplicates.sort(key=lambda item: (-item[0], item[1], item[2]))
+    metrics.count('pages_compared', len(signatures))
+    metrics.count('candidate_pairs', len(candidates))
+    metrics.count('duplicate_pairs', len(duplicates))
+
+    # Display results
+    print(f"Compared {len(signatures)} pages ({len(index['files']) - len(signatures)} too short), "
+          f"{len(candidates)} candidate pairs\n")
+    if duplicates:
+        print("📄 Near-duplicate pages:\n")
+        for score, a, b in duplicates:
+            print(f"   🔁 {score:.0%} similar: {os.path.relpath(os.path.join(docs_dir, a), '.')} ↔ "
+                  f"{os.path.relpath(os.path.join(docs_dir, b), '.')}")
+        print()
+        print(f"❌ {len(duplicates)} pairs of pages at least {args.threshold:.0%} similar")
+        sys.exit(1)
+    print(f"✅ No pages at least {args.threshold:.0%} similar!")
+
+if __name__ == '__main__':
+    main()
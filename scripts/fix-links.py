@@ -3,66 +3,41 @@
 fix-links.py
 
 Simple script to automatically fix broken internal links in MDX documentation files.
-Fixes both markdown links [text](url) and href attributes href="url".
+Fixes markdown links [text](url), reference definitions [label]: url and href="url"
+attributes, skipping code blocks, inline code and JSX expressions.
 
 Usage:
-    python fix-links.py [--dry-run]
+    python fix-links.py [--dry-run] [--no-cache] [--jobs N] [--redirects]
+                        [--metrics json] [--metrics-file PATH] [--profile PATH]
     
 Options:
     --dry-run    Show what would be fixed without making changes
+    --no-cache   Ignore and don't update the shared docs index cache
+    --jobs N     Fix files in N worker processes (0 = one per CPU, default 1)
+    --redirects  Also rewrite working links that go through redirects.json to their final page
+    --metrics json       Emit per-phase timings, per-file cost, fuzzy comparison counts and cache hit rates (stderr)
+    --metrics-file PATH  Write --metrics output to PATH instead
+    --profile PATH       Write a cProfile of the run to PATH
 """
 
 import sys
 import os
 import re
-import glob
+import time
 import argparse
-from difflib import SequenceMatcher
 
-def find_docs_dir():
-    """Find the docs directory relative to script location - works from project root or scripts folder"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Try current directory first (if run from project root)
-    docs_dir = os.path.join(script_dir, 'docs')
-    if os.path.exists(docs_dir):
-        return docs_dir
-    
-    # Try parent directory (if run from scripts folder)
-    docs_dir = os.path.join(script_dir, '..', 'docs')
-    if os.path.exists(docs_dir):
-        return docs_dir
-    
-    # Try relative to current working directory
-    docs_dir = 'docs'
-    if os.path.exists(docs_dir):
-        return docs_dir
-    
-    return None
+from docs_index import find_redirects_file, is_template_or_dynamic, map_jobs, parse_jobs
+from docs_roots import load_roots, load_root_indexes, load_root_renames, describe_roots, merged_urls
+from fuzzy_index import FuzzyIndex
+from mdx_links import iter_links, splice
+from redirect_matcher import RedirectMatcher, load_redirects
+from run_metrics import add_metrics_arguments, start_metrics
 
-def get_all_current_files():
-    """Build set of all valid URL paths from existing MDX files for link validation"""
-    docs_dir = find_docs_dir()
-    if not docs_dir:
-        return set()
-        
-    mdx_files = glob.glob(os.path.join(docs_dir, '**/*.mdx'), recursive=True)
-    current_urls = set()
-    
-    for file in mdx_files:
-        # Convert file path to URL path
-        rel_path = os.path.relpath(file, docs_dir)
-        path_without_ext = rel_path.replace('.mdx', '')
-        url_path = '/' + path_without_ext.replace(os.sep, '/')
-        current_urls.add(url_path)
-        
-        # Add index variations (both /path/index and /path)
-        if url_path.endswith('/index'):
-            current_urls.add(url_path[:-6])  # Remove /index
-        else:
-            current_urls.add(url_path + '/index')  # Add /index
-    
-    return current_urls
+# Link kinds that point at pages (images and src= assets are never rewritten to page URLs)
+PAGE_LINK_KINDS = ('markdown', 'href', 'definition')
+
+# Per-process reference data for fix_file_task, set once by init_worker
+worker_state = {}
 
 def generate_link_fixes():
     """Define mapping rules for common folder moves (old path → new path)"""
@@ -108,39 +83,38 @@ def generate_link_fixes():
         "competitions/guides/": "/competitions/developer-guides/",
     }
 
-def similarity(a, b):
-    """Calculate string similarity ratio (0.0 to 1.0) using sequence matching"""
-    return SequenceMatcher(None, a, b).ratio()
-
-def find_fuzzy_match(broken_link, current_urls, min_similarity=0.8):
+def find_fuzzy_match(broken_link, fuzzy_index, min_similarity=0.8):
     """Find best fuzzy match for broken link to catch typos (e.g. 'sourcess' → 'sources')"""
-    best_match = None
-    best_score = 0
+    return fuzzy_index.best_match(broken_link, min_similarity)
+
+def smart_fix_link(broken_link, current_urls, link_fixes, fuzzy_index, redirect_matcher=None, renames=None):
+    """Try multiple strategies to fix a broken link: redirects, git renames, direct mapping, patterns, /advanced/ prefix, fuzzy matching"""
+    # Strategy 0: Follow redirects.json (Next.js semantics) to a page that exists
+    if redirect_matcher and broken_link.startswith('/') and broken_link not in current_urls:
+        final, hops, cycle = redirect_matcher.final_destination(broken_link)
+        if hops and not cycle and final in current_urls:
+            return final
     
-    for url in current_urls:
-        score = similarity(broken_link, url)
-        if score > best_score and score >= min_similarity:
-            best_score = score
-            best_match = url
+    # Strategy 1: Follow the page's renames in git history (collapsed, so one lookup)
+    if renames and broken_link not in current_urls:
+        renamed = renames.get(broken_link.rstrip('/') or '/')
+        if renamed in current_urls:
+            return renamed
     
-    return best_match if best_score >= min_similarity else None
-
-def smart_fix_link(broken_link, current_urls, link_fixes):
-    """Try multiple strategies to fix a broken link: direct mapping, patterns, /advanced/ prefix, fuzzy matching"""
-    # Strategy 1: Direct mapping from fix rules
+    # Strategy 2: Direct mapping from fix rules
     if broken_link in link_fixes:
         potential_fix = link_fixes[broken_link]
         if potential_fix in current_urls:
             return potential_fix
     
-    # Strategy 2: Pattern matching (e.g. /protocol/x → /advanced/protocol/x)
+    # Strategy 3: Pattern matching (e.g. /protocol/x → /advanced/protocol/x)
     for old_pattern, new_pattern in link_fixes.items():
         if broken_link.startswith(old_pattern):
             potential_fix = broken_link.replace(old_pattern, new_pattern, 1)
             if potential_fix in current_urls:
                 return potential_fix
     
-    # Strategy 3: Try adding /advanced/ prefix for common directories
+    # Strategy 4: Try adding /advanced/ prefix for common directories
     if broken_link.startswith('/'):
         parts = broken_link.strip('/').split('/')
         if len(parts) > 0:
@@ -151,94 +125,88 @@ def smart_fix_link(broken_link, current_urls, link_fixes):
                 if potential_fix in current_urls:
                     return potential_fix
     
-    # Strategy 4: Fuzzy matching for typos
-    fuzzy_match = find_fuzzy_match(broken_link, current_urls)
+    # Strategy 5: Fuzzy matching for typos
+    fuzzy_match = find_fuzzy_match(broken_link, fuzzy_index)
     if fuzzy_match:
         return fuzzy_match
     
     return None
 
-def is_template_or_dynamic(link):
-    """Check if link is a template variable or dynamic content that should be ignored"""
-    # Template variables: ${variable}, {variable}, {{variable}}
-    if ('${' in link and '}' in link) or ('{' in link and '}' in link):
-        return True
-    
-    # Dynamic placeholders: [variable], <variable>
-    if ('[' in link and ']' in link) or ('<' in link and '>' in link):
-        return True
+def is_fixable(link_url):
+    """Check if a link is a candidate for fixing - internal, no fragments/queries, not a template"""
+    # Skip external links (http/https) and fragments/queries
+    if link_url.startswith('http') or '#' in link_url or '?' in link_url:
+        return False
     
-    # Common template patterns: :variable, @variable
-    if link.startswith(':') or link.startswith('@'):
-        return True
-    
-    # Interpolation patterns: %variable%, %{variable}
-    if ('%' in link and link.count('%') >= 2) or ('%{' in link and '}' in link):
-        return True
+    # Skip template variables or dynamic content
+    return not is_template_or_dynamic(link_url)
+
+def canonical_link(link_url, current_urls, redirect_matcher):
+    """Final page for an absolute link that goes through redirects.json (keeping #fragment/?query), or None"""
+    if not link_url.startswith('/') or link_url.startswith('//') or is_template_or_dynamic(link_url):
+        return None
     
+    split = re.search(r'[?#]', link_url)
+    path, suffix = (link_url[:split.start()], link_url[split.start():]) if split else (link_url, '')
+    final, hops, cycle = redirect_matcher.final_destination(path)
+    if hops and not cycle and final in current_urls:
+        return final + suffix
+    return None
+
+def lookup_fix(link_url, fix_cache, current_urls, link_fixes, fuzzy_index, redirect_matcher=None,
+               rewrite_redirects=False, stats=None, renames=None):
+    """Memoized fix for one link (link → fix or None) so repeated links are only fixed once per run"""
+    if stats is not None:
+        stats['lookup_hits' if link_url in fix_cache else 'lookup_misses'] += 1
+    if link_url not in fix_cache:
+        fixed_url = None
+        # Next.js redirects win over pages, so a redirected link's canonical form is its final page
+        if rewrite_redirects and redirect_matcher:
+            fixed_url = canonical_link(link_url, current_urls, redirect_matcher)
+        if fixed_url is None and is_fixable(link_url):
+            fixed_url = smart_fix_link(link_url, current_urls, link_fixes, fuzzy_index, redirect_matcher,
+                                       renames)
+        fix_cache[link_url] = fixed_url
+    return fix_cache[link_url]
+
+def needs_fixing(links, current_urls, link_fixes, fuzzy_index, fix_cache, redirect_matcher=None,
+                 rewrite_redirects=False, stats=None, renames=None):
+    """Check a file's already-extracted links so files without fixable links are never re-read"""
+    for link_url in links:
+        fixed_url = lookup_fix(link_url, fix_cache, current_urls, link_fixes, fuzzy_index,
+                               redirect_matcher, rewrite_redirects, stats, renames)
+        if fixed_url and fixed_url != link_url:
+            return True
     return False
 
-def fix_file_links(file_path, current_urls, link_fixes, dry_run=False):
-    """Process single file to fix broken links using regex replacement functions"""
+def fix_file_links(file_path, current_urls, link_fixes, fuzzy_index, dry_run=False, fix_cache=None,
+                   redirect_matcher=None, rewrite_redirects=False, stats=None, renames=None):
+    """Process single file to fix broken links, splicing fixes into the original content"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        original_content = content
         changes = []  # Track all changes made
+        if fix_cache is None:
+            fix_cache = {}  # Memoized smart_fix_link results (link → fix or None)
         
-        def replace_markdown_link(match):
-            """Replacement function for markdown links [text](url)"""
-            full_match = match.group(0)
-            link_text = match.group(1)
-            link_url = match.group(2)
-            
-            # Skip external links (http/https) and fragments/queries
-            if link_url.startswith('http') or '#' in link_url or '?' in link_url:
-                return full_match
-            
-            # Skip template variables or dynamic content
-            if is_template_or_dynamic(link_url):
-                return full_match
-            
-            # Try to fix the link
-            fixed_url = smart_fix_link(link_url, current_urls, link_fixes)
-            if fixed_url and fixed_url != link_url:
-                changes.append((link_url, fixed_url))
-                return f'[{link_text}]({fixed_url})'
-            
-            return full_match
+        def find_fix(link_url):
+            """Fix for one link, or None if it should be left alone"""
+            return lookup_fix(link_url, fix_cache, current_urls, link_fixes, fuzzy_index,
+                              redirect_matcher, rewrite_redirects, stats, renames)
         
-        def replace_href_link(match):
-            """Replacement function for href attributes href="url" or href='url'"""
-            full_match = match.group(0)
-            quote_char = match.group(1)  # Preserve original quote style (" or ')
-            link_url = match.group(2)
+        # One tokenizer pass finds every page link outside code; fixes are spliced into one rebuild
+        edits = []
+        for span in iter_links(content):
+            if span.kind not in PAGE_LINK_KINDS:
+                continue
             
-            # Skip external links (http/https) and fragments/queries
-            if link_url.startswith('http') or '#' in link_url or '?' in link_url:
-                return full_match
-            
-            # Skip template variables or dynamic content
-            if is_template_or_dynamic(link_url):
-                return full_match
-            
-            # Try to fix the link
-            fixed_url = smart_fix_link(link_url, current_urls, link_fixes)
-            if fixed_url and fixed_url != link_url:
-                changes.append((link_url, fixed_url))
-                return f'href={quote_char}{fixed_url}{quote_char}'
-            
-            return full_match
-        
-        # Apply fixes using regex substitution
-        # Process markdown links: [text](url)
-        markdown_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-        new_content = markdown_pattern.sub(replace_markdown_link, content)
-        
-        # Process href attributes: href="url" or href='url' (case insensitive)
-        href_pattern = re.compile(r'href=(["\'])([^"\']+)\1', re.IGNORECASE)
-        new_content = href_pattern.sub(replace_href_link, new_content)
+            # Try to fix the link (external links and template variables come back as None)
+            fixed_url = find_fix(span.url)
+            if fixed_url and fixed_url != span.url:
+                changes.append((span.url, fixed_url))
+                edits.append((span.start, span.end, fixed_url))
+        new_content = splice(content, edits)
         
         # Save changes to file (unless dry run)
         if changes and not dry_run:
@@ -251,37 +219,116 @@ def fix_file_links(file_path, current_urls, link_fixes, dry_run=False):
         print(f"❌ Error processing {file_path}: {e}")
         return []
 
+def init_worker(current_urls, link_fixes, redirects, dry_run, rewrite_redirects=False,
+                collect_stats=False, renames=None):
+    """Process-pool initializer: ship the URL set, fix rules, redirects and renames to each worker once"""
+    worker_state['current_urls'] = current_urls
+    worker_state['link_fixes'] = link_fixes
+    worker_state['fuzzy_index'] = FuzzyIndex(current_urls)  # Built once per worker, not per link
+    worker_state['redirect_matcher'] = RedirectMatcher(redirects)
+    worker_state['dry_run'] = dry_run
+    worker_state['rewrite_redirects'] = rewrite_redirects
+    worker_state['fix_cache'] = {}  # Memoized fixes shared across this worker's files
+    worker_state['collect_stats'] = collect_stats
+    worker_state['renames'] = renames
+
+def fix_file_task(task):
+    """Process-pool task: fix one file (writing it at most once), returning (changes, stats or None)"""
+    mdx_file, links = task
+    current_urls = worker_state['current_urls']
+    link_fixes = worker_state['link_fixes']
+    fuzzy_index = worker_state['fuzzy_index']
+    redirect_matcher = worker_state['redirect_matcher']
+    fix_cache = worker_state['fix_cache']
+    rewrite_redirects = worker_state['rewrite_redirects']
+    renames = worker_state['renames']
+    stats = None
+    if worker_state['collect_stats']:
+        stats = dict.fromkeys(('lookup_hits', 'lookup_misses', 'files_read'), 0)
+        start = time.perf_counter()
+        comparisons, queries = fuzzy_index.comparisons, fuzzy_index.queries
+    
+    # Only re-read files whose indexed links contain something to fix
+    changes = []
+    if needs_fixing(links, current_urls, link_fixes, fuzzy_index, fix_cache, redirect_matcher,
+                    rewrite_redirects, stats, renames):
+        changes = fix_file_links(mdx_file, current_urls, link_fixes, fuzzy_index,
+                                 worker_state['dry_run'], fix_cache, redirect_matcher, rewrite_redirects,
+                                 stats, renames)
+        if stats is not None:
+            stats['files_read'] = 1
+    
+    if stats is not None:
+        stats['seconds'] = time.perf_counter() - start
+        stats['fuzzy_comparisons'] = fuzzy_index.comparisons - comparisons
+        stats['fuzzy_queries'] = fuzzy_index.queries - queries
+    return changes, stats
+
 def main():
     """Main function - process all MDX files and fix broken internal links"""
     parser = argparse.ArgumentParser(description='Fix broken links in documentation')
     parser.add_argument('--dry-run', action='store_true', 
                        help='Show what would be fixed without making changes')
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Ignore and don't update the shared docs index cache")
+    parser.add_argument('--jobs', type=parse_jobs, default=1, metavar='N',
+                       help='Fix files in N worker processes (0 = one per CPU, default 1)')
+    parser.add_argument('--redirects', action='store_true',
+                       help='Also rewrite working links that go through redirects.json to their final page')
+    add_metrics_arguments(parser)
     args = parser.parse_args()
+    metrics = start_metrics(args, 'fix-links')
     
-    docs_dir = find_docs_dir()
-    if not docs_dir:
+    try:
+        layout = load_roots()
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    
+    if not layout:
         print("❌ Error: docs directory not found")
         print("Make sure you're running this from the project root or scripts folder")
         sys.exit(1)
+    project_root, roots = layout
     
     action = "Checking what would be fixed" if args.dry_run else "Fixing broken links"
     print(f"🔧 {action} in documentation...\n")
-    print(f"Using docs directory: {docs_dir}")
-    print("Fixing both markdown links [text](url) and href attributes href=\"url\"")
+    print(describe_roots(project_root, roots))
+    print("Fixing markdown links [text](url), reference definitions and href=\"url\" attributes outside code")
     print("Filtering out template variables (${var}, {var}, [var], <var>, :var, @var, %var%)\n")
     
-    # Build reference data
-    current_urls = get_all_current_files()  # Valid URLs for validation
+    # Build reference data from the shared docs index (one per root, merged by URL)
+    with metrics.phase('index'):
+        indexes = load_root_indexes(roots, use_cache=not args.no_cache, jobs=args.jobs)
+    for index in indexes:
+        metrics.cache('docs_index', len(index['files']) - index['parsed'], index['parsed'])
+        metrics.count('files_rehashed', index['rehashed'])
+    current_urls = merged_urls(roots, indexes)  # Valid URLs for validation
     link_fixes = generate_link_fixes()      # Mapping rules for common moves
+    with metrics.phase('redirects'):
+        redirects_file = find_redirects_file()  # Live redirects, followed before guessing
+        redirects = load_redirects(redirects_file) if redirects_file else []
+    with metrics.phase('renames'):
+        renames = load_root_renames(roots, use_cache=not args.no_cache)  # Page moves from git history
+    metrics.count('git_renames', len(renames))
     
-    # Process all MDX files
-    mdx_files = glob.glob(os.path.join(docs_dir, '**/*.mdx'), recursive=True)
+    # Process all MDX files, optionally in parallel (results come back in file order)
+    tasks = [(os.path.join(root['dir'], rel_path), entry['links'])
+             for root, index in zip(roots, indexes) for rel_path, entry in index['files'].items()]
+    with metrics.phase('fix'):
+        results = map_jobs(fix_file_task, tasks, args.jobs,
+                           initializer=init_worker,
+                           initargs=(current_urls, link_fixes, redirects, args.dry_run,
+                                     args.redirects, args.metrics is not None, renames))
     total_fixes = 0
     files_changed = 0
     
-    for mdx_file in mdx_files:
-        changes = fix_file_links(mdx_file, current_urls, link_fixes, args.dry_run)
-        
+    for (mdx_file, links), (changes, stats) in zip(tasks, results):
+        if stats is not None:
+            metrics.file_cost(os.path.relpath(mdx_file, project_root), stats.pop('seconds'), links=len(links),
+                              fuzzy_comparisons=stats['fuzzy_comparisons'])
+            metrics.cache('fix_cache', stats.pop('lookup_hits'), stats.pop('lookup_misses'))
+            metrics.count_all(stats)
         if changes:
             files_changed += 1
             total_fixes += len(changes)
@@ -304,7 +351,9 @@ def main():
     else:
         print("✅ No broken links found that can be automatically fixed!")
     
-    print(f"Processed {len(mdx_files)} files")
+    print(f"Processed {len(tasks)} files")
+    metrics.count('files', len(tasks))
+    metrics.count('links_fixed', total_fixes)
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
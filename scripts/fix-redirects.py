@@ -5,84 +5,43 @@ fix-redirects.py
 Script to fix redirect destinations in redirects.json to point to current file locations.
 
 Usage:
-    python fix-redirects.py [--dry-run]
+    python fix-redirects.py [--dry-run] [--no-cache] [--flatten] [--compact] [--stream]
+                            [--metrics json] [--metrics-file PATH] [--profile PATH]
     
 Options:
     --dry-run    Show what would be fixed without making changes
+    --no-cache   Ignore and don't update the shared docs index cache
+    --flatten    Collapse redirect chains so every source points straight at its final page,
+                 and report cycles and dead ends (exits 1 if a cycle is found)
+    --compact    Replace families of exact sources sharing a destination with one :path* wildcard
+                 rule, verifying that every known URL still resolves exactly as before
+    --stream     Parse, fix and write redirects one entry at a time (to a temp file that atomically
+                 replaces redirects.json), so memory use stays flat however large the table gets.
+                 Output order and layout match the default mode; not combinable with --flatten/--compact
+    --metrics json       Emit per-phase timings, fuzzy comparison counts and cache hit rates (stderr)
+    --metrics-file PATH  Write --metrics output to PATH instead
+    --profile PATH       Write a cProfile of the run to PATH
 """
 
 import sys
 import os
+import re
 import json
-import glob
 import argparse
-from difflib import SequenceMatcher
+import functools
+from collections import defaultdict
 
-def find_docs_dir():
-    """Find the docs directory relative to script location - works from project root or scripts folder"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Try parent directory (if run from scripts folder)
-    docs_dir = os.path.join(script_dir, '..', 'docs')
-    if os.path.exists(docs_dir):
-        return docs_dir
-    
-    # Try current directory (if run from project root)
-    docs_dir = os.path.join(script_dir, 'docs')
-    if os.path.exists(docs_dir):
-        return docs_dir
-    
-    # Try relative to current working directory
-    docs_dir = 'docs'
-    if os.path.exists(docs_dir):
-        return docs_dir
-    
-    return None
-
-def find_redirects_file():
-    """Find the redirects.json file - works from project root or scripts folder"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Try parent directory (if run from scripts folder)
-    redirects_file = os.path.join(script_dir, '..', 'redirects.json')
-    if os.path.exists(redirects_file):
-        return redirects_file
-    
-    # Try current directory
-    redirects_file = os.path.join(script_dir, 'redirects.json')
-    if os.path.exists(redirects_file):
-        return redirects_file
-    
-    # Try relative to current working directory
-    redirects_file = 'redirects.json'
-    if os.path.exists(redirects_file):
-        return redirects_file
-    
-    return None
+from docs_index import find_redirects_file
+from docs_roots import load_roots, load_root_indexes, load_root_renames, describe_roots, merged_urls
+from fuzzy_index import FuzzyIndex
+from redirect_matcher import (RedirectMatcher, compile_destination, is_pattern, normalize_path,
+                              split_segments)
+from run_metrics import add_metrics_arguments, start_metrics
 
-def get_all_current_files():
-    """Build set of all valid URL paths from existing MDX files for redirect validation"""
-    docs_dir = find_docs_dir()
-    if not docs_dir:
-        return set()
-        
-    mdx_files = glob.glob(os.path.join(docs_dir, '**/*.mdx'), recursive=True)
-    current_urls = set()
-    
-    for file in mdx_files:
-        # Convert file path to URL path
-        rel_path = os.path.relpath(file, docs_dir)
-        path_without_ext = rel_path.replace('.mdx', '')
-        url_path = '/' + path_without_ext.replace(os.sep, '/')
-        current_urls.add(url_path)
-        
-        # Add index variations (both /path/index and /path)
-        if url_path.endswith('/index'):
-            current_urls.add(url_path[:-6])  # Remove /index
-        else:
-            current_urls.add(url_path + '/index')  # Add /index
-    
-    return current_urls
+COMPACT_MIN_FAMILY = 3  # Fewest exact rules worth folding into one wildcard rule
+STREAM_CHUNK_SIZE = 64 * 1024  # Characters read at a time by --stream
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+DESTINATION_MEMO_SIZE = 4096  # Distinct destinations whose fixes are remembered (bounded for --stream)
 
 def generate_destination_fixes():
     """Define mapping rules for fixing redirect destinations (old path → new path)"""
@@ -109,37 +68,34 @@ def generate_destination_fixes():
         '/competitions/guides/mastra': '/competitions/developer-guides/mastra',
     }
 
-def similarity(a, b):
-    """Calculate string similarity ratio (0.0 to 1.0) using sequence matching"""
-    return SequenceMatcher(None, a, b).ratio()
-
-def find_fuzzy_match(broken_path, current_urls, min_similarity=0.8):
+def find_fuzzy_match(broken_path, fuzzy_index, min_similarity=0.8):
     """Find best fuzzy match for broken path to catch typos in redirect destinations"""
-    best_match = None
-    best_score = 0
-    
-    for url in current_urls:
-        score = similarity(broken_path, url)
-        if score > best_score and score >= min_similarity:
-            best_score = score
-            best_match = url
-    
-    return best_match if best_score >= min_similarity else None
+    return fuzzy_index.best_match(broken_path, min_similarity)
 
-def fix_destination(destination, current_urls, destination_fixes):
+def fix_destination(destination, current_urls, destination_fixes, fuzzy_index, renames=None):
     """Try multiple strategies to fix a broken redirect destination"""
     # Skip if destination already exists (not broken)
     if destination in current_urls:
         return None
     
-    # Strategy 1: Direct mapping from fix rules
+    # Skip external and parameterized (:path*) destinations - they aren't single pages
+    if '://' in destination or is_pattern(destination):
+        return None
+    
+    # Strategy 1: Follow the page's renames in git history (collapsed, so one lookup)
+    if renames:
+        renamed = renames.get(destination.rstrip('/') or '/')
+        if renamed in current_urls:
+            return renamed
+    
+    # Strategy 2: Direct mapping from fix rules
     for old_pattern, new_pattern in destination_fixes.items():
         if destination.startswith(old_pattern):
             potential_fix = destination.replace(old_pattern, new_pattern, 1)
             if potential_fix in current_urls:
                 return potential_fix
     
-    # Strategy 2: Try adding /advanced/ prefix for common directories
+    # Strategy 3: Try adding /advanced/ prefix for common directories
     if destination.startswith('/'):
         parts = destination.strip('/').split('/')
         if len(parts) > 0:
@@ -150,25 +106,327 @@ def fix_destination(destination, current_urls, destination_fixes):
                 if potential_fix in current_urls:
                     return potential_fix
     
-    # Strategy 3: Fuzzy matching for typos
-    fuzzy_match = find_fuzzy_match(destination, current_urls)
+    # Strategy 4: Fuzzy matching for typos
+    fuzzy_match = find_fuzzy_match(destination, fuzzy_index)
     if fuzzy_match:
         return fuzzy_match
     
     return None
 
+def destination_fixer(current_urls, destination_fixes, fuzzy_index, renames=None):
+    """
+    fix_destination bound to this run's URLs, fix rules, fuzzy index and renames,
+    memoized per destination - large tables repeat the same destinations across
+    many sources, and each miss can cost a fuzzy search over every URL.
+    """
+    @functools.lru_cache(maxsize=DESTINATION_MEMO_SIZE)
+    def fix(destination):
+        return fix_destination(destination, current_urls, destination_fixes, fuzzy_index, renames)
+    return fix
+
+def flatten_redirects(redirects, current_urls):
+    """
+    Collapse redirect chains so each rule's destination is its final page.
+    
+    Returns (flattened redirects, flattened chains, cycles, dead ends, hops removed),
+    where each reported item is (source, chain of destinations).
+    """
+    matcher = RedirectMatcher(redirects)
+    flattened_redirects = []
+    flattened = []
+    cycles = []
+    dead_ends = []
+    hops_removed = 0
+    
+    for redirect in redirects:
+        destination = redirect.get('destination')
+        # Parameterized and external destinations can't be followed statically
+        if not destination or is_pattern(destination) or '://' in destination:
+            flattened_redirects.append(redirect)
+            continue
+        
+        chain, cycle = matcher.redirect_chain(destination)
+        if cycle:
+            cycles.append((redirect['source'], chain))
+            flattened_redirects.append(redirect)
+            continue
+        
+        final = chain[-1]
+        if '://' not in final and final not in current_urls:
+            dead_ends.append((redirect['source'], chain))
+        
+        if len(chain) > 1:
+            # Every extra hop after the first redirect is a round trip saved per visit
+            hops_removed += len(chain) - 1
+            flattened.append((redirect['source'], chain))
+            new_redirect = redirect.copy()
+            new_redirect['destination'] = final
+            flattened_redirects.append(new_redirect)
+        else:
+            flattened_redirects.append(redirect)
+    
+    return flattened_redirects, flattened, cycles, dead_ends, hops_removed
+
+def rule_settings(rule):
+    """Everything about a rule except its source, as a comparable key"""
+    return json.dumps({key: value for key, value in rule.items() if key != 'source'}, sort_keys=True)
+
+def redirect_outcome(matcher, url):
+    """What a request for url gets: (rule id, destination, rule settings), or None if it doesn't redirect"""
+    found = matcher.match(url)
+    if found is None:
+        return None
+    rule_id, params = found
+    rule = matcher.redirects[rule_id]
+    destination = compile_destination(rule['destination'], params, matcher.param_names[rule_id])
+    return rule_id, destination, rule_settings(dict(rule, destination=destination))
+
+def known_redirect_urls(redirects, current_urls):
+    """Every concrete URL we know about: live pages plus literal redirect sources and destinations"""
+    urls = set(current_urls)
+    for redirect in redirects:
+        for key in ('source', 'destination'):
+            path = redirect.get(key)
+            if path and '://' not in path and not is_pattern(path):
+                urls.add(normalize_path(path))
+    return sorted(urls)
+
+def compact_redirects(redirects, current_urls):
+    """
+    Fold families of exact rules that share a path prefix and destination into one
+    `prefix/:path*` wildcard rule, placed where the family's first rule was.
+    
+    Returns (compacted redirects, families, mismatches) where families lists
+    (wildcard rule, folded sources) and mismatches lists known URLs whose outcome
+    changed (always empty unless something is badly wrong - callers must not write then).
+    """
+    matcher = RedirectMatcher(redirects)
+    known_urls = known_redirect_urls(redirects, current_urls)
+    before = {url: redirect_outcome(matcher, url) for url in known_urls}
+    
+    # Known URLs under every path prefix (case-insensitive, like the matcher)
+    urls_under = defaultdict(list)
+    for url in known_urls:
+        segments = split_segments(url.lower())
+        for depth in range(1, len(segments) + 1):
+            urls_under['/' + '/'.join(segments[:depth])].append(url)
+    
+    # Candidate families: exact rules grouped by each prefix of their source and their settings
+    candidates = defaultdict(list)  # (prefix, settings) -> rule ids in table order
+    for rule_id, redirect in enumerate(redirects):
+        source = redirect.get('source')
+        destination = redirect.get('destination')
+        if not source or not destination or redirect.get('has') or redirect.get('missing'):
+            continue
+        if is_pattern(source) or is_pattern(destination) or normalize_path(source) != source:
+            continue
+        segments = split_segments(source.lower())
+        for depth in range(1, len(segments) + 1):
+            candidates[('/' + '/'.join(segments[:depth]), rule_settings(redirect))].append(rule_id)
+    
+    # Shallowest prefixes first, so /tools/:path* wins over /tools/cli/:path*
+    folded = set()
+    wildcards = {}  # rule id of a family's first member -> its wildcard rule
+    families = []
+    for (prefix, settings), rule_ids in sorted(candidates.items(),
+                                               key=lambda item: (item[0][0].count('/'), item[0])):
+        members = [rule_id for rule_id in rule_ids if rule_id not in folded]
+        if len(members) < COMPACT_MIN_FAMILY:
+            continue
+        first = members[0]
+        
+        # The wildcard only changes what URLs under the prefix resolve to. It is safe if each
+        # known one already gets this family's redirect, or is caught by an earlier rule anyway
+        safe = True
+        for url in urls_under[prefix]:
+            outcome = before[url]
+            if outcome is None or (outcome[0] > first and outcome[2] != settings):
+                safe = False
+                break
+        if not safe:
+            continue
+        
+        wildcard = redirects[first].copy()
+        wildcard['source'] = redirects[first]['source'][:len(prefix)] + '/:path*'
+        wildcards[first] = wildcard
+        folded.update(members)
+        families.append((wildcard, [redirects[rule_id]['source'] for rule_id in members]))
+    
+    compacted = []
+    for rule_id, redirect in enumerate(redirects):
+        if rule_id in wildcards:
+            compacted.append(wildcards[rule_id])
+        elif rule_id not in folded:
+            compacted.append(redirect)
+    
+    # Prove it: every known URL must get the same destination and settings from the new table
+    new_matcher = RedirectMatcher(compacted)
+    mismatches = []
+    for url in known_urls:
+        old, new = before[url], redirect_outcome(new_matcher, url)
+        if (old and old[1:]) != (new and new[1:]):
+            mismatches.append(url)
+    
+    return compacted, families, mismatches
+
+def iter_json_array(f, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield the items of the JSON array in f one at a time, holding one item and one chunk in memory"""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = '', 0, False
+    state = 'open'  # open → first (item or ]) → item → separator (, or ]) → item ... → done
+    while True:
+        # Skip whitespace, reading the next chunk when the buffer runs out
+        position = JSON_WHITESPACE.match(buffer, position).end()
+        if position == len(buffer) and not eof:
+            buffer, position = f.read(chunk_size), 0
+            eof = not buffer
+            continue
+        char = buffer[position:position + 1]
+        if state == 'done':
+            if char:
+                raise ValueError(f"Extra data after the redirects array: {char!r}")
+            return
+        if state == 'open':
+            if char != '[':
+                raise ValueError("redirects.json must contain a JSON array")
+            position += 1
+            state = 'first'
+        elif state in ('first', 'separator') and char == ']':
+            position += 1
+            state = 'done'
+        elif state == 'separator':
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' between redirects, found {char!r}")
+            position += 1
+            state = 'item'
+        elif not char:
+            raise ValueError("Unexpected end of redirects.json")
+        else:
+            # An item that fails to decode, or isn't followed by a separator (-1 of -1.5),
+            # may just be cut off at the end of the chunk: read more and decode it again
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = len(buffer)
+            if (end == len(buffer) or buffer[end] not in ',] \t\n\r') and not eof:
+                more = f.read(chunk_size)
+                buffer, position, eof = buffer[position:] + more, 0, not more
+                continue
+            yield item
+            position = end
+            state = 'separator'
+
+def format_array_item(item, first):
+    """One array item exactly as json.dump(..., indent=2) lays it out inside a top-level array"""
+    return ('[\n' if first else ',\n') + '  ' + json.dumps(item, indent=2).replace('\n', '\n  ')
+
+def stream_redirects(redirects_file, current_urls, destination_fixes, fix, dry_run, metrics):
+    """
+    Fix redirect destinations one entry at a time, without loading the whole table.
+    
+    Entries are parsed incrementally, fixed and written straight to redirects.json.tmp
+    (in the original order, laid out exactly as the non-streaming mode writes them),
+    which replaces redirects.json atomically once everything has been written - or is
+    discarded if nothing changed. Fixes are reported as they are found, so memory use
+    doesn't grow with the size of the table.
+    
+    fix is the memoized destination_fixer for this run.
+    
+    Returns (redirects processed, fixes made).
+    """
+    tmp_path = redirects_file + '.tmp'
+    out = None if dry_run else open(tmp_path, 'w', encoding='utf-8')
+    status = "would fix" if dry_run else "fixed"
+    # Old paths from the fix rules that no redirect source covers yet
+    uncovered = list(destination_fixes)
+    processed = 0
+    written = 0
+    fixes = 0
+    
+    def report(old_dest, new_dest):
+        """Print one fix (with the section header before the first)"""
+        if not fixes:
+            print("📄 Redirect destination fixes:\n")
+        print(f"   🔗 {status}: {old_dest} → {new_dest}")
+    
+    try:
+        with metrics.phase('stream'), open(redirects_file, 'r', encoding='utf-8') as f:
+            for redirect in iter_json_array(f):
+                if isinstance(redirect, dict) and 'destination' in redirect:
+                    original_dest = redirect['destination']
+                    fixed_dest = fix(original_dest)
+                    if fixed_dest and fixed_dest != original_dest:
+                        report(original_dest, fixed_dest)
+                        fixes += 1
+                        redirect = dict(redirect, destination=fixed_dest)
+                if uncovered and isinstance(redirect, dict) and redirect.get('source'):
+                    # Same Next.js matching as the non-streaming mode, one rule at a time
+                    matcher = RedirectMatcher([redirect])
+                    uncovered = [old for old in uncovered if not matcher.has_source(old)]
+                if out:
+                    out.write(format_array_item(redirect, written == 0))
+                processed += 1
+                written += 1
+            
+            # Add missing redirect entries based on destination_fixes mappings (at the end, as before)
+            for old_pattern in uncovered:
+                new_pattern = destination_fixes[old_pattern]
+                if new_pattern in current_urls:
+                    report(f"NEW: {old_pattern}", new_pattern)
+                    fixes += 1
+                    if out:
+                        out.write(format_array_item({'source': old_pattern, 'destination': new_pattern,
+                                                     'permanent': True}, written == 0))
+                    written += 1
+        if out:
+            out.write('\n]' if written else '[]')
+            out.close()
+            if fixes:
+                os.replace(tmp_path, redirects_file)
+            else:
+                os.remove(tmp_path)
+    except (OSError, ValueError) as e:
+        if out:
+            out.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        print(f"❌ Error streaming redirects.json: {e}")
+        sys.exit(1)
+    
+    if fixes:
+        print()
+    return processed, fixes
+
 def main():
     """Main function - fix redirect destinations in redirects.json to point to valid file locations"""
     parser = argparse.ArgumentParser(description='Fix redirect destinations in redirects.json')
     parser.add_argument('--dry-run', action='store_true', 
                        help='Show what would be fixed without making changes')
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Ignore and don't update the shared docs index cache")
+    parser.add_argument('--flatten', action='store_true',
+                       help='Collapse redirect chains and report cycles and dead ends')
+    parser.add_argument('--compact', action='store_true',
+                       help='Fold exact rules sharing a prefix and destination into :path* wildcard rules')
+    parser.add_argument('--stream', action='store_true',
+                       help='Fix destinations one entry at a time, with memory use independent of table size')
+    add_metrics_arguments(parser)
     args = parser.parse_args()
+    if args.stream and (args.flatten or args.compact):
+        parser.error('--stream cannot be combined with --flatten or --compact (they need the whole table)')
+    metrics = start_metrics(args, 'fix-redirects')
     
     # Locate required files
-    docs_dir = find_docs_dir()
+    try:
+        layout = load_roots()
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
     redirects_file = find_redirects_file()
     
-    if not docs_dir:
+    if not layout:
         print("❌ Error: docs directory not found")
         print("Make sure you're running this from the project root or scripts folder")
         sys.exit(1)
@@ -180,58 +438,113 @@ def main():
     
     action = "Checking what would be fixed" if args.dry_run else "Fixing redirect destinations"
     print(f"🔧 {action} in redirects.json...\n")
-    print(f"Using docs directory: {docs_dir}")
+    project_root, roots = layout
+    print(describe_roots(project_root, roots))
     print(f"Using redirects file: {redirects_file}")
     
-    # Load redirects.json
-    try:
-        with open(redirects_file, 'r', encoding='utf-8') as f:
-            redirects = json.load(f)
-    except Exception as e:
-        print(f"❌ Error reading redirects.json: {e}")
-        sys.exit(1)
+    # Load redirects.json (--stream reads it entry by entry later instead)
+    redirects = []
+    if not args.stream:
+        try:
+            with metrics.phase('load'), open(redirects_file, 'r', encoding='utf-8') as f:
+                redirects = json.load(f)
+        except Exception as e:
+            print(f"❌ Error reading redirects.json: {e}")
+            sys.exit(1)
     
     # Build reference data
-    current_urls = get_all_current_files()      # Valid URLs for validation
+    with metrics.phase('index'):
+        indexes = load_root_indexes(roots, use_cache=not args.no_cache)
+    for index in indexes:
+        metrics.cache('docs_index', len(index['files']) - index['parsed'], index['parsed'])
+        metrics.count('files_rehashed', index['rehashed'])
+    current_urls = merged_urls(roots, indexes)  # Valid URLs across every docs root
     destination_fixes = generate_destination_fixes()  # Mapping rules for common moves
+    fuzzy_index = FuzzyIndex(current_urls)      # Built once, shared by every fuzzy lookup
+    with metrics.phase('renames'):
+        renames = load_root_renames(roots, use_cache=not args.no_cache)  # Page moves from git history
+    metrics.count('git_renames', len(renames))
+    fix = destination_fixer(current_urls, destination_fixes, fuzzy_index, renames)
+    
+    if args.stream:
+        processed, fixes = stream_redirects(redirects_file, current_urls, destination_fixes, fix,
+                                            args.dry_run, metrics)
+        if fixes:
+            status = "would be fixed" if args.dry_run else "fixed"
+            print(f"✅ {fixes} redirect destinations {status}")
+            if args.dry_run:
+                print("\nRun without --dry-run to apply these fixes")
+        else:
+            print("✅ No broken redirect destinations found!")
+        print(f"Processed {processed} redirects")
+        metrics.count('redirects', processed)
+        metrics.count('destinations_fixed', fixes)
+        metrics.count('fuzzy_comparisons', fuzzy_index.comparisons)
+        metrics.count('fuzzy_queries', fuzzy_index.queries)
+        metrics.cache('destination_memo', fix.cache_info().hits, fix.cache_info().misses)
+        return
     
     # Process each redirect entry
     changes = []         # Track all changes made
     fixed_redirects = [] # New redirect list with fixes applied
     
-    for i, redirect in enumerate(redirects):
-        if 'destination' not in redirect:
-            fixed_redirects.append(redirect)
-            continue
-        
-        original_dest = redirect['destination']
-        fixed_dest = fix_destination(original_dest, current_urls, destination_fixes)
-        
-        if fixed_dest and fixed_dest != original_dest:
-            # Record change and create updated redirect entry
-            changes.append((original_dest, fixed_dest))
-            new_redirect = redirect.copy()
-            new_redirect['destination'] = fixed_dest
-            fixed_redirects.append(new_redirect)
-        else:
-            # No change needed
-            fixed_redirects.append(redirect)
+    with metrics.phase('fix_destinations'):
+        for i, redirect in enumerate(redirects):
+            if 'destination' not in redirect:
+                fixed_redirects.append(redirect)
+                continue
+            
+            original_dest = redirect['destination']
+            fixed_dest = fix(original_dest)
+            
+            if fixed_dest and fixed_dest != original_dest:
+                # Record change and create updated redirect entry
+                changes.append((original_dest, fixed_dest))
+                new_redirect = redirect.copy()
+                new_redirect['destination'] = fixed_dest
+                fixed_redirects.append(new_redirect)
+            else:
+                # No change needed
+                fixed_redirects.append(redirect)
 
     # Add missing redirect entries based on destination_fixes mappings
     # Check if we have redirects for all the old patterns that should redirect to new ones
-    existing_sources = {r['source'] for r in fixed_redirects}
+    # (matching with Next.js semantics, so wildcard rules like /agents/:path* count too)
+    with metrics.phase('add_missing'):
+        matcher = RedirectMatcher(fixed_redirects)
+        
+        for old_pattern, new_pattern in destination_fixes.items():
+            # Check if we already have a redirect for this old pattern
+            if not matcher.has_source(old_pattern):
+                # Check if the new pattern (destination) actually exists
+                if new_pattern in current_urls:
+                    fixed_redirects.append({
+                        'source': old_pattern, 
+                        'destination': new_pattern, 
+                        'permanent': True
+                    })
+                    changes.append((f"NEW: {old_pattern}", new_pattern))
     
-    for old_pattern, new_pattern in destination_fixes.items():
-        # Check if we already have a redirect for this old pattern
-        if old_pattern not in existing_sources:
-            # Check if the new pattern (destination) actually exists
-            if new_pattern in current_urls:
-                fixed_redirects.append({
-                    'source': old_pattern, 
-                    'destination': new_pattern, 
-                    'permanent': True
-                })
-                changes.append((f"NEW: {old_pattern}", new_pattern))
+    # Collapse chains (A → B → C becomes A → C) on the fixed table
+    flattened, cycles, dead_ends, hops_removed = [], [], [], 0
+    if args.flatten:
+        with metrics.phase('flatten'):
+            fixed_redirects, flattened, cycles, dead_ends, hops_removed = flatten_redirects(
+                fixed_redirects, current_urls)
+    
+    # Fold exact rule families into wildcard rules (after flattening, so more destinations agree)
+    families = []
+    if args.compact:
+        with metrics.phase('compact'):
+            compacted_redirects, families, mismatches = compact_redirects(fixed_redirects, current_urls)
+        if mismatches:
+            print(f"❌ Compaction would change how {len(mismatches)} URLs resolve, not compacting:")
+            for url in mismatches[:20]:
+                print(f"   🔗 {url}")
+            families = []
+        else:
+            rules_before = len(fixed_redirects)
+            fixed_redirects = compacted_redirects
     
     # Display results
     if changes:
@@ -240,23 +553,73 @@ def main():
             status = "would fix" if args.dry_run else "fixed"
             print(f"   🔗 {status}: {old_dest} → {new_dest}")
         print()
-        
+    
+    if flattened:
+        print("📄 Redirect chains:\n")
+        for source, chain in flattened:
+            status = "would flatten" if args.dry_run else "flattened"
+            print(f"   ⏩ {status}: {source} → {' → '.join(chain)} ({len(chain)} hops → 1)")
+        print()
+    
+    if cycles:
+        print("❌ Redirect cycles:\n")
+        for source, chain in cycles:
+            print(f"   🔁 {source} → {' → '.join(chain)}")
+        print()
+    
+    if dead_ends:
+        print("⚠️  Redirects ending at missing pages:\n")
+        for source, chain in dead_ends:
+            print(f"   🚫 {source} → {' → '.join(chain)}")
+        print()
+    
+    if families:
+        print("📄 Redirect rule families:\n")
+        for wildcard, sources in families:
+            status = "would compact" if args.dry_run else "compacted"
+            print(f"   📦 {status}: {wildcard['source']} → {wildcard['destination']} ({len(sources)} rules)")
+        print()
+    
+    if changes or flattened or families:
         # Save changes to file (unless dry run)
         if not args.dry_run:
             try:
-                with open(redirects_file, 'w', encoding='utf-8') as f:
+                with metrics.phase('write'), open(redirects_file, 'w', encoding='utf-8') as f:
                     json.dump(fixed_redirects, f, indent=2)
-                print(f"✅ {len(changes)} redirect destinations fixed")
+                if changes:
+                    print(f"✅ {len(changes)} redirect destinations fixed")
             except Exception as e:
                 print(f"❌ Error writing redirects.json: {e}")
                 sys.exit(1)
-        else:
+        elif changes:
             print(f"✅ {len(changes)} redirect destinations would be fixed")
+        
+        if flattened:
+            status = "would be flattened" if args.dry_run else "flattened"
+            print(f"✅ {len(flattened)} redirect chains {status}, removing {hops_removed} redirect hops")
+        if families:
+            status = "would shrink" if args.dry_run else "shrank"
+            print(f"✅ Redirect table {status} from {rules_before} to {len(fixed_redirects)} rules; "
+                  f"all known URLs resolve as before")
+        if args.dry_run:
             print("\nRun without --dry-run to apply these fixes")
     else:
         print("✅ No broken redirect destinations found!")
+        if args.flatten:
+            print("✅ No redirect chains to flatten")
+        if args.compact:
+            print("✅ No redirect rule families to compact")
     
     print(f"Processed {len(redirects)} redirects")
+    metrics.count('redirects', len(redirects))
+    metrics.count('destinations_fixed', len(changes))
+    metrics.count('fuzzy_comparisons', fuzzy_index.comparisons)
+    metrics.count('fuzzy_queries', fuzzy_index.queries)
+    metrics.cache('destination_memo', fix.cache_info().hits, fix.cache_info().misses)
+    
+    if cycles:
+        print(f"❌ {len(cycles)} redirect cycles found")
+        sys.exit(1)
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+fs_watch.py
+
+Filesystem change notification for check-links.py --watch.
+
+On Linux, directories are watched recursively with inotify (through ctypes, no
+extra dependencies); elsewhere, or when inotify is unavailable or out of
+watches, the trees are polled with os.scandir. Both watchers coalesce a burst
+of events (an editor's write-to-temp-and-rename save, a git checkout) into one
+set of changed paths, so callers re-check once per burst rather than once per
+event.
+
+Usage:
+    from fs_watch import open_watcher
+    watcher = open_watcher([docs_dir, public_dir], [redirects_file])
+    while True:
+        changed = watcher.wait()  # set of absolute paths, or None after an overflow
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+DEBOUNCE = 0.02       # Seconds of quiet that end a burst of events
+POLL_INTERVAL = 0.5   # Seconds between scans for the polling fallback
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+class InotifyWatcher:
+    """Recursive inotify watches on directory trees, plus single files watched through their parent"""
+
+    kind = 'inotify'
+
+    def __init__(self, roots, files=()):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, 'inotify is only available on Linux')
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.paths = {}    # wd -> watched directory
+        self.filters = {}  # wd -> names reported from that directory (None = all, recursive)
+        try:
+            for root in roots:
+                self.watch_tree(os.path.normpath(os.path.abspath(root)))
+            for path in files:
+                path = os.path.normpath(os.path.abspath(path))
+                wd = self.add_watch(os.path.dirname(path))
+                if self.filters.get(wd, ()) is not None:
+                    self.filters[wd] = self.filters.get(wd) or set()
+                    self.filters[wd].add(os.path.basename(path))
+        except OSError:
+            self.close()
+            raise
+
+    def add_watch(self, path):
+        """Watch one directory, returning its watch descriptor"""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f'inotify_add_watch failed: {os.strerror(error)}', path)
+        self.paths[wd] = path
+        return wd
+
+    def watch_tree(self, root):
+        """Watch root and every directory below it, returning every path found"""
+        found = set()
+        for dirpath, dirnames, filenames in os.walk(root):
+            try:
+                self.filters[self.add_watch(dirpath)] = None
+            except FileNotFoundError:
+                continue  # Removed while walking - its deletion is reported by the parent
+            found.add(dirpath)
+            found.update(os.path.join(dirpath, name) for name in dirnames + filenames)
+        return found
+
+    def read_events(self):
+        """Drain pending events into a set of changed paths (None if the kernel queue overflowed)"""
+        changed = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & IN_IGNORED:
+                    self.paths.pop(wd, None)
+                    self.filters.pop(wd, None)
+                    continue
+                directory = self.paths.get(wd)
+                names = self.filters.get(wd)
+                if directory is None or not name or (names is not None and name not in names):
+                    continue
+                path = os.path.join(directory, name)
+                changed.add(path)
+                if names is None and mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files created before the new directory's watch existed get no events of their own
+                    changed.update(self.watch_tree(path))
+        return None if overflow else changed
+
+    def wait(self, timeout=None):
+        """Block until something changes, returning the changed paths once the burst is over"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        while ready:
+            events = self.read_events()
+            if events is None:
+                changed = None
+            elif changed is not None:
+                changed |= events
+            ready, _, _ = select.select([self.fd], [], [], DEBOUNCE)
+        return changed
+
+    def close(self):
+        """Release the inotify file descriptor (and with it every watch)"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class PollingWatcher:
+    """Fallback watcher: rescan the trees every interval and diff (mtime, size) per path"""
+
+    kind = 'polling'
+
+    def __init__(self, roots, files=(), interval=POLL_INTERVAL):
+        self.roots = [os.path.normpath(os.path.abspath(root)) for root in roots]
+        self.files = [os.path.normpath(os.path.abspath(path)) for path in files]
+        self.interval = interval
+        self.state = self.scan()
+
+    def scan(self):
+        """{path: (mtime_ns, size)} for every file and directory under the roots, plus the single files"""
+        state = {}
+        stack = [root for root in self.roots if os.path.isdir(root)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    state[entry.path] = (st.st_mtime_ns, st.st_size)
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        for path in self.files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def wait(self, timeout=None):
+        """Poll until something changes (or timeout passes), returning the changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if deadline is None
+                       else max(0.0, min(self.interval, deadline - time.monotonic())))
+            state = self.scan()
+            changed = {path for path in state.keys() | self.state.keys()
+                       if state.get(path) != self.state.get(path)}
+            self.state = state
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        """Nothing to release"""
+        self.state = {}
+
+def open_watcher(roots, files=(), polling=False):
+    """An inotify watcher for roots (recursively) and files, or a polling watcher if that's unavailable"""
+    if not polling:
+        try:
+            return InotifyWatcher(roots, files)
+        except (OSError, AttributeError) as e:
+            print(f"Warning: inotify unavailable ({e}), polling every {POLL_INTERVAL}s instead")
+    return PollingWatcher(roots, files)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+fuzzy_index.py
+
+Indexed replacement for the linear SequenceMatcher scan in fix-links.py and
+fix-redirects.py. The index is built once per run and answers "best URL with
+SequenceMatcher ratio >= min_similarity" with far fewer full comparisons.
+
+Every filter is an exact upper bound on SequenceMatcher.ratio(), so the result
+is the same best match a full scan would return (ties are broken by picking the
+lexicographically smallest URL, so results are also deterministic):
+
+    1. Length window - ratio <= 2*min(la, lb) / (la + lb)
+    2. Bigram prefix filter - ratio >= s bounds the edit distance, and by the
+       q-gram lemma two strings within edit distance k share at least
+       max(la, lb) + 1 - 2k padded bigrams, so a candidate must contain one of
+       the query's rarest bigrams
+    3. quick_ratio() - candidates are compared in decreasing order of this bound
+       and the scan stops once it drops below the best score found
+
+A handful of seed candidates sharing the query's rarest path segments and
+bigrams are scored first. Their best score only ever raises the threshold used
+by the filters above, which keeps them exact while shrinking the candidate set
+drastically for typical one- or two-character typos.
+
+Usage:
+    from fuzzy_index import FuzzyIndex
+    FuzzyIndex(current_urls).best_match('/advanced/sourcess')
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+PAD = '\x00'  # Boundary marker so first/last characters also form bigrams
+SEED_POSTINGS = 2000       # Minimum postings scanned (per key type) to pick seed candidates
+SEED_POSTINGS_SHARE = 0.2  # ...growing with the index: this share of the URL count
+SEED_COUNT = 16            # Seed candidates (per key type) scored before the exact filters run
+
+def bigram_tokens(text):
+    """Padded bigrams of text, numbered by occurrence so a multiset becomes a set"""
+    padded = PAD + text + PAD
+    seen = defaultdict(int)
+    tokens = []
+    for i in range(len(padded) - 1):
+        gram = padded[i:i + 2]
+        tokens.append((gram, seen[gram]))
+        seen[gram] += 1
+    return tokens
+
+def url_segments(url):
+    """Distinct non-empty path segments of a URL (/advanced/mcp → {'advanced', 'mcp'})"""
+    return {segment for segment in url.split('/') if segment}
+
+def similarity(a, b):
+    """Calculate string similarity ratio (0.0 to 1.0) using sequence matching"""
+    return SequenceMatcher(None, a, b).ratio()
+
+class FuzzyIndex:
+    """Bigram/length index over a URL set for exact best-match fuzzy lookups"""
+
+    def __init__(self, urls):
+        self.urls = sorted(urls)
+        self.url_ids = {url: i for i, url in enumerate(self.urls)}
+        self.comparisons = 0  # Full SequenceMatcher.ratio() calls made so far
+        self.queries = 0      # best_match() calls made so far
+
+        # URLs grouped by length, with a sorted list of lengths for window queries
+        self.by_length = defaultdict(list)
+        self.url_lengths = [len(url) for url in self.urls]
+        for i, length in enumerate(self.url_lengths):
+            self.by_length[length].append(i)
+        self.lengths = sorted(self.by_length)
+
+        # Character counts per URL for the quick_ratio() bound
+        self.char_counts = [Counter(url) for url in self.urls]
+
+        # Inverted indexes: bigram token / path segment -> URL ids containing it
+        self.postings = defaultdict(list)
+        self.segment_postings = defaultdict(list)
+        for i, url in enumerate(self.urls):
+            for token in bigram_tokens(url):
+                self.postings[token].append(i)
+            for segment in url_segments(url):
+                self.segment_postings[segment].append(i)
+
+    def length_window(self, la, min_similarity):
+        """Lengths lb for which 2*min(la, lb) / (la + lb) can still reach min_similarity"""
+        if min_similarity <= 0:
+            return self.lengths
+        lo = la * min_similarity / (2 - min_similarity)
+        hi = la * (2 - min_similarity) / min_similarity
+        return self.lengths[bisect_left(self.lengths, math.ceil(lo - 1e-9)):
+                            bisect_right(self.lengths, math.floor(hi + 1e-9))]
+
+    def candidates(self, query, min_similarity):
+        """URL ids that can possibly reach min_similarity against query"""
+        la = len(query)
+        lengths = self.length_window(la, min_similarity)
+        if not lengths:
+            return []
+
+        # Fewest padded bigrams any candidate in the window must share with the query
+        required = min(max(la, lb) + 1 - 2 * math.floor((la + lb) * (1 - min_similarity) + 1e-9)
+                       for lb in lengths)
+        tokens = bigram_tokens(query)
+        if required <= 0 or min_similarity <= 0:
+            # Bound too weak to prune: fall back to everything in the length window
+            return [i for lb in lengths for i in self.by_length[lb]]
+
+        # Prefix filter: sharing >= required tokens means sharing one of the
+        # (len(tokens) - required + 1) rarest ones
+        tokens.sort(key=lambda token: (len(self.postings.get(token, ())), token))
+        lo, hi = lengths[0], lengths[-1]
+        url_lengths = self.url_lengths
+        ids = set()
+        for token in tokens[:len(tokens) - required + 1]:
+            ids.update(i for i in self.postings.get(token, ()) if lo <= url_lengths[i] <= hi)
+        return ids
+
+    def seed_candidates(self, query):
+        """A few URL ids sharing the query's rarest path segments and bigrams, for a quick first score"""
+        la = len(query)
+        budget = max(SEED_POSTINGS, int(len(self.urls) * SEED_POSTINGS_SHARE))
+        seeds = []
+        for postings, keys in ((self.segment_postings, url_segments(query)),
+                               (self.postings, bigram_tokens(query))):
+            # Count hits over the rarest keys, within a fixed postings budget
+            hits = defaultdict(int)
+            scanned = 0
+            for key in sorted(keys, key=lambda key: len(postings.get(key, ()))):
+                ids = postings.get(key, ())
+                if scanned and scanned + len(ids) > budget:
+                    break
+                scanned += len(ids)
+                for i in ids:
+                    hits[i] += 1
+
+            ranked = sorted(hits, key=lambda i: (-hits[i], abs(len(self.urls[i]) - la), i))
+            seeds.extend(i for i in ranked[:SEED_COUNT] if i not in seeds)
+        return seeds
+
+    def best_match(self, query, min_similarity=0.8):
+        """Best URL with similarity(query, url) >= min_similarity, or None"""
+        self.queries += 1
+        # Only an identical string scores 1.0
+        if query in self.url_ids:
+            return query
+
+        best_id = None
+        best_score = 0
+
+        def consider(i):
+            """Score one candidate, keeping the best (smallest URL on ties)"""
+            nonlocal best_id, best_score
+            self.comparisons += 1
+            score = similarity(query, self.urls[i])
+            # Ids follow sorted URL order, so equal scores resolve to the smallest URL
+            tie = best_id is not None and score == best_score and i < best_id
+            if score >= min_similarity and (score > best_score or tie):
+                best_score = score
+                best_id = i
+
+        # Score seeds first: any real score is a lower bound that tightens every filter
+        seeds = self.seed_candidates(query)
+        for i in seeds:
+            consider(i)
+        threshold = max(min_similarity, best_score)
+
+        # Order remaining candidates by the quick_ratio() upper bound, best first
+        query_counts = Counter(query)
+        seeded = set(seeds)
+        bounded = []
+        for i in self.candidates(query, threshold):
+            if i in seeded:
+                continue
+            # Same formula as SequenceMatcher.quick_ratio(), from precomputed counts
+            counts = self.char_counts[i]
+            matches = sum(min(n, counts[ch]) for ch, n in query_counts.items())
+            total = len(query) + len(self.urls[i])
+            bound = 2.0 * matches / total if total else 1.0
+            if bound >= threshold:
+                bounded.append((-bound, i))
+        bounded.sort()
+
+        for neg_bound, i in bounded:
+            if -neg_bound < best_score:
+                break  # No remaining candidate can beat (or tie) the best score
+            consider(i)
+
+        return self.urls[best_id] if best_id is not None else None
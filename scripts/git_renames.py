@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+git_renames.py
+
+Page rename history for the link tools, read from `git log --name-status -M`
+over docs/.
+
+Every rename of an MDX page (including moves between directories) becomes an
+old URL → new URL edge; chains (a → b → c) are collapsed so a lookup is a single
+dict access. The map is cached in .cache/link-tools/git-renames.json together
+with the last commit processed, so later runs only read the commits added since.
+Renames staged but not yet committed are included too.
+
+Outside a git checkout (or without git) the map is simply empty.
+
+Usage:
+    from git_renames import load_rename_map
+    renames = load_rename_map(docs_dir)
+    renames.get('/competitions/guides/mcp')  # → '/competitions/developer-guides/mcp'
+"""
+
+import os
+import json
+import subprocess
+
+from docs_index import default_cache_dir, write_json_atomic, file_url, url_alias
+
+# Bump whenever the cached layout or the way edges are derived changes
+CACHE_VERSION = 1
+
+def git(args, cwd):
+    """Run a git command, returning its stdout, or None if git is unavailable or it fails"""
+    try:
+        result = subprocess.run(['git', '-c', 'core.quotepath=off', *args], cwd=cwd,
+                                capture_output=True, text=True, encoding='utf-8')
+    except OSError:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+def page_renames(name_status, docs_prefix):
+    """(old URL, new URL) edges for the MDX renames in --name-status output, in order"""
+    edges = []
+    for line in name_status.splitlines():
+        fields = line.split('\t')
+        if len(fields) != 3 or not fields[0].startswith('R'):
+            continue
+        old, new = fields[1], fields[2]
+        if not (old.startswith(docs_prefix) and new.startswith(docs_prefix)
+                and old.endswith('.mdx') and new.endswith('.mdx')):
+            continue
+        old_url = file_url(old[len(docs_prefix):])
+        new_url = file_url(new[len(docs_prefix):])
+        edges.append((old_url, new_url))
+        # Index pages are linked by their directory URL too (/section ↔ /section/index)
+        edges.append((url_alias(old_url), url_alias(new_url)))
+    return edges
+
+def collapse(edges):
+    """{old URL: final URL}, following chains in commit order (URLs renamed back to themselves are dropped)"""
+    renames = {}
+    for old_url, new_url in edges:
+        renames[old_url] = new_url
+        renames.pop(new_url, None)  # A page moved back to an old URL lives there again
+    # Path compression, so each lookup is one dict access
+    for old_url in list(renames):
+        seen = {old_url}
+        final = renames[old_url]
+        while final in renames and final not in seen:
+            seen.add(final)
+            final = renames[final]
+        renames[old_url] = final
+    return {old_url: new_url for old_url, new_url in renames.items() if old_url != new_url}
+
+def read_cache(cache_path):
+    """The cached {head, edges} data, or None if missing, stale or unreadable"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get('version') == CACHE_VERSION else None
+
+def load_rename_map(docs_dir, use_cache=True, cache_path=None):
+    """Collapsed {old URL: current URL} map of every page rename in the docs' git history"""
+    docs_dir = os.path.abspath(docs_dir)
+    top = git(['rev-parse', '--show-toplevel'], docs_dir)
+    head = git(['rev-parse', '--verify', '--quiet', 'HEAD'], docs_dir)
+    if not top or not head:
+        return {}
+    head = head.strip()
+    docs_prefix = os.path.relpath(docs_dir, top.strip()).replace(os.sep, '/') + '/'
+    log_args = ['log', '--reverse', '--name-status', '-M', '--format=']
+
+    if cache_path is None:
+        cache_path = os.path.join(default_cache_dir(docs_dir), 'git-renames.json')
+    cached = read_cache(cache_path) if use_cache else None
+    if cached and cached.get('docs') == docs_prefix and cached['head'] == head:
+        edges = [tuple(edge) for edge in cached['edges']]
+    else:
+        edges = None
+        if (cached and cached.get('docs') == docs_prefix
+                and git(['merge-base', '--is-ancestor', cached['head'], head], docs_dir) is not None):
+            # Fast-forward since the last run: only read the new commits
+            new_log = git(log_args + [f"{cached['head']}..{head}", '--', docs_prefix], top.strip())
+            if new_log is not None:
+                edges = [tuple(edge) for edge in cached['edges']] + page_renames(new_log, docs_prefix)
+        if edges is None:
+            full_log = git(log_args + [head, '--', docs_prefix], top.strip())
+            edges = page_renames(full_log or '', docs_prefix)
+        if use_cache:
+            write_json_atomic(cache_path, {'version': CACHE_VERSION, 'docs': docs_prefix,
+                                           'head': head, 'edges': edges})
+
+    # Renames staged for the next commit count too
+    staged = git(['diff', '--cached', '--name-status', '-M', 'HEAD', '--', docs_prefix], top.strip())
+    return collapse(edges + page_renames(staged or '', docs_prefix))
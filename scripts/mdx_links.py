@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+mdx_links.py
+
+Single-pass, MDX-aware link tokenizer shared by the link tools.
+
+Walks a file once and yields every link with its character span, line and
+column. Code is never mistaken for links: YAML frontmatter, fenced code blocks,
+inline code spans and JSX expressions ({...}) are skipped as whole regions.
+
+Recognized link forms (kind in parentheses):
+    [text](url)             (markdown)
+    ![alt](src)             (image)
+    [![alt](src)](url)      (image + markdown)
+    [label]: url            (definition) - target of reference-style [text][label] links
+    href="url"              (href)
+    src="url"               (src)
+
+Fixes are applied by collecting (start, end, replacement) edits for the URL
+spans and splicing them into the original content in one rebuild.
+
+Usage:
+    from mdx_links import iter_links, splice
+    edits = [(span.start, span.end, fix(span.url)) for span in iter_links(content)]
+    content = splice(content, edits)
+"""
+
+import re
+from collections import namedtuple
+
+# One link occurrence: url is content[start:end]; line and column are 1-based
+LinkSpan = namedtuple('LinkSpan', 'kind url start end line column')
+
+# Everything the scanner has to look at - regions to skip and link openers
+SCAN_PATTERN = re.compile(r'''
+    (?P<fence>^[ ]{0,3}(?:`{3,}|~{3,}))           # fenced code block opener
+  | (?P<definition>^[ ]{0,3}\[[^\]\n]+\]:[ \t]*)  # reference definition [label]: url
+  | (?P<ticks>`+)                                  # inline code span
+  | (?P<brace>\{)                                  # JSX expression
+  | (?P<bracket>!?\[)                              # markdown link or image
+  | (?P<attr>\b(?:href|src)=)                      # JSX/HTML link attribute
+''', re.MULTILINE | re.VERBOSE | re.IGNORECASE)
+
+# Link bodies, matched at the position of the opener found by SCAN_PATTERN
+LINK_PATTERN = re.compile(r'\[[^\]]+\]\(([^)]+)\)')
+IMAGE_PATTERN = re.compile(r'!\[[^\]]*\]\(([^)]+)\)')
+IMAGE_LINK_PATTERN = re.compile(r'\[!\[[^\]]*\]\(([^)]+)\)\]\(([^)]+)\)')
+ATTRIBUTE_VALUE_PATTERN = re.compile(r'["\']([^"\']+)["\']')
+DEFINITION_URL_PATTERN = re.compile(r'<([^>\n]+)>|[^\s<]+')
+
+def frontmatter_end(content):
+    """Offset just past a leading YAML frontmatter block (0 if there is none)"""
+    if not content.startswith('---'):
+        return 0
+    first_line_end = content.find('\n')
+    if first_line_end == -1 or content[:first_line_end].strip() != '---':
+        return 0
+    closing = re.compile(r'^---[ \t]*$', re.MULTILINE).search(content, first_line_end + 1)
+    if not closing:
+        return 0
+    return closing.end()
+
+def fence_end(content, start, marker):
+    """Offset just past the fence closing the block opened at start (end of content if unclosed)"""
+    line_end = content.find('\n', start)
+    if line_end == -1:
+        return len(content)
+    closing = re.compile(r'^[ ]{0,3}' + re.escape(marker[0]) + '{' + str(len(marker)) + r',}[ \t]*$',
+                         re.MULTILINE).search(content, line_end + 1)
+    return closing.end() if closing else len(content)
+
+def code_span_end(content, start, ticks):
+    """Offset just past the backtick run closing an inline code span, or None if it never closes"""
+    closing = re.compile(r'(?<!`)' + ticks + r'(?!`)').search(content, start + len(ticks))
+    return closing.end() if closing else None
+
+def expression_end(content, start):
+    """
+    Offset just past the JSX expression whose { is at start, or None if unbalanced.
+
+    Braces inside string literals and comments don't count. Quoted strings end
+    at a newline, so an apostrophe in JSX text can't swallow the rest of the file.
+    """
+    depth = 0
+    i = start
+    length = len(content)
+    while i < length:
+        ch = content[i]
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        elif ch in '"\'':
+            close = content.find(ch, i + 1)
+            newline = content.find('\n', i + 1)
+            if close == -1 or (newline != -1 and newline < close):
+                i += 1
+                continue
+            i = close
+        elif ch == '`':
+            close = content.find('`', i + 1)
+            if close == -1:
+                return None
+            i = close
+        elif content.startswith('/*', i):
+            close = content.find('*/', i + 2)
+            if close == -1:
+                return None
+            i = close + 1
+        i += 1
+    return None
+
+def link_target(content, start, end):
+    """Narrow a (url "title") body to the URL itself, dropping <> and any title"""
+    body = content[start:end]
+    stripped = body.lstrip()
+    start += len(body) - len(stripped)
+    if stripped.startswith('<') and '>' in stripped:
+        return start + 1, start + stripped.index('>')
+    url = stripped.split(None, 1)[0] if stripped.strip() else stripped
+    return start, start + len(url)
+
+def iter_links(content):
+    """Yield a LinkSpan for every link in MDX content, in order of appearance"""
+    line = 1
+    line_start = 0
+    counted = 0  # Offset up to which newlines have been counted into line/line_start
+
+    def span(kind, start, end):
+        """Build a LinkSpan, advancing the line counter to start"""
+        nonlocal line, line_start, counted
+        newlines = content.count('\n', counted, start)
+        if newlines:
+            line += newlines
+            line_start = content.rfind('\n', counted, start) + 1
+        counted = start
+        return LinkSpan(kind, content[start:end], start, end, line, start - line_start + 1)
+
+    pos = frontmatter_end(content)
+    while True:
+        found = SCAN_PATTERN.search(content, pos)
+        if not found:
+            return
+        kind = found.lastgroup
+        pos = found.end()
+
+        if kind == 'fence':
+            pos = fence_end(content, found.start(), found.group('fence').lstrip())
+        elif kind == 'ticks':
+            pos = code_span_end(content, found.start(), found.group('ticks')) or pos
+        elif kind == 'brace':
+            pos = expression_end(content, found.start()) or pos
+        elif kind == 'definition':
+            target = DEFINITION_URL_PATTERN.match(content, pos)
+            if target:
+                group = 1 if target.group(1) else 0
+                yield span('definition', target.start(group), target.end(group))
+                pos = target.end()
+        elif kind == 'attr':
+            value = ATTRIBUTE_VALUE_PATTERN.match(content, pos)
+            if value:
+                attribute = found.group('attr')[:-1].lower()
+                yield span(attribute, value.start(1), value.end(1))
+                pos = value.end()
+        elif found.group('bracket') == '[':
+            nested = IMAGE_LINK_PATTERN.match(content, found.start())
+            if nested:
+                yield span('image', *link_target(content, nested.start(1), nested.end(1)))
+                yield span('markdown', *link_target(content, nested.start(2), nested.end(2)))
+                pos = nested.end()
+                continue
+            link = LINK_PATTERN.match(content, found.start())
+            if link:
+                yield span('markdown', *link_target(content, link.start(1), link.end(1)))
+                pos = link.end()
+        else:
+            image = IMAGE_PATTERN.match(content, found.start())
+            if image:
+                yield span('image', *link_target(content, image.start(1), image.end(1)))
+                pos = image.end()
+
+def splice(content, edits):
+    """Apply (start, end, replacement) edits to content in a single rebuild (edits must not overlap)"""
+    pieces = []
+    pos = 0
+    for start, end, replacement in sorted(edits):
+        pieces.append(content[pos:start])
+        pieces.append(replacement)
+        pos = end
+    pieces.append(content[pos:])
+    return ''.join(pieces)
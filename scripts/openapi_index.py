@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+openapi_index.py
+
+OpenAPI spec index for the link tools.
+
+The endpoint reference pages under docs/reference/endpoints/ are generated from
+specs/competitions.json by scripts/generate-openapi.ts (one page per tag), and
+their headings only exist once fumadocs-openapi renders them at build time - the
+docs index records no anchors for them. The spec itself says which pages and
+#anchors the generator will produce, so links into the reference can be checked
+without running the TypeScript generation step first.
+
+The index lists every operation (operationId, method, path, tags, summary),
+every tag and the page generated for each tag with the anchors it renders: each
+operation's heading slug (summary, else the operationId as a title, else the
+path - slugged and de-duplicated like fumadocs-openapi) plus the raw operationId.
+
+It is cached in .cache/link-tools/openapi-index.json keyed by the spec's mtime,
+size and content hash, so an unchanged spec is never re-parsed; per-page anchor
+lists let callers invalidate only the links into pages whose anchors changed.
+
+Usage:
+    from openapi_index import load_spec_index
+    spec_index = load_spec_index(project_root)
+    spec_index['pages']['docs/reference/endpoints/agent.mdx']  # → ['get-agent-balances', ...]
+"""
+
+import os
+import re
+import json
+
+from docs_index import content_hash, slugify, write_json_atomic
+
+# Bump whenever the cached layout or the page/anchor derivation changes
+CACHE_VERSION = 1
+
+# Mirrors SPEC_PATH and OUTPUT_PATH in generate-openapi.ts (relative to the project root)
+SPEC_FILE = 'specs/competitions.json'
+ENDPOINTS_DIR = 'docs/reference/endpoints'
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+def tag_slug(tag):
+    """File name fumadocs-openapi gives a tag's page (Perpetual Futures → perpetual--futures)"""
+    return re.sub(r'[A-Z]', lambda m: '-' + m.group().lower(), tag).replace(' ', '-').lstrip('-')
+
+def id_to_title(operation_id):
+    """Heading title fumadocs-openapi derives from an operationId (getAgentProfile → Get Agent Profile)"""
+    words = re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', operation_id).replace('_', ' ').replace('-', ' ')
+    return words[:1].upper() + words[1:]
+
+def build_spec_index(spec):
+    """
+    Index a parsed OpenAPI document.
+
+    Returns {operations, tags, pages} where operations are {id, method, path,
+    tags, summary} in spec order and pages maps each generated page
+    (project-relative path) to the sorted anchors it renders.
+    """
+    operations = []
+    for path, item in (spec.get('paths') or {}).items():
+        if not isinstance(item, dict):
+            continue
+        for method, operation in item.items():
+            if method not in HTTP_METHODS or not isinstance(operation, dict):
+                continue
+            operations.append({'id': operation.get('operationId'), 'method': method, 'path': path,
+                               'tags': [tag for tag in operation.get('tags') or [] if isinstance(tag, str)],
+                               'summary': operation.get('summary')})
+
+    # One page per tag, headings in operation order (later duplicates get -1, -2... like github-slugger)
+    page_operations = {}
+    for operation in operations:
+        for tag in operation['tags']:
+            page_operations.setdefault(tag, []).append(operation)
+    pages = {}
+    for tag, tag_operations in page_operations.items():
+        anchors = set()
+        occurrences = {}
+        for operation in tag_operations:
+            title = (operation['summary'] or (id_to_title(operation['id']) if operation['id'] else None)
+                     or operation['path'])
+            slug = original = slugify(title)
+            while slug in occurrences:
+                occurrences[original] += 1
+                slug = f"{original}-{occurrences[original]}"
+            occurrences[slug] = 0
+            anchors.add(slug)
+            if operation['id']:
+                anchors.add(operation['id'])
+        pages[f"{ENDPOINTS_DIR}/{tag_slug(tag)}.mdx"] = sorted(anchors)
+
+    declared = [tag['name'] for tag in spec.get('tags') or [] if isinstance(tag, dict) and tag.get('name')]
+    tags = declared + sorted(page_operations.keys() - set(declared))
+    return {'operations': operations, 'tags': tags, 'pages': pages}
+
+def read_cache(cache_path):
+    """The cached {mtime, size, hash, index} data, or None if missing, stale or unreadable"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get('version') == CACHE_VERSION else None
+
+def load_spec_index(project_root, use_cache=True):
+    """
+    The spec index (see build_spec_index) plus its content hash and whether it
+    had to be parsed this run, or None if the project has no spec.
+
+    Raises OSError or ValueError if the spec can't be read or isn't valid JSON.
+    """
+    spec_path = os.path.join(project_root, SPEC_FILE)
+    if not os.path.isfile(spec_path):
+        return None
+    cache_path = os.path.join(project_root, '.cache', 'link-tools', 'openapi-index.json')
+    cached = read_cache(cache_path) if use_cache else None
+    st = os.stat(spec_path)
+
+    # Fast path: unchanged mtime and size means the spec has not been touched
+    if cached and cached['mtime'] == st.st_mtime and cached['size'] == st.st_size:
+        return dict(cached['index'], hash=cached['hash'], parsed=False)
+
+    with open(spec_path, 'rb') as f:
+        data = f.read()
+    digest = content_hash(data)
+    if cached and cached['hash'] == digest:
+        index = cached['index']
+        parsed = False
+    else:
+        index = build_spec_index(json.loads(data.decode('utf-8')))
+        parsed = True
+    if use_cache:
+        write_json_atomic(cache_path, {'version': CACHE_VERSION, 'mtime': st.st_mtime, 'size': st.st_size,
+                                       'hash': digest, 'index': index})
+    return dict(index, hash=digest, parsed=parsed)
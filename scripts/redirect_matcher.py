@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+redirect_matcher.py
+
+Compiled matcher for redirects.json with Next.js (path-to-regexp) source pattern
+semantics, shared by fix-redirects.py and the link tools.
+
+Supported source syntax, matched case-insensitively like Next.js:
+    /docs/page          literal segments
+    /blog/:slug         named parameter (one segment)
+    /blog/:slug?        optional parameter
+    /blog/:path*        zero or more segments
+    /blog/:path+        one or more segments
+    /post/:id(\\d+)      parameter with a custom regex
+    /old-(.*)           unnamed regex group
+
+Rules are compiled into a segment trie so a lookup costs O(path depth) rather
+than a scan over every rule. Patterns the trie can't express (repeating
+parameters in the middle of a path, several parameters inside one segment)
+fall back to a per-rule regex. First match wins, in redirects.json order,
+across both. Rules with `has`/`missing` conditions depend on request headers,
+cookies or query strings, so they are never matched statically.
+
+Usage:
+    from redirect_matcher import RedirectMatcher, load_redirects
+    matcher = RedirectMatcher(load_redirects('redirects.json'))
+    matcher.resolve('/agent-toolkit/quickstart')  # → '/get-started/overview'
+"""
+
+import re
+import json
+
+# Default parameter pattern used by path-to-regexp: anything but a delimiter
+DEFAULT_PARAM = r'[^/#?]+?'
+# A path-to-regexp token: :name with optional (regex) and modifier, or an unnamed (regex)
+TOKEN_PATTERN = re.compile(r':([A-Za-z_]\w*)(?:\(((?:\\.|[^()\\])*)\))?([?*+]?)|\(((?:\\.|[^()\\])*)\)([?*+]?)')
+# Parameter references in a destination (:name, :name*, ...), skipping URL ports like :443
+DESTINATION_PARAM = re.compile(r':([A-Za-z_]\w*)[?*+]?')
+
+def load_redirects(redirects_file):
+    """Load the redirect rules list from redirects.json"""
+    with open(redirects_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def is_pattern(path):
+    """Check if a source/destination uses path-to-regexp syntax rather than a literal path"""
+    return TOKEN_PATTERN.search(path) is not None
+
+def normalize_path(path):
+    """Strip query/fragment and any trailing slash, as Next.js does before matching redirects"""
+    path = path.split('#', 1)[0].split('?', 1)[0]
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+    return path
+
+def split_segments(path):
+    """Split a path into its non-empty segments"""
+    return [segment for segment in path.split('/') if segment]
+
+def parse_source(source):
+    """
+    Split a source pattern into segments of literal strings and parameter tokens.
+
+    Each parameter token is (name, regex, modifier); unnamed (regex) groups are
+    numbered 0, 1, ... across the whole source, like path-to-regexp.
+    """
+    segments = []
+    unnamed = 0
+    for segment in split_segments(source):
+        parts = []
+        pos = 0
+        for match in TOKEN_PATTERN.finditer(segment):
+            if match.start() > pos:
+                parts.append(segment[pos:match.start()])
+            if match.group(1):
+                parts.append((match.group(1), match.group(2) or DEFAULT_PARAM, match.group(3)))
+            else:
+                parts.append((str(unnamed), match.group(4), match.group(5)))
+                unnamed += 1
+            pos = match.end()
+        if pos < len(segment):
+            parts.append(segment[pos:])
+        segments.append(parts)
+    return segments
+
+def is_whole_segment_param(parts):
+    """Check if a parsed segment is exactly one parameter (so its modifier covers the slash)"""
+    return len(parts) == 1 and not isinstance(parts[0], str)
+
+def parts_regex(parts, names):
+    """Regex for one segment of literals and non-repeating parameters, appending group names"""
+    regex = ''
+    for part in parts:
+        if isinstance(part, str):
+            regex += re.escape(part)
+        else:
+            name, pattern, modifier = part
+            regex += f'(?P<p{len(names)}>{pattern}){"?" if modifier == "?" else ""}'
+            names.append(name)
+    return regex
+
+def source_regex(segments):
+    """Compile a parsed source to a full-path regex, for rules the trie can't express"""
+    pieces = []
+    names = []
+    for parts in segments:
+        if is_whole_segment_param(parts):
+            # path-to-regexp applies the modifier to the segment including its leading slash
+            name, pattern, modifier = parts[0]
+            group = f'(?P<p{len(names)}>{pattern}(?:/{pattern})*)' if modifier in ('*', '+') \
+                else f'(?P<p{len(names)}>{pattern})'
+            names.append(name)
+            pieces.append(f'(?:/{group})?' if modifier in ('?', '*') else '/' + group)
+        else:
+            pieces.append('/' + parts_regex(parts, names))
+    return re.compile('^' + ''.join(pieces) + '/?$', re.IGNORECASE), names
+
+def captured_params(found, names):
+    """Named values captured by a regex match (unmatched optional groups are left out)"""
+    return {name: found.group(f'p{i}') for i, name in enumerate(names)
+            if found.group(f'p{i}') is not None}
+
+def compile_destination(destination, params, names):
+    """Substitute captured parameters into a destination pattern"""
+    def substitute(match):
+        name = match.group(1)
+        if name in params:
+            return params[name]
+        # A source parameter that matched nothing (optional / zero segments) is dropped
+        return '' if name in names else match.group(0)
+
+    result = DESTINATION_PARAM.sub(substitute, destination)
+    # Dropped parameters can leave // or a trailing slash behind
+    scheme, sep, rest = result.partition('://')
+    if sep:
+        return scheme + sep + re.sub(r'/{2,}', '/', rest)
+    result = re.sub(r'/{2,}', '/', result)
+    return result.rstrip('/') or '/'
+
+def new_node():
+    """Empty trie node"""
+    return {
+        'literal': {},    # lowercased segment -> child node
+        'dynamic': [],    # (segment regex, param names, child node)
+        'rules': [],      # rule ids whose source ends exactly here
+        'rest': [],       # (rule id, param name, min, max segments) catch-alls ending the source
+    }
+
+class RedirectMatcher:
+    """Segment-trie matcher over a redirects.json rule list (first match wins)"""
+
+    def __init__(self, redirects):
+        self.redirects = list(redirects)
+        self.root = new_node()
+        self.regex_rules = []  # (rule id, compiled regex, names) for patterns the trie can't hold
+        self.param_names = {}  # rule id -> parameter names its source defines
+
+        for rule_id, rule in enumerate(self.redirects):
+            source = rule.get('source')
+            if not source or 'destination' not in rule or rule.get('has') or rule.get('missing'):
+                continue
+            segments = parse_source(source)
+            self.param_names[rule_id] = {part[0] for parts in segments for part in parts
+                                         if not isinstance(part, str)}
+            if not self.insert(rule_id, segments):
+                regex, names = source_regex(segments)
+                self.regex_rules.append((rule_id, regex, names))
+
+    def insert(self, rule_id, segments):
+        """Add a parsed rule to the trie; returns False if its pattern needs the regex fallback"""
+        node = self.root
+        for position, parts in enumerate(segments):
+            last = position == len(segments) - 1
+            param = parts[0] if is_whole_segment_param(parts) else None
+
+            # Trailing whole-segment :name* / :name+ / :name? - a catch-all on this node
+            if param and last and param[2] in ('*', '+', '?'):
+                if param[1] != DEFAULT_PARAM:
+                    return False
+                min_segments = 1 if param[2] == '+' else 0
+                max_segments = 1 if param[2] == '?' else None
+                node['rest'].append((rule_id, param[0], min_segments, max_segments))
+                return True
+
+            if len(parts) == 1 and isinstance(parts[0], str):
+                node = node['literal'].setdefault(parts[0].lower(), new_node())
+                continue
+
+            # Repeating or optional parameters mid-path change the segment count: use a regex
+            if any(not isinstance(part, str) and part[2] for part in parts):
+                return False
+            names = []
+            regex = re.compile('^' + parts_regex(parts, names) + '$', re.IGNORECASE)
+            for existing_regex, _, child in node['dynamic']:
+                if existing_regex.pattern == regex.pattern:
+                    node = child
+                    break
+            else:
+                child = new_node()
+                node['dynamic'].append((regex, names, child))
+                node = child
+
+        node['rules'].append(rule_id)
+        return True
+
+    def match(self, path):
+        """Return (rule id, params) for the first rule matching path, or None"""
+        path = normalize_path(path)
+        segments = split_segments(path)
+        best = None  # (rule id, params)
+
+        # Depth-first walk; literal branches are dict lookups, so typical cost is O(depth)
+        stack = [(self.root, 0, {})]
+        while stack:
+            node, depth, params = stack.pop()
+            remaining = len(segments) - depth
+
+            for rule_id, name, min_segments, max_segments in node['rest']:
+                if (best is None or rule_id < best[0]) and remaining >= min_segments and \
+                        (max_segments is None or remaining <= max_segments):
+                    captured = '/'.join(segments[depth:])
+                    best = (rule_id, dict(params, **({name: captured} if captured else {})))
+
+            if remaining == 0:
+                if node['rules'] and (best is None or node['rules'][0] < best[0]):
+                    best = (node['rules'][0], params)
+                continue
+
+            segment = segments[depth]
+            child = node['literal'].get(segment.lower())
+            if child:
+                stack.append((child, depth + 1, params))
+            for regex, names, child in node['dynamic']:
+                found = regex.match(segment)
+                if found:
+                    stack.append((child, depth + 1, dict(params, **captured_params(found, names))))
+
+        # Regex fallback rules only matter if they come before the trie's answer
+        for rule_id, regex, names in self.regex_rules:
+            if best is not None and rule_id > best[0]:
+                break
+            found = regex.match(path)
+            if found:
+                best = (rule_id, captured_params(found, names))
+                break
+
+        return best
+
+    def resolve(self, path):
+        """Destination of the first redirect matching path (one hop), or None"""
+        found = self.match(path)
+        if found is None:
+            return None
+        rule_id, params = found
+        return compile_destination(self.redirects[rule_id]['destination'], params,
+                                   self.param_names[rule_id])
+
+    def redirect_chain(self, path, max_hops=20):
+        """
+        Follow redirects from path until it stops redirecting.
+
+        Returns (chain, cycle): chain lists path and every destination visited in
+        order; cycle is True if the chain loops (or exceeds max_hops).
+        """
+        chain = [path]
+        seen = {normalize_path(path).lower()}
+        while len(chain) <= max_hops:
+            destination = self.resolve(chain[-1])
+            if destination is None:
+                return chain, False
+            chain.append(destination)
+            # External destinations leave the site - nothing more to follow
+            if '://' in destination:
+                return chain, False
+            key = normalize_path(destination).lower()
+            if key in seen:
+                return chain, True
+            seen.add(key)
+        return chain, True
+
+    def final_destination(self, path, max_hops=20):
+        """
+        Follow redirects from path until it stops redirecting.
+
+        Returns (final path, hops, cycle) - cycle is True if the chain loops (or
+        exceeds max_hops), in which case final path is where the walk stopped.
+        """
+        chain, cycle = self.redirect_chain(path, max_hops)
+        return chain[-1], len(chain) - 1, cycle
+
+    def has_source(self, path):
+        """Check if any redirect (literal or pattern) matches path"""
+        return self.match(path) is not None
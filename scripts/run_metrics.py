@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+run_metrics.py
+
+Machine-readable run metrics and profiling shared by check-links.py,
+fix-links.py and fix-redirects.py.
+
+    --metrics json       Emit per-phase timings, per-file cost, counters (fuzzy
+                         comparisons, filesystem probes, ...) and cache hit rates
+                         as one JSON document (stderr, or --metrics-file)
+    --metrics-file PATH  Write the metrics there instead of stderr
+    --profile PATH       Write a cProfile of the whole run (python -m pstats PATH)
+
+Metrics and the profile are written when the process exits, so they are also
+produced for runs that end in sys.exit(1).
+
+Usage:
+    from run_metrics import add_metrics_arguments, start_metrics
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+    metrics = start_metrics(args, 'check-links')
+    with metrics.phase('index'):
+        ...
+    metrics.count('fuzzy_comparisons', n)
+"""
+
+import sys
+import json
+import time
+import atexit
+import cProfile
+from contextlib import contextmanager
+
+# Bump whenever the layout of the JSON document changes
+METRICS_VERSION = 1
+
+class Metrics:
+    """Phase timings, counters, cache hit rates and per-file costs for one run"""
+
+    def __init__(self, tool):
+        self.tool = tool
+        self.started = time.perf_counter()
+        self.phases = {}    # name -> seconds (phases may repeat; time accumulates)
+        self.counters = {}  # name -> count
+        self.caches = {}    # name -> [hits, misses]
+        self.files = {}     # rel_path -> {seconds, ...}
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block as the named phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, amount=1):
+        """Add to a counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_all(self, counts):
+        """Add every counter in a {name: amount} dict (e.g. returned by a worker)"""
+        for name, amount in counts.items():
+            self.count(name, amount)
+
+    def cache(self, name, hits, misses):
+        """Add hits and misses for a named cache"""
+        totals = self.caches.setdefault(name, [0, 0])
+        totals[0] += hits
+        totals[1] += misses
+
+    def file_cost(self, rel_path, seconds, **details):
+        """Record the cost of processing one file"""
+        self.files[rel_path] = dict(details, seconds=round(seconds, 6))
+
+    def report(self):
+        """The metrics as a JSON-serializable dict"""
+        caches = {}
+        for name, (hits, misses) in sorted(self.caches.items()):
+            lookups = hits + misses
+            caches[name] = {'hits': hits, 'misses': misses,
+                            'hit_rate': round(hits / lookups, 4) if lookups else None}
+        return {
+            'version': METRICS_VERSION,
+            'tool': self.tool,
+            'total_seconds': round(time.perf_counter() - self.started, 6),
+            'phases': {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            'counters': dict(sorted(self.counters.items())),
+            'caches': caches,
+            'files': dict(sorted(self.files.items())),
+        }
+
+def add_metrics_arguments(parser):
+    """Add --metrics, --metrics-file and --profile to an argparse parser"""
+    parser.add_argument('--metrics', choices=['json'],
+                       help='Emit per-phase timings, per-file cost, counters and cache hit rates')
+    parser.add_argument('--metrics-file', metavar='PATH',
+                       help='Write --metrics output to PATH instead of stderr')
+    parser.add_argument('--profile', metavar='PATH',
+                       help='Write a cProfile of the run to PATH (view with python -m pstats PATH)')
+
+def start_metrics(args, tool):
+    """Start collecting for a run; metrics and profile are written automatically at exit"""
+    metrics = Metrics(tool)
+    profiler = None
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def finish():
+        """Write the profile and metrics (registered with atexit)"""
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"📊 Profile written to {args.profile} (view with: python -m pstats {args.profile})",
+                  file=sys.stderr)
+        if args.metrics == 'json':
+            document = json.dumps(metrics.report(), indent=2)
+            if args.metrics_file:
+                with open(args.metrics_file, 'w', encoding='utf-8') as f:
+                    f.write(document + '\n')
+            else:
+                print(document, file=sys.stderr)
+
+    atexit.register(finish)
+    return metrics
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+test_external_links.py
+
+Tests for external_links.py against a local stand-in HTTP server, so no test
+ever touches the network.
+
+Usage:
+    python -m pytest scripts/tests
+    python -m unittest discover -s scripts/tests
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from external_links import ExternalLinkChecker, is_broken, is_transient  # noqa: E402
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Canned responses by path; every request is counted on the server"""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like real servers
+
+    # path -> {method: (status, Location header or None)}, '*' for any method
+    ROUTES = {
+        '/ok': {'*': (200, None)},
+        '/no-head': {'HEAD': (405, None), 'GET': (200, None)},
+        '/moved': {'*': (301, '/ok')},
+        '/missing': {'*': (404, None)},
+        '/flaky': {'*': (503, None)},
+    }
+
+    def respond(self):
+        """Send the canned response for this request's method and path"""
+        self.server.requests[(self.command, self.path)] += 1
+        route = self.ROUTES.get(self.path, {'*': (404, None)})
+        status, location = route.get(self.command, route.get('*'))
+        body = b'' if self.command == 'HEAD' else b'stand-in'
+        self.send_response(status)
+        if location:
+            self.send_header('Location', location)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_HEAD = respond
+    do_GET = respond
+
+    def log_message(self, format, *args):
+        """Keep test output quiet"""
+
+class ExternalLinkCheckerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        self.server.requests = Counter()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.cache_dir, 'external-links.json')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def check(self, *paths):
+        """Check the stand-in URLs for paths, returning (checker, {path: result})"""
+        checker = ExternalLinkChecker(self.cache_path, host_rate=0, timeout=5)
+        results = checker.check([self.base + path for path in paths])
+        return checker, {path: results[self.base + path] for path in paths}
+
+    def test_head_falls_back_to_get_on_405(self):
+        _, results = self.check('/no-head')
+        self.assertEqual(results['/no-head']['status'], 200)
+        self.assertFalse(is_broken(results['/no-head']))
+        self.assertEqual(self.server.requests[('HEAD', '/no-head')], 1)
+        self.assertEqual(self.server.requests[('GET', '/no-head')], 1)
+
+    def test_redirect_is_followed_to_final_url(self):
+        _, results = self.check('/moved')
+        self.assertEqual(results['/moved']['status'], 200)
+        self.assertEqual(results['/moved']['final'], self.base + '/ok')
+
+    def test_404_is_broken(self):
+        _, results = self.check('/missing')
+        self.assertEqual(results['/missing']['status'], 404)
+        self.assertTrue(is_broken(results['/missing']))
+
+    def test_transient_errors_are_not_cached(self):
+        _, results = self.check('/flaky', '/ok')
+        self.assertTrue(is_transient(results['/flaky']))
+        checker, _ = self.check('/flaky', '/ok')
+        self.assertEqual((checker.cached, checker.fetched), (1, 1))
+        self.assertEqual(self.server.requests[('HEAD', '/flaky')], 2)
+
+    def test_rerun_is_answered_from_the_ttl_cache(self):
+        paths = ('/ok', '/no-head', '/moved', '/missing')
+        _, first = self.check(*paths)
+        requests = sum(self.server.requests.values())
+        checker, second = self.check(*paths)
+        self.assertEqual((checker.cached, checker.fetched), (len(paths), 0))
+        self.assertEqual(sum(self.server.requests.values()), requests)
+        self.assertEqual(first, second)
+
+    def test_expired_cache_entries_are_refetched(self):
+        self.check('/ok')
+        checker = ExternalLinkChecker(self.cache_path, ttl=0, host_rate=0, timeout=5)
+        checker.check([self.base + '/ok'])
+        self.assertEqual((checker.cached, checker.fetched), (0, 1))
+        self.assertEqual(self.server.requests[('HEAD', '/ok')], 2)
+
+if __name__ == '__main__':
+    unittest.main()